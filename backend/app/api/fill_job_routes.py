@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.api.auth_routes import get_current_user
+from app.api.routes import FillFormRequest, resolve_fill_data
+from app.services.fill_job_service import fill_job_service, FillJobQueueFull
+import json
+
+router = APIRouter()
+
+
+class FillJobRequest(FillFormRequest):
+    # Queued jobs run unattended; a headed job leaves its window open (and its browser
+    # lease held) until someone closes it
+    headless: bool = True
+
+
+def _get_owned_job(job_id: str, current_user):
+    job = fill_job_service.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Fill job not found")
+    if job.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this fill job")
+    return job
+
+
+@router.post("/fill/jobs", status_code=202)
+async def submit_fill_job(
+    request: FillJobRequest,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue a fill and return immediately; poll or stream the job for progress"""
+    if not request.url:
+        raise HTTPException(status_code=400, detail="URL is required for form filling")
+
+    form_data, resume_path, key_info = await resolve_fill_data(request, current_user, db)
+
+    try:
+        job = await fill_job_service.submit(
+            current_user.id,
+            request.url,
+            form_data,
+            resume_path=resume_path,
+            multi_step=request.multi_step,
+            skip_validation=request.skip_validation,
+            headless=request.headless,
+            profile_used=not request.form_data,
+            key_info=key_info
+        )
+    except FillJobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    return JSONResponse(status_code=202, content={
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/fill/jobs/{job.id}",
+        "events_url": f"/api/fill/jobs/{job.id}/events"
+    })
+
+
+@router.get("/fill/jobs/{job_id}")
+async def get_fill_job(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    job = _get_owned_job(job_id, current_user)
+    return JSONResponse(content=job.to_dict())
+
+
+@router.get("/fill/jobs/{job_id}/events")
+async def stream_fill_job_events(
+    job_id: str,
+    after: int = 0,
+    current_user = Depends(get_current_user)
+):
+    """Server-Sent Events stream of a job's status and per-field progress"""
+    job = _get_owned_job(job_id, current_user)
+
+    async def event_source():
+        async for event in job.stream_events(after=after):
+            yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        yield f"event: done\ndata: {json.dumps(job.to_dict(), default=str)}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.database import get_db
 from app.models.profile import ProfileCreate, ProfileUpdate, ProfileResponse
+from app.services.profile_form_data_service import profile_form_data_cache
 from app.services.profile_service import ProfileService
 from app.services.resume_parser_service import ResumeParserService
 from app.api.auth_routes import get_current_user
@@ -192,8 +193,10 @@ async def upload_resume(
         from sqlalchemy.orm.attributes import flag_modified
         profile.quick_apply_data = copy.deepcopy(quick_apply_data)
         flag_modified(profile, "quick_apply_data")
+        ProfileService.materialize_form_data(profile)
         
         await db.commit()
+        profile_form_data_cache.invalidate(current_user.id)
         await db.refresh(profile)
         
         return {
@@ -1,18 +1,26 @@
 from fastapi import APIRouter, HTTPException, Depends, Form
 from fastapi.responses import JSONResponse
-from typing import Optional
-from pydantic import BaseModel
+from typing import Optional, List
+from pydantic import BaseModel, Field
 from app.services.automation_service import AutomationService
 from app.services.html_parser_service import HTMLParserService
 from app.services.safety_service import SafetyService
 from app.services.multi_step_service import MultiStepService
 from app.services.profile_service import ProfileService
+from app.services.browser_pool import BrowserPoolTimeout
+from app.services.fill_pipeline_service import FillPipelineService
+from app.services.batch_fill_service import BatchFillService
+from app.services.http_client_service import get_http_client
+from app.config import settings
 from app.utils.field_validator import FieldValidator
 from app.utils.field_matcher import FieldMatcher
 from app.database import get_db
 from app.api.auth_routes import get_current_user
 from app.utils.logger import logger
+from app.utils.single_flight import single_flight_stats
+from app.utils.timing import PhaseTimer, fill_timings
 from sqlalchemy.ext.asyncio import AsyncSession
+import httpx
 
 router = APIRouter()
 
@@ -24,6 +32,15 @@ class FillFormRequest(BaseModel):
     multi_step: bool = False
 
 
+class BatchFillRequest(BaseModel):
+    urls: List[str]
+    form_data: Optional[dict] = None
+    skip_validation: bool = False
+    # Capped at the browser pool's headless concurrency by BatchFillService
+    parallelism: Optional[int] = Field(None, ge=1, le=settings.batch_fill_max_urls)
+    per_host_limit: Optional[int] = Field(None, ge=1, le=settings.batch_fill_max_urls)
+
+
 class AnalyzeRequest(BaseModel):
     url: Optional[str] = None
 
@@ -33,15 +50,42 @@ async def health_check():
     return {"status": "healthy", "service": "ai-form-filling-assistant"}
 
 
+@router.get("/metrics")
+async def get_metrics(domain: Optional[str] = None):
+    """Runtime counters for the browser pool, fill jobs, caches and outbound HTTP pool, plus fill latency per domain"""
+    from app.services.browser_pool import browser_pool
+    from app.services.fill_job_service import fill_job_service
+    from app.services.selector_cache_service import selector_cache
+    from app.services.http_client_service import http_client
+    from app.services.html_cache_service import html_cache
+    from app.services.form_structure_cache_service import form_structure_cache
+    from app.services.parse_pool import parse_pool
+    from app.services.profile_form_data_service import profile_form_data_cache
+    
+    return {
+        "browser_pool": browser_pool.stats(),
+        "http_client": http_client.stats(),
+        "html_cache": html_cache.stats(),
+        "form_structure_cache": form_structure_cache.stats(),
+        "parse_pool": parse_pool.stats(),
+        "profile_form_data_cache": profile_form_data_cache.stats(),
+        "fill_jobs": fill_job_service.stats(),
+        "selector_cache": selector_cache.stats(),
+        "single_flight": single_flight_stats(),
+        "fill_timings": fill_timings.stats(domain.lower() if domain else None)
+    }
+
+
 @router.post("/analyze")
 async def analyze_form(
-    url: Optional[str] = Form(None)
+    url: Optional[str] = Form(None),
+    http: httpx.AsyncClient = Depends(get_http_client)
 ):
     try:
         if not url:
             raise HTTPException(status_code=400, detail="URL is required")
         
-        html_parser = HTMLParserService()
+        html_parser = HTMLParserService(client=http)
         try:
             result = await html_parser.analyze_form_from_url(url)
             await html_parser.close()
@@ -57,12 +101,15 @@ async def analyze_form(
 
 
 @router.post("/preview")
-async def preview_form(request: FillFormRequest):
+async def preview_form(
+    request: FillFormRequest,
+    http: httpx.AsyncClient = Depends(get_http_client)
+):
     try:
         if not request.url:
             raise HTTPException(status_code=400, detail="URL is required")
         
-        safety_service = SafetyService()
+        safety_service = SafetyService(client=http)
         preview = await safety_service.preview_actions(
             url=request.url,
             form_data=request.form_data
@@ -78,7 +125,8 @@ async def preview_form(request: FillFormRequest):
 async def check_ats_score(
     url: str = Form(...),
     current_user = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_http_client)
 ):
     """Check ATS score by comparing resume with job posting"""
     try:
@@ -98,7 +146,7 @@ async def check_ats_score(
             })
         
         # Calculate ATS score
-        ats_result = await ATSScoreService.calculate_ats_score(url, profile.resume_data)
+        ats_result = await ATSScoreService.calculate_ats_score(url, profile.resume_data, client=http)
         
         return JSONResponse(content=ats_result)
     except HTTPException:
@@ -111,14 +159,15 @@ async def check_ats_score(
 async def check_if_fillable(
     url: str = Form(...),
     current_user = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_http_client)
 ):
     """Check if a form can be filled automatically"""
     try:
         from app.services.html_parser_service import HTMLParserService
         from app.services.automation_service import AutomationService
         
-        html_parser = HTMLParserService()
+        html_parser = HTMLParserService(client=http)
         try:
             analysis = await html_parser.analyze_form_from_url(url)
             form_structure = analysis.get('form_structure', {})
@@ -127,13 +176,12 @@ async def check_if_fillable(
             fillable = len(fields) > 0
             
             # Get profile data to see how many fields we can match
-            profile = await ProfileService.get_profile_by_user_id(db, current_user.id)
+            profile_form = await ProfileService.get_form_data(db, current_user.id)
             matchable_count = 0
-            if profile:
-                profile_data = ProfileService.profile_to_form_data(profile)
+            if profile_form:
                 from app.utils.field_matcher import FieldMatcher
                 matcher = FieldMatcher()
-                matched = matcher.match_form_data_to_fields(profile_data, fields)
+                matched = matcher.match_form_data_to_fields(profile_form.form_data, fields, key_info=profile_form.keys)
                 matchable_count = len(matched)
             
             await html_parser.close()
@@ -141,6 +189,7 @@ async def check_if_fillable(
             return JSONResponse(content={
                 "fillable": fillable,
                 "total_fields": len(fields),
+                "frames": len(form_structure.get('frames', [])),
                 "matchable_fields": matchable_count,
                 "confidence": "high" if matchable_count >= len(fields) * 0.7 else "medium" if matchable_count > 0 else "low",
                 "message": f"Form has {len(fields)} fields. Can match {matchable_count} fields from your profile." if fillable else "Form may not be fillable automatically."
@@ -157,12 +206,15 @@ async def check_if_fillable(
 
 
 @router.post("/dry-run")
-async def dry_run_form(request: FillFormRequest):
+async def dry_run_form(
+    request: FillFormRequest,
+    http: httpx.AsyncClient = Depends(get_http_client)
+):
     try:
         if not request.url:
             raise HTTPException(status_code=400, detail="URL is required")
         
-        safety_service = SafetyService()
+        safety_service = SafetyService(client=http)
         result = await safety_service.dry_run(
             url=request.url,
             form_data=request.form_data
@@ -174,6 +226,41 @@ async def dry_run_form(request: FillFormRequest):
         raise HTTPException(status_code=500, detail=f"Error performing dry run: {str(e)}")
 
 
+async def resolve_fill_data(request: FillFormRequest, current_user, db: AsyncSession):
+    """
+    Return (form_data, resume_path, key_info) for a fill request, falling back to the user's profile.
+
+    key_info is the profile's stored key descriptions (None without a profile), so
+    field matching does not re-derive them for every fill.
+    """
+    form_data = request.form_data.copy() if request.form_data else {}
+    resume_path = None
+    key_info = None
+    
+    # Materialised profile form data and resume path, without loading the whole profile row
+    profile_form = await ProfileService.get_form_data(db, current_user.id)
+    if profile_form:
+        key_info = profile_form.keys
+        if not form_data:
+            form_data.update(profile_form.form_data)
+        # Get resume path if available
+        if profile_form.resume_path:
+            from pathlib import Path
+            resume_file = Path(profile_form.resume_path)
+            if resume_file.exists():
+                resume_path = str(resume_file.absolute())
+    elif not form_data:
+        raise HTTPException(status_code=400, detail="No profile found. Please create your profile first.")
+    
+    if not form_data:
+        raise HTTPException(
+            status_code=400, 
+            detail="Form data is required. Either provide form_data in request or ensure your profile has data."
+        )
+    
+    return form_data, resume_path, key_info
+
+
 @router.post("/fill")
 async def fill_form(
     request: FillFormRequest,
@@ -184,196 +271,95 @@ async def fill_form(
         if not request.url:
             raise HTTPException(status_code=400, detail="URL is required for form filling")
         
-        form_data = request.form_data.copy() if request.form_data else {}
-        resume_path = None
+        timer = PhaseTimer()
+        form_data, resume_path, key_info = await resolve_fill_data(request, current_user, db)
         
-        # Get profile to extract form data and resume path
-        profile = await ProfileService.get_profile_by_user_id(db, current_user.id)
-        if profile:
-            if not form_data:
-                profile_data = ProfileService.profile_to_form_data(profile)
-                form_data.update(profile_data)
-            # Get resume path if available
-            if profile.resume_path:
-                from pathlib import Path
-                resume_file = Path(profile.resume_path)
-                if resume_file.exists():
-                    resume_path = str(resume_file.absolute())
-        elif not form_data:
-            raise HTTPException(status_code=400, detail="No profile found. Please create your profile first.")
+        pipeline = FillPipelineService()
         
-        if not form_data:
-            raise HTTPException(
-                status_code=400, 
-                detail="Form data is required. Either provide form_data in request or ensure your profile has data."
+        # For form filling, always use non-headless mode so user can see and complete
+        # Field matching runs against the same page unless validation is skipped
+        try:
+            result = await pipeline.run(
+                request.url,
+                form_data,
+                resume_path=resume_path,
+                multi_step=request.multi_step,
+                headless=False,
+                keep_open=True,
+                analyze=not request.skip_validation,
+                timer=timer,
+                key_info=key_info
             )
+        except BrowserPoolTimeout as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        form_data = result.pop("form_data", form_data)
+        result["profile_used"] = not request.form_data
         
-        # Skip strict validation - we'll fill as much as possible
-        if not request.skip_validation:
-            html_parser = HTMLParserService()
-            try:
-                analysis = await html_parser.analyze_form_from_url(request.url)
-                form_structure = analysis.get('form_structure', {})
-                fields = form_structure.get('fields', [])
-                
-                if fields:
-                    matcher = FieldMatcher()
-                    # Match and update form_data, but don't fail on validation errors
-                    matched_data = matcher.match_form_data_to_fields(form_data, fields)
-                    form_data = matched_data
-                    print(f"Matched {len(matched_data)} fields out of {len(fields)} available fields")
-                
-                await html_parser.close()
-            except Exception as e:
-                await html_parser.close()
-                print(f"Validation warning: {e} - continuing with available data")
+        # Save application to database
+        with timer.span("save_application"):
+            application_id = await FillPipelineService.save_application(
+                db, current_user.id, request.url, form_data, result
+            )
+        if application_id:
+            result["application_id"] = application_id
+        result["timing"] = timer.summary()
         
-        # For form filling, always use non-headless mode so user can see and complete
-        from playwright.async_api import async_playwright
-        playwright = await async_playwright().start()
-        browser = None
-        page = None
+        # Browser stays open - user will close it manually after submitting
+        result["message"] = f"Browser opened with form. {result.get('message', '')} Please complete remaining fields and submit manually."
         
-        try:
-            # Launch browser in non-headless mode for user interaction - prefer Chrome
-            try:
-                browser = await playwright.chromium.launch(
-                    headless=False,
-                    channel="chrome",  # Use system Chrome if available
-                    args=[
-                        '--disable-blink-features=AutomationControlled',
-                        '--start-maximized',
-                        '--disable-web-security',
-                        '--disable-features=IsolateOrigins,site-per-process'
-                    ]
-                )
-            except Exception:
-                try:
-                    # Try chromium if chrome channel not available
-                    browser = await playwright.chromium.launch(
-                        headless=False,
-                        args=[
-                            '--disable-blink-features=AutomationControlled',
-                            '--start-maximized'
-                        ]
-                    )
-                except Exception:
-                    # Fallback to firefox
-                    browser = await playwright.firefox.launch(headless=False)
-            
-            page = await browser.new_page()
-            # Set larger viewport to see more content
-            await page.set_viewport_size({"width": 1920, "height": 1080})
-            
-            await page.goto(request.url, wait_until="domcontentloaded", timeout=30000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-            await page.wait_for_timeout(3000)  # Wait for dynamic content
-            
-            # Scroll through page to ensure all content is loaded - scroll all the way to bottom
-            try:
-                # First, scroll to very bottom to trigger any lazy-loaded content
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await page.wait_for_timeout(2000)
-                
-                # Now scroll back up in increments to load everything
-                viewport_height = await page.evaluate("window.innerHeight")
-                total_height = await page.evaluate("document.body.scrollHeight")
-                current_position = 0
-                scroll_step = viewport_height * 0.7
-                
-                while current_position < total_height:
-                    await page.evaluate(f"window.scrollTo({{ top: {current_position}, behavior: 'smooth' }})")
-                    await page.wait_for_timeout(1000)  # Longer wait for content
-                    current_position += scroll_step
-                    # Re-check total height in case it increased
-                    new_height = await page.evaluate("document.body.scrollHeight")
-                    if new_height > total_height:
-                        total_height = new_height
-                        # Scroll to new bottom
-                        await page.evaluate(f"window.scrollTo({{ top: {new_height}, behavior: 'smooth' }})")
-                        await page.wait_for_timeout(1000)
-                
-                # Scroll back to top
-                await page.evaluate("window.scrollTo({ top: 0, behavior: 'smooth' })")
-                await page.wait_for_timeout(1500)
-            except Exception as e:
-                logger.warning(f"Scrolling issue: {e}")
-                pass
-            
-            # Try to detect if it's a multi-step form
-            multi_step_service = MultiStepService()
-            is_multi_step = await multi_step_service.detect_multi_step_form(page)
-            
-            automation_service = AutomationService()
-            
-            if is_multi_step and request.multi_step:
-                # Use multi-step service
-                result = await multi_step_service.fill_multi_step_form(page, form_data, resume_path=resume_path)
-                result["url"] = request.url
-                result["profile_used"] = not request.form_data
-                result["form_type"] = "multi-step"
-            else:
-                # Use regular form filling - fill as much as possible
-                result = await automation_service.fill_form_with_page(page, form_data, resume_path=resume_path)
-                result["url"] = request.url
-                result["profile_used"] = not request.form_data
-                result["form_type"] = "single-page"
-                result["fillable"] = result.get("filled_count", 0) > 0
-            
-            # Save application to database
-            try:
-                from app.services.application_service import ApplicationService
-                from app.models.application import ApplicationCreate
-                
-                # Extract job title and company from URL if possible
-                job_title = None
-                company_name = None
-                if "greenhouse.io" in request.url:
-                    parts = request.url.split("/")
-                    if len(parts) > 2:
-                        company_name = parts[-2] if parts[-2] != "jobs" else None
-                
-                application_data = ApplicationCreate(
-                    job_url=request.url,
-                    job_title=job_title,
-                    company_name=company_name,
-                    form_data=form_data,
-                    filled_fields={
-                        "filled_count": result.get("filled_count", 0),
-                        "total_fields": len(form_data),
-                        "actions": result.get("executed_actions", [])
-                    }
-                )
-                application = await ApplicationService.create_application(
-                    db, current_user.id, application_data
-                )
-                result["application_id"] = application.id
-            except Exception as e:
-                logger.warning(f"Could not save application: {e}")
-            
-            # Don't close browser - keep it open for user to complete and submit
-            # Browser will stay open until user closes it manually
-            result["browser_open"] = True
-            result["message"] = f"Browser opened with form. {result.get('message', '')} Please complete remaining fields and submit manually."
-            
-            return JSONResponse(content=result)
-        except Exception as e:
-            # Close browser on error
-            if page:
-                try:
-                    await page.close()
-                except:
-                    pass
-            if browser:
-                try:
-                    await browser.close()
-                except:
-                    pass
-            raise
-        # Note: Browser stays open - user will close it manually after submitting
+        return JSONResponse(content=result)
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error filling form: {str(e)}")
 
+
+@router.post("/fill/batch")
+async def fill_forms_batch(
+    request: BatchFillRequest,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Fill several job postings in parallel headless contexts"""
+    try:
+        urls = [url.strip() for url in request.urls if url and url.strip()]
+        if not urls:
+            raise HTTPException(status_code=400, detail="At least one URL is required")
+        if len(urls) > settings.batch_fill_max_urls:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.batch_fill_max_urls} URLs can be filled in one batch"
+            )
+        
+        # Resolve the profile once for the whole batch
+        form_data, resume_path, key_info = await resolve_fill_data(request, current_user, db)
+        
+        batch_service = BatchFillService(
+            parallelism=request.parallelism,
+            per_host_limit=request.per_host_limit
+        )
+        batch = await batch_service.fill_all(
+            urls, form_data, resume_path=resume_path, skip_validation=request.skip_validation,
+            key_info=key_info
+        )
+        
+        # One session cannot be shared by concurrent fills, so save afterwards
+        for entry in batch["results"]:
+            url_form_data = entry.pop("form_data")
+            result = entry.get("result")
+            if result is None:
+                continue
+            result["profile_used"] = not request.form_data
+            application_id = await FillPipelineService.save_application(
+                db, current_user.id, entry["url"], url_form_data, result
+            )
+            if application_id:
+                result["application_id"] = application_id
+        
+        return JSONResponse(content=batch)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error filling forms: {str(e)}")
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict, List, Literal
 import os
 
 
@@ -12,6 +12,102 @@ class Settings(BaseSettings):
     playwright_headless: bool = True
     playwright_timeout: int = 30000
     
+    # Shared browser pool: headless leases and headed (interactive, held until the user
+    # closes the window) leases are capped separately
+    browser_pool_max_concurrency: int = 3
+    browser_pool_max_headed: int = 3
+    browser_pool_acquire_timeout: float = 60.0
+    browser_pool_warm_on_startup: bool = True
+    
+    # Page readiness: "observer" (MutationObserver/IntersectionObserver) or "legacy" (fixed sleeps)
+    page_readiness_mode: Literal["observer", "legacy"] = "observer"
+    page_quiet_window_ms: int = 500
+    page_ready_budget_ms: int = 8000
+    
+    # Background fill jobs
+    fill_job_workers: int = 2
+    fill_job_per_user_limit: int = 1
+    fill_job_max_queued_per_user: int = 10
+    fill_job_retention_seconds: int = 3600
+    
+    # Batch fills (parallelism 0 means as many as browser_pool_max_concurrency; more is capped to it)
+    batch_fill_parallelism: int = 0
+    batch_fill_per_host_limit: int = 2
+    batch_fill_max_urls: int = 50
+    
+    # Request interception: extra tracker hosts to block and per-site allowlists,
+    # e.g. RESOURCE_BLOCK_ALLOWLIST='{"myworkdayjobs.com": ["font"]}'
+    resource_blocking_enabled: bool = True
+    resource_blocked_hosts_extra: List[str] = []
+    resource_block_allowlist: Dict[str, List[str]] = {}
+    
+    # Learned label -> selector cache for repeat ATS hosts
+    selector_cache_enabled: bool = True
+    selector_cache_path: str = "selector_cache.db"
+    selector_cache_ttl_seconds: int = 7 * 24 * 3600
+    selector_cache_max_entries: int = 20000
+    
+    # Fill mode: "interactive" (scroll, settle and type per field), "fast" (one in-page
+    # script writes every value) or "auto" (fast for headless fills, interactive otherwise)
+    fill_mode: Literal["interactive", "fast", "auto"] = "auto"
+    
+    # Where fill-time field analysis reads the form from: "page" (the rendered Playwright
+    # DOM, one navigation per URL) or "http" (a separate httpx fetch of the raw HTML)
+    analysis_source: Literal["page", "http"] = "page"
+    
+    # Shared outbound HTTP client (HTTP/2 needs the optional h2 package)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http2_enabled: bool = True
+    http_dns_cache_ttl: float = 300.0
+    http_timeout: float = 30.0
+    
+    # Conditional-GET cache for fetched HTML (memory LRU in front of a SQLite file)
+    html_cache_enabled: bool = True
+    html_cache_path: str = "html_cache.db"
+    html_cache_ttl_seconds: int = 300
+    html_cache_max_stale_seconds: int = 24 * 3600
+    html_cache_memory_max_bytes: int = 32 * 1024 * 1024
+    html_cache_disk_max_bytes: int = 256 * 1024 * 1024
+    
+    # Form extraction: "soup" (BeautifulSoup tree), "stream" (lxml parser events, no tree)
+    # or "auto" (stream pages of at least html_stream_min_chars characters)
+    html_extractor: Literal["soup", "stream", "auto"] = "auto"
+    html_stream_min_chars: int = 256 * 1024
+    # Text the stream keeps for div/span sibling labels; past it only label and option text is kept
+    html_stream_max_text_chars: int = 2 * 1024 * 1024
+    
+    # Parsed form structures keyed by a hash of the normalised page (compressed, in memory)
+    form_structure_cache_enabled: bool = True
+    form_structure_cache_max_bytes: int = 16 * 1024 * 1024
+    
+    # Iframe discovery for HTTP analysis: frames on the page's host (or its subdomains),
+    # known-ATS frames and iframe_extra_hosts (e.g. a company's other careers host) are fetched concurrently, at most iframe_max_depth levels deep
+    # (0 disables) and iframe_max_frames per page, and their fields merged into the form
+    iframe_max_depth: int = 2
+    iframe_max_frames: int = 6
+    iframe_extra_hosts: List[str] = []
+    
+    # Worker processes for CPU-bound HTML parsing (0 parses inline on the event loop);
+    # documents shorter than parse_pool_min_chars are always parsed inline
+    parse_pool_workers: int = 2
+    parse_pool_min_chars: int = 64 * 1024
+    
+    # Profile key -> form label matching: "greedy" (each key takes its best label, unmatched
+    # keys pass through) or "assignment" (one-to-one over a trigram similarity matrix;
+    # pairs scoring under field_assignment_threshold are left unassigned and dropped)
+    field_match_mode: Literal["greedy", "assignment"] = "greedy"
+    # Pair well-known fields (name, email, phone, address...) through the canonical field
+    # taxonomy first, one profile value per field; only unclassified labels are fuzzy-matched
+    field_taxonomy_enabled: bool = True
+    field_assignment_threshold: float = 0.5
+    
+    # Per-user memory cache of materialised profile form data; entries are dropped on
+    # profile/resume writes and expire after the TTL (other workers' writes)
+    profile_form_data_cache_max_entries: int = 10000
+    profile_form_data_cache_ttl_seconds: int = 60
+    
     secret_key: str = os.getenv("SECRET_KEY", "test-secret-key-for-ci")
     
     class Config:
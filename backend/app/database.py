@@ -59,6 +59,12 @@ async def init_db():
             if 'quick_apply_data' not in columns:
                 cursor.execute("ALTER TABLE profiles ADD COLUMN quick_apply_data JSON")
             
+            if 'form_data_cache' not in columns:
+                cursor.execute("ALTER TABLE profiles ADD COLUMN form_data_cache JSON")
+            
+            if 'form_data_version' not in columns:
+                cursor.execute("ALTER TABLE profiles ADD COLUMN form_data_version INTEGER NOT NULL DEFAULT 0")
+            
             # Check if applications table exists
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='applications'")
             if not cursor.fetchone():
@@ -4,6 +4,7 @@ from app.api.routes import router
 from app.api.profile_routes import router as profile_router
 from app.api.auth_routes import router as auth_router
 from app.api.application_routes import router as application_router
+from app.api.fill_job_routes import router as fill_job_router
 from app.database import init_db
 from app.utils.logger import logger
 from app.middleware.rate_limit import RateLimitMiddleware
@@ -37,6 +38,7 @@ app.include_router(router, prefix="/api")
 app.include_router(auth_router, prefix="/api")
 app.include_router(profile_router, prefix="/api")
 app.include_router(application_router, prefix="/api")
+app.include_router(fill_job_router, prefix="/api")
 
 
 @app.on_event("startup")
@@ -48,6 +50,32 @@ async def startup_event():
     logger.info("Initializing database...")
     await init_db()
     logger.info("Database initialized successfully")
+    
+    if settings.browser_pool_warm_on_startup:
+        from app.services.browser_pool import browser_pool
+        try:
+            await browser_pool.start()
+            logger.info("Browser pool warmed up")
+        except Exception as e:
+            # Browsers are launched lazily on first use instead
+            logger.warning(f"Could not warm up browser pool: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    from app.services.fill_job_service import fill_job_service
+    from app.services.browser_pool import browser_pool
+    from app.services.html_cache_service import html_cache
+    from app.services.http_client_service import http_client
+    from app.services.parse_pool import parse_pool
+    from app.services.selector_cache_service import selector_cache
+    await fill_job_service.stop()
+    await browser_pool.close()
+    await http_client.close()
+    await parse_pool.close()
+    # Writes the last_used times of hits since the last store
+    selector_cache.close()
+    html_cache.close()
 
 
 @app.get("/")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, JSON, DateTime, ForeignKey
+from sqlalchemy import Column, String, JSON, DateTime, ForeignKey, Integer
 from datetime import datetime
 import uuid
 from app.database import Base
@@ -20,6 +20,9 @@ class Profile(Base):
     resume_data = Column(JSON, nullable=True)
     # Quick Apply fields stored as JSON
     quick_apply_data = Column(JSON, nullable=True)  # Stores all quick apply fields
+    # profile_to_form_data output (plus normalised/canonical keys), rebuilt on every write
+    form_data_cache = Column(JSON, nullable=True)
+    form_data_version = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -1,13 +1,21 @@
 import re
 import json
 import asyncio
+import hashlib
 from typing import Dict, Any, Optional
 from collections import Counter
 from bs4 import BeautifulSoup
 from openai import OpenAI
 from app.config import settings
+from app.services.html_cache_service import HtmlCacheService
 from app.services.html_parser_service import HTMLParserService
+from app.services.parse_pool import ParseWorkerCrashed, parse_pool
 from app.services.resume_parser_service import ResumeParserService
+from app.utils.single_flight import SingleFlight
+
+
+job_description_flight = SingleFlight("ats_job_description")
+ats_score_flight = SingleFlight("ats_score")
 
 
 class ATSScoreService:
@@ -16,39 +24,17 @@ class ATSScoreService:
         self.client = OpenAI(api_key=settings.openai_api_key)
     
     @staticmethod
-    async def calculate_ats_score(job_url: str, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def calculate_ats_score(job_url: str, resume_data: Dict[str, Any], client=None) -> Dict[str, Any]:
         """
         Calculate ATS score by comparing resume with job posting
         Returns score from 0-100 and recommendation
         """
         try:
-            # Extract job description from URL
-            html_parser = HTMLParserService()
-            job_description = ""
-            try:
-                # Get page content to extract job description
-                html_content = await html_parser.fetch_html(job_url)
-                
-                # Extract job description text
-                job_description = ATSScoreService._extract_job_description(html_content)
-                
-                if not job_description or len(job_description) < 100:
-                    # Fallback: try to get text from form analysis
-                    try:
-                        analysis = await html_parser.analyze_form_from_url(job_url)
-                        job_description = analysis.get('full_text', '') or ''
-                    except:
-                        pass
-                
-            except Exception as e:
-                # Try fallback: get text from form analysis
-                try:
-                    analysis = await html_parser.analyze_form_from_url(job_url)
-                    job_description = analysis.get('full_text', '') or ''
-                except:
-                    job_description = ""
-            finally:
-                await html_parser.close()
+            # Concurrent checks of one posting share a single fetch and extraction
+            job_description = await job_description_flight.do(
+                HtmlCacheService.key(job_url),
+                lambda: ATSScoreService._get_job_description(job_url, client)
+            )
             
             if not job_description:
                 return {
@@ -58,14 +44,11 @@ class ATSScoreService:
                     "details": {}
                 }
             
-            # Use GPT to calculate ATS score
-            ats_service = ATSScoreService()
-            try:
-                gpt_result = await ats_service._calculate_ats_score_with_gpt(resume_data, job_description)
-                return gpt_result
-            except Exception as e:
-                # Fallback to rule-based if GPT fails
-                return await ats_service._fallback_calculate_score(resume_data, job_description)
+            # Use GPT to calculate ATS score; a repeated check of the same resume joins the call in flight
+            return await ats_score_flight.do(
+                (HtmlCacheService.key(job_url), ATSScoreService._resume_digest(resume_data)),
+                lambda: ATSScoreService._score_job_description(resume_data, job_description)
+            )
         except Exception as e:
             return {
                 "score": 0,
@@ -74,6 +57,55 @@ class ATSScoreService:
                 "details": {}
             }
     
+    @staticmethod
+    async def _get_job_description(job_url: str, client=None) -> str:
+        """Fetch the posting and extract its description text, falling back to form analysis"""
+        html_parser = HTMLParserService(client=client)
+        job_description = ""
+        try:
+            # Get page content to extract job description
+            html_content = await html_parser.fetch_html(job_url)
+            
+            # Extract job description text (in the parse pool for large pages)
+            job_description = await parse_pool.run(ATSScoreService._extract_job_description, html_content)
+            
+            if not job_description or len(job_description) < 100:
+                # Fallback: try to get text from form analysis
+                try:
+                    analysis = await html_parser.analyze_form_from_url(job_url)
+                    job_description = analysis.get('full_text', '') or ''
+                except:
+                    pass
+            
+        except ParseWorkerCrashed:
+            # The page killed a parse worker; parsing it again for the fallback would too
+            job_description = ""
+        except Exception as e:
+            # Try fallback: get text from form analysis
+            try:
+                analysis = await html_parser.analyze_form_from_url(job_url)
+                job_description = analysis.get('full_text', '') or ''
+            except:
+                job_description = ""
+        finally:
+            await html_parser.close()
+        
+        return job_description
+    
+    @staticmethod
+    async def _score_job_description(resume_data: Dict[str, Any], job_description: str) -> Dict[str, Any]:
+        ats_service = ATSScoreService()
+        try:
+            return await ats_service._calculate_ats_score_with_gpt(resume_data, job_description)
+        except Exception as e:
+            # Fallback to rule-based if GPT fails
+            return await ats_service._fallback_calculate_score(resume_data, job_description)
+    
+    @staticmethod
+    def _resume_digest(resume_data: Dict[str, Any]) -> str:
+        payload = json.dumps(resume_data, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
     @staticmethod
     def _extract_job_description(html: str) -> str:
         """Extract job description text from HTML"""
@@ -1,29 +1,32 @@
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import Page, Browser
 from app.config import settings
-from typing import Dict, Any, List
+from app.services.browser_pool import browser_pool
+from app.services.fast_fill_service import FastFillService
+from app.services.field_resolver_service import FieldResolverService
+from app.services.page_readiness_service import PageReadinessService
+from app.services.resource_blocker import ResourceBlocker
+from app.services.selector_cache_service import selector_cache
+from app.utils.fill_plan import FillPlan
+from app.utils.timing import PhaseTimer
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+from urllib.parse import urlparse
 import asyncio
 
 
 class AutomationService:
     
-    def __init__(self):
+    def __init__(self, timer: PhaseTimer = None):
         self.browser: Browser = None
         self.headless = settings.playwright_headless
         self.timeout = settings.playwright_timeout
+        self.field_resolver = FieldResolverService()
+        self.readiness = PageReadinessService()
+        self.fast_fill = FastFillService()
+        self.timer = timer or PhaseTimer()
     
     async def _get_browser(self) -> Browser:
         if self.browser is None:
-            playwright = await async_playwright().start()
-            try:
-                self.browser = await playwright.firefox.launch(headless=self.headless)
-            except Exception:
-                try:
-                    self.browser = await playwright.chromium.launch(
-                        headless=self.headless,
-                        args=['--disable-blink-features=AutomationControlled', '--no-sandbox']
-                    )
-                except Exception:
-                    self.browser = await playwright.webkit.launch(headless=self.headless)
+            self.browser = await browser_pool.get_browser(self.headless)
         return self.browser
     
     async def _find_field_by_label(self, page: Page, label: str) -> Any:
@@ -38,6 +41,7 @@ class AutomationService:
         ]
         
         for strategy in strategies:
+            self.timer.count("label_strategy_attempts")
             try:
                 element = await page.query_selector(f"xpath={strategy}")
                 if element:
@@ -54,20 +58,29 @@ class AutomationService:
         return None
     
     async def fill_form(self, url: str, form_data: Dict[str, Any]) -> Dict[str, Any]:
-        browser = await self._get_browser()
-        page = await browser.new_page()
+        context = await browser_pool.acquire(self.headless)
+        page = await context.new_page()
+        blocker = ResourceBlocker(profile="analysis" if self.headless else "interactive")
         
         executed_actions = []
         errors = []
+        submitted = False
         
         try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
-            await page.wait_for_load_state("networkidle", timeout=10000)
-            await page.wait_for_timeout(1000)
+            await blocker.attach(page, url)
+            with self.timer.span("navigation"):
+                await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
+            with self.timer.span("load_wait"):
+                await page.wait_for_load_state("networkidle", timeout=10000)
+                await page.wait_for_timeout(1000)
+            
+            resolved, cache_key = await self._resolve_labels(page, list(form_data.keys()))
             
             for label, value in form_data.items():
                 try:
-                    field = await self._find_field_by_label(page, label)
+                    field = await self._locate_resolved_field(page, label, resolved, cache_key)
+                    if not field and label not in resolved:
+                        field = await self._find_field_by_label(page, label)
                     
                     if not field:
                         errors.append(f"Field not found: {label}")
@@ -133,6 +146,8 @@ class AutomationService:
                 "executed_actions": executed_actions,
                 "errors": errors,
                 "submitted": submitted,
+                "network": blocker.stats(),
+                "timing": self.timer.summary(),
                 "message": "Form filled successfully" if len(errors) == 0 else f"Completed with {len(errors)} errors"
             }
             
@@ -145,10 +160,30 @@ class AutomationService:
                 "errors": errors
             }
         finally:
-            await page.close()
+            await browser_pool.release(context)
     
-    async def fill_form_with_page(self, page: Page, form_data: Dict[str, Any], resume_path: str = None) -> Dict[str, Any]:
-        """Fill form using an existing page instance"""
+    async def fill_form_with_page(
+        self,
+        page: Page,
+        form_data: Dict[str, Any],
+        resume_path: str = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        mode: str = "interactive",
+        fill_plan: Optional[List[Dict[str, Any]]] = None,
+        settled: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Fill form using an existing page instance, reporting per-field outcomes to progress_callback.
+
+        With `settled` the caller has already waited for the page to be ready
+        (FillPipelineService does), so only overlays are dismissed first.
+        """
+        if fill_plan:
+            # Use the option text the plan picked for each select
+            form_data = {**form_data, **FillPlan.values(fill_plan)}
+        if mode == "fast":
+            return await self._fast_fill_with_page(page, form_data, resume_path, progress_callback, fill_plan, settled)
+        
         executed_actions = []
         errors = []
         submitted = False
@@ -156,136 +191,172 @@ class AutomationService:
         
         try:
             # Ensure all content is loaded and visible
-            await self._ensure_page_fully_loaded(page)
+            await self._prepare_page(page, settled)
             
             # First, try to find and upload resume if available
             if resume_path:
-                resume_uploaded = await self._upload_resume_if_present(page, resume_path)
+                with self.timer.span("resume_upload"):
+                    resume_uploaded = await self._upload_resume_if_present(page, resume_path)
                 if resume_uploaded:
                     executed_actions.append("Uploaded resume file")
                     filled_count += 1
+                    await self._report_progress(progress_callback, {
+                        "type": "field", "label": "resume", "status": "filled", "detail": "Uploaded resume file"
+                    })
+            
+            # Resolve every label in one round trip; per-label probing is only a fallback
+            labels_to_fill = [label for label, value in form_data.items() if value and str(value).strip() != ""]
+            with self.timer.span("field_resolve"):
+                resolved, cache_key = await self._resolve_labels(page, labels_to_fill, fill_plan)
+            learned_selectors = {}
             
             for label, value in form_data.items():
                 if not value or str(value).strip() == "":
                     continue
-                    
+                
+                errors_before = len(errors)
+                actions_before = len(executed_actions)
+                from_resolver = False
                 try:
-                    # Try multiple strategies to find the field
-                    field = await self._find_field_by_label(page, label)
-                    
-                    if not field:
-                        # Try partial label matching
-                        field = await self._find_field_by_partial_label(page, label)
+                    with self.timer.span("field_lookup"):
+                        field = await self._locate_resolved_field(page, label, resolved, cache_key)
+                        from_resolver = field is not None
+                        
+                        # Probe label by label only when the resolver script could not run
+                        if not field and label not in resolved:
+                            # Try multiple strategies to find the field
+                            field = await self._find_field_by_label(page, label)
+                        
+                            if not field:
+                                # Try partial label matching
+                                field = await self._find_field_by_partial_label(page, label)
                     
                     if not field:
                         errors.append(f"Field not found: {label}")
                         continue
                     
-                    # Scroll to field and ensure it's visible - use center alignment
-                    try:
-                        await field.evaluate("el => el.scrollIntoView({ behavior: 'smooth', block: 'center', inline: 'nearest' })")
-                        await page.wait_for_timeout(400)
-                    except Exception:
-                        await field.scroll_into_view_if_needed()
-                        await page.wait_for_timeout(400)
-                    
-                    # Try to expand any collapsed sections/accordions
-                    await self._expand_collapsed_sections(page, field)
-                    
-                    # Force scroll to center of viewport for better visibility
-                    try:
-                        box = await field.bounding_box()
-                        if box:
-                            viewport = await page.viewport_size()
-                            scroll_y = box['y'] - (viewport['height'] / 2) + (box['height'] / 2)
-                            await page.evaluate(f"window.scrollTo({{ top: {max(0, scroll_y)}, behavior: 'smooth' }})")
-                            await page.wait_for_timeout(500)
-                    except Exception:
-                        pass
-                    
-                    tag_name = await field.evaluate("el => el.tagName.toLowerCase()")
-                    field_type = await field.get_attribute("type") or ""
-                    
-                    is_visible = await field.is_visible()
-                    if not is_visible:
-                        # Try scrolling more aggressively
+                    with self.timer.span("scroll"):
+                        # Scroll to field and ensure it's visible - use center alignment
                         try:
-                            await field.evaluate("el => el.scrollIntoView({ behavior: 'smooth', block: 'center' })")
-                            await page.wait_for_timeout(500)
-                            is_visible = await field.is_visible()
+                            await field.evaluate("el => el.scrollIntoView({ behavior: 'smooth', block: 'center', inline: 'nearest' })")
+                            await page.wait_for_timeout(400)
+                        except Exception:
+                            await field.scroll_into_view_if_needed()
+                            await page.wait_for_timeout(400)
+                        
+                        # Try to expand any collapsed sections/accordions
+                        await self._expand_collapsed_sections(page, field)
+                        
+                        # Force scroll to center of viewport for better visibility
+                        try:
+                            box = await field.bounding_box()
+                            if box:
+                                viewport = await page.viewport_size()
+                                scroll_y = box['y'] - (viewport['height'] / 2) + (box['height'] / 2)
+                                await page.evaluate(f"window.scrollTo({{ top: {max(0, scroll_y)}, behavior: 'smooth' }})")
+                                await page.wait_for_timeout(500)
                         except Exception:
                             pass
+                    
+                    with self.timer.span("field_action"):
+                        tag_name = await field.evaluate("el => el.tagName.toLowerCase()")
+                        field_type = await field.get_attribute("type") or ""
                         
+                        is_visible = await field.is_visible()
                         if not is_visible:
-                            errors.append(f"Field '{label}' is not visible")
+                            # Try scrolling more aggressively
+                            try:
+                                await field.evaluate("el => el.scrollIntoView({ behavior: 'smooth', block: 'center' })")
+                                await page.wait_for_timeout(500)
+                                is_visible = await field.is_visible()
+                            except Exception:
+                                pass
+                            
+                            if not is_visible:
+                                errors.append(f"Field '{label}' is not visible")
+                                continue
+                        
+                        is_disabled = await field.is_disabled()
+                        if is_disabled:
+                            errors.append(f"Field '{label}' is disabled")
                             continue
-                    
-                    is_disabled = await field.is_disabled()
-                    if is_disabled:
-                        errors.append(f"Field '{label}' is disabled")
-                        continue
-                    
-                    # Handle file upload fields
-                    if field_type == "file":
-                        # Skip if we already uploaded resume to a resume field
-                        if resume_path and self._is_resume_field(label):
+                        
+                        # Handle file upload fields
+                        if field_type == "file":
+                            # Skip if we already uploaded resume to a resume field
+                            if resume_path and self._is_resume_field(label):
+                                continue
+                            # For other file fields, we can't auto-upload without knowing the file
+                            errors.append(f"File upload field '{label}' requires manual upload")
                             continue
-                        # For other file fields, we can't auto-upload without knowing the file
-                        errors.append(f"File upload field '{label}' requires manual upload")
-                        continue
-                    
-                    if tag_name == "select":
-                        try:
-                            await field.select_option(str(value))
-                            executed_actions.append(f"Selected '{value}' in {label}")
-                            filled_count += 1
-                        except Exception as e:
-                            errors.append(f"Could not select '{value}' in {label}: {str(e)}")
-                    elif field_type == "checkbox":
-                        is_checked = await field.is_checked()
-                        if value and not is_checked:
+                        
+                        if tag_name == "select":
+                            try:
+                                await field.select_option(str(value))
+                                executed_actions.append(f"Selected '{value}' in {label}")
+                                filled_count += 1
+                            except Exception as e:
+                                errors.append(f"Could not select '{value}' in {label}: {str(e)}")
+                        elif field_type == "checkbox":
+                            is_checked = await field.is_checked()
+                            if value and not is_checked:
+                                await field.check()
+                                executed_actions.append(f"Checked {label}")
+                                filled_count += 1
+                            elif not value and is_checked:
+                                await field.uncheck()
+                                executed_actions.append(f"Unchecked {label}")
+                        elif field_type == "radio":
                             await field.check()
-                            executed_actions.append(f"Checked {label}")
+                            executed_actions.append(f"Selected radio {label}")
+                            filled_count += 1
+                        else:
+                            # Clear field first
+                            await field.fill("")
+                            await field.fill(str(value))
+                            executed_actions.append(f"Filled {label} with '{value}'")
                             filled_count += 1
-                        elif not value and is_checked:
-                            await field.uncheck()
-                            executed_actions.append(f"Unchecked {label}")
-                    elif field_type == "radio":
-                        await field.check()
-                        executed_actions.append(f"Selected radio {label}")
-                        filled_count += 1
-                    else:
-                        # Clear field first
-                        await field.fill("")
-                        await field.fill(str(value))
-                        executed_actions.append(f"Filled {label} with '{value}'")
-                        filled_count += 1
                     
                 except Exception as e:
                     errors.append(f"Error filling {label}: {str(e)}")
+                finally:
+                    if len(errors) > errors_before:
+                        status, detail = "error", errors[-1]
+                    elif len(executed_actions) > actions_before:
+                        status, detail = "filled", executed_actions[-1]
+                    else:
+                        status, detail = "skipped", ""
+                    if status == "filled" and from_resolver:
+                        learned_selectors[label] = resolved[label]["selector"]
+                    await self._report_progress(progress_callback, {
+                        "type": "field", "label": label, "status": status, "detail": detail
+                    })
+            
+            await self._learn_selectors(cache_key, learned_selectors)
             
             # After filling all fields, scroll to bottom to show submit button
-            try:
-                await page.evaluate("window.scrollTo({ top: document.body.scrollHeight, behavior: 'smooth' })")
-                await page.wait_for_timeout(1500)
-                
-                # Also try to find and scroll to submit button specifically
-                submit_buttons = await page.query_selector_all(
-                    "button[type='submit'], input[type='submit'], button:has-text('Submit'), "
-                    "button:has-text('submit'), button:has-text('Send'), button:has-text('Apply'), "
-                    "button:has-text('Submit application')"
-                )
-                if submit_buttons:
-                    for btn in submit_buttons:
-                        try:
-                            if await btn.is_visible():
-                                await btn.scroll_into_view_if_needed()
-                                await page.wait_for_timeout(500)
-                                break
-                        except Exception:
-                            continue
-            except Exception:
-                pass
+            with self.timer.span("scroll"):
+                try:
+                    await page.evaluate("window.scrollTo({ top: document.body.scrollHeight, behavior: 'smooth' })")
+                    await page.wait_for_timeout(1500)
+                    
+                    # Also try to find and scroll to submit button specifically
+                    submit_buttons = await page.query_selector_all(
+                        "button[type='submit'], input[type='submit'], button:has-text('Submit'), "
+                        "button:has-text('submit'), button:has-text('Send'), button:has-text('Apply'), "
+                        "button:has-text('Submit application')"
+                    )
+                    if submit_buttons:
+                        for btn in submit_buttons:
+                            try:
+                                if await btn.is_visible():
+                                    await btn.scroll_into_view_if_needed()
+                                    await page.wait_for_timeout(500)
+                                    break
+                            except Exception:
+                                continue
+                except Exception:
+                    pass
             
             await page.wait_for_timeout(1000)
             
@@ -296,6 +367,7 @@ class AutomationService:
                 "executed_actions": executed_actions,
                 "errors": errors,
                 "submitted": submitted,
+                "timing": self.timer.summary(),
                 "message": f"Filled {filled_count} out of {len(form_data)} fields successfully" if filled_count > 0 else "No fields could be filled"
             }
             
@@ -307,65 +379,251 @@ class AutomationService:
                 "errors": errors
             }
     
-    def _is_resume_field(self, label: str) -> bool:
-        """Check if a label indicates a resume/CV upload field"""
-        resume_keywords = ["resume", "cv", "curriculum vitae", "cover letter", "attachment"]
-        label_lower = label.lower()
-        return any(keyword in label_lower for keyword in resume_keywords)
-    
-    async def _ensure_page_fully_loaded(self, page: Page):
-        """Ensure page is fully loaded, all content is visible, and scroll through the page"""
+    async def _fast_fill_with_page(
+        self,
+        page: Page,
+        form_data: Dict[str, Any],
+        resume_path: str = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        fill_plan: Optional[List[Dict[str, Any]]] = None,
+        settled: bool = False
+    ) -> Dict[str, Any]:
+        """Headless fill: resolve every label, then write all values with one in-page script"""
+        executed_actions = []
+        errors = []
+        filled_count = 0
+        
         try:
-            # Wait for network to be idle
-            await page.wait_for_load_state("networkidle", timeout=15000)
-            await page.wait_for_timeout(2000)  # Extra wait for dynamic content
+            await self._prepare_page(page, settled)
             
-            # First, scroll all the way to bottom to trigger lazy loading
-            await page.evaluate("window.scrollTo({ top: document.body.scrollHeight, behavior: 'smooth' })")
-            await page.wait_for_timeout(2000)
+            if resume_path:
+                with self.timer.span("resume_upload"):
+                    resume_uploaded = await self._upload_resume_if_present(page, resume_path)
+                if resume_uploaded:
+                    executed_actions.append("Uploaded resume file")
+                    filled_count += 1
+                    await self._report_progress(progress_callback, {
+                        "type": "field", "label": "resume", "status": "filled", "detail": "Uploaded resume file"
+                    })
             
-            # Scroll through the entire page to trigger lazy loading
-            viewport_height = await page.evaluate("window.innerHeight")
-            total_height = await page.evaluate("document.body.scrollHeight")
+            values = {label: value for label, value in form_data.items() if value and str(value).strip() != ""}
+            with self.timer.span("field_resolve"):
+                resolved, cache_key = await self._resolve_labels(page, list(values), fill_plan)
+            with self.timer.span("field_action"):
+                outcomes = await self._apply_resolved(page, values, resolved)
             
-            # Scroll down in increments to load all content
-            current_position = 0
-            scroll_step = viewport_height * 0.7  # Scroll 70% of viewport at a time
+            # Planned or learned selectors that matched nothing are stale: rediscover those labels once
+            stale = [
+                label for label, outcome in outcomes.items()
+                if outcome["status"] == "not_found" and (resolved.get(label) or {}).get("strategy") in ("plan", "cache")
+            ]
+            if stale:
+                for label in stale:
+                    if resolved[label]["strategy"] != "cache":
+                        continue
+                    try:
+                        await selector_cache.invalidate(cache_key[0], cache_key[1], label)
+                    except Exception:
+                        pass
+                with self.timer.span("field_resolve"):
+                    resolved.update(await self.field_resolver.resolve_fields(page, stale))
+                with self.timer.span("field_action"):
+                    outcomes.update(await self._apply_resolved(page, {label: values[label] for label in stale}, resolved))
             
-            while current_position < total_height:
-                await page.evaluate(f"window.scrollTo({{ top: {current_position}, behavior: 'smooth' }})")
-                await page.wait_for_timeout(1000)  # Longer wait for content to load
-                current_position += scroll_step
-                # Re-check total height in case it increased
-                new_height = await page.evaluate("document.body.scrollHeight")
-                if new_height > total_height:
-                    total_height = new_height
-                    # Scroll to new bottom
-                    await page.evaluate(f"window.scrollTo({{ top: {new_height}, behavior: 'smooth' }})")
-                    await page.wait_for_timeout(1000)
+            learned_selectors = {}
+            for label, value in values.items():
+                outcome = outcomes[label]
+                status = outcome["status"]
+                field_type = outcome.get("type", "")
+                counted = True
+                
+                if status == "filled":
+                    message = f"Filled {label} with '{value}'"
+                elif status == "selected":
+                    message = f"Selected '{value}' in {label}"
+                elif status == "checked":
+                    message = f"Selected radio {label}" if field_type == "radio" else f"Checked {label}"
+                elif status == "unchecked":
+                    message, counted = f"Unchecked {label}", False
+                elif status == "unchanged":
+                    if field_type != "radio":
+                        await self._report_progress(progress_callback, {
+                            "type": "field", "label": label, "status": "skipped", "detail": ""
+                        })
+                        continue
+                    message = f"Selected radio {label}"
+                elif status == "file" and resume_path and self._is_resume_field(label):
+                    await self._report_progress(progress_callback, {
+                        "type": "field", "label": label, "status": "skipped", "detail": ""
+                    })
+                    continue
+                else:
+                    if status == "not_found":
+                        message = f"Field not found: {label}"
+                    elif status == "disabled":
+                        message = f"Field '{label}' is disabled"
+                    elif status == "file":
+                        message = f"File upload field '{label}' requires manual upload"
+                    elif status == "no_option":
+                        message = f"Could not select '{value}' in {label}: no matching option"
+                    else:
+                        message = f"Error filling {label}: {outcome.get('detail', 'unknown error')}"
+                    errors.append(message)
+                    await self._report_progress(progress_callback, {
+                        "type": "field", "label": label, "status": "error", "detail": message
+                    })
+                    continue
+                
+                executed_actions.append(message)
+                if counted:
+                    filled_count += 1
+                    learned_selectors[label] = resolved[label]["selector"]
+                await self._report_progress(progress_callback, {
+                    "type": "field", "label": label, "status": "filled", "detail": message
+                })
             
-            # Scroll back to top
-            await page.evaluate("window.scrollTo({ top: 0, behavior: 'smooth' })")
-            await page.wait_for_timeout(1500)
+            await self._learn_selectors(cache_key, learned_selectors)
             
-            # Try to close any modals/overlays that might be blocking content
+            return {
+                "success": filled_count > 0,
+                "filled_count": filled_count,
+                "total_fields": len(form_data),
+                "executed_actions": executed_actions,
+                "errors": errors,
+                "submitted": False,
+                "fill_mode": "fast",
+                "timing": self.timer.summary(),
+                "field_statuses": [outcomes[label] for label in values],
+                "message": f"Filled {filled_count} out of {len(form_data)} fields successfully" if filled_count > 0 else "No fields could be filled"
+            }
+        
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "executed_actions": executed_actions,
+                "errors": errors
+            }
+    
+    async def _apply_resolved(self, page: Page, values: Dict[str, Any], resolved: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Run the fast-fill script for labels that resolved; unresolved labels are reported as not_found"""
+        outcomes = {}
+        items = []
+        for label, value in values.items():
+            resolution = resolved.get(label)
+            if resolution and resolution.get("selector"):
+                items.append({"label": label, "selector": resolution["selector"], "value": value})
+            else:
+                outcomes[label] = {"label": label, "status": "not_found"}
+        for outcome in await self.fast_fill.apply(page, items):
+            outcomes[outcome["label"]] = outcome
+        return outcomes
+    
+    async def _resolve_labels(
+        self,
+        page: Page,
+        labels: List[str],
+        fill_plan: Optional[List[Dict[str, Any]]] = None
+    ) -> Tuple[Dict[str, Any], Optional[Tuple[str, str]]]:
+        """Resolve labels from the fill plan, then the learned selector cache, then with one in-page lookup"""
+        planned = FillPlan.to_resolutions(fill_plan)
+        resolved = {label: planned[label] for label in labels if label in planned}
+        cache_key = None
+        if settings.selector_cache_enabled and labels:
+            host = urlparse(page.url).netloc.lower()
+            form_hash = await self.field_resolver.form_signature(page)
+            if host and form_hash:
+                cache_key = (host, form_hash)
+                try:
+                    cached = await selector_cache.lookup(host, form_hash, [label for label in labels if label not in resolved])
+                except Exception:
+                    cached = {}
+                for label, selector in cached.items():
+                    resolved[label] = {"selector": selector, "strategy": "cache"}
+        
+        missing = [label for label in labels if label not in resolved]
+        if missing:
+            resolved.update(await self.field_resolver.resolve_fields(page, missing))
+        return resolved, cache_key
+    
+    async def _locate_resolved_field(self, page: Page, label: str, resolved: Dict[str, Any], cache_key) -> Any:
+        resolution = resolved.get(label)
+        field = await self.field_resolver.query_resolved(page, resolution)
+        if not field and resolution and resolution.get("strategy") in ("plan", "cache"):
+            # Stale planned or learned selector - rediscover this label (and forget a learned one)
+            if resolution["strategy"] == "cache":
+                try:
+                    await selector_cache.invalidate(cache_key[0], cache_key[1], label)
+                except Exception:
+                    pass
+            rediscovered = await self.field_resolver.resolve_fields(page, [label])
+            if label not in rediscovered:
+                # The resolver could not run; leave the label to the per-label fallback
+                resolved.pop(label, None)
+                return None
+            resolution = rediscovered[label]
+            resolved[label] = resolution
+            field = await self.field_resolver.query_resolved(page, resolution)
+        return field
+    
+    async def _learn_selectors(self, cache_key, selectors: Dict[str, str]):
+        # Marker attributes are only valid for the current page load
+        durable = {
+            label: selector for label, selector in selectors.items()
+            if not selector.startswith("[data-aiff-field")
+        }
+        if cache_key and durable:
             try:
-                close_buttons = await page.query_selector_all(
-                    "button[aria-label*='close' i], button[aria-label*='dismiss' i], "
-                    ".modal-close, .close-button, [class*='close'][class*='button'], "
-                    "button:has-text('Close'), button:has-text('×')"
-                )
-                for btn in close_buttons:
-                    if await btn.is_visible():
-                        await btn.click()
-                        await page.wait_for_timeout(500)
+                await selector_cache.store(cache_key[0], cache_key[1], durable)
             except Exception:
                 pass
-                
+    
+    @staticmethod
+    async def _report_progress(progress_callback, event: Dict[str, Any]):
+        if progress_callback:
+            try:
+                await progress_callback(event)
+            except Exception:
+                pass
+    
+    def _is_resume_field(self, label: str) -> bool:
+        """Check if a label indicates a resume/CV upload field"""
+        resume_keywords = ["resume", "cv", "curriculum vitae", "cover letter", "attachment"]
+        label_lower = label.lower()
+        return any(keyword in label_lower for keyword in resume_keywords)
+    
+    async def _prepare_page(self, page: Page, settled: bool):
+        """Wait for the page unless the caller already did, then clear overlays"""
+        if settled:
+            await self._dismiss_overlays(page)
+            return
+        with self.timer.span("load_wait"):
+            await self._ensure_page_fully_loaded(page)
+    
+    async def _ensure_page_fully_loaded(self, page: Page):
+        """Ensure page is fully loaded, all content is visible, and scroll through the page"""
+        try:
+            await self.readiness.wait_until_ready(page)
+            await self._dismiss_overlays(page)
         except Exception as e:
             # Continue even if scrolling fails
             pass
     
+    async def _dismiss_overlays(self, page: Page):
+        """Try to close any modals/overlays that might be blocking content"""
+        try:
+            close_buttons = await page.query_selector_all(
+                "button[aria-label*='close' i], button[aria-label*='dismiss' i], "
+                ".modal-close, .close-button, [class*='close'][class*='button'], "
+                "button:has-text('Close'), button:has-text('×')"
+            )
+            for btn in close_buttons:
+                if await btn.is_visible():
+                    await btn.click()
+                    await page.wait_for_timeout(500)
+        except Exception:
+            pass
+    
     async def _expand_collapsed_sections(self, page: Page, field_element):
         """Try to expand collapsed sections, accordions, or tabs that might contain the field"""
         try:
@@ -466,6 +724,7 @@ class AutomationService:
             ]
             
             for strategy in strategies:
+                self.timer.count("partial_label_strategy_attempts")
                 try:
                     element = await page.query_selector(f"xpath={strategy}")
                     if element:
@@ -484,11 +743,6 @@ class AutomationService:
         return None
     
     async def close(self):
-        if self.browser:
-            try:
-                await self.browser.close()
-            except Exception:
-                pass
-            finally:
-                self.browser = None
+        # The browser belongs to the shared pool; only drop our reference
+        self.browser = None
 
@@ -0,0 +1,87 @@
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
+from app.config import settings
+from app.services.browser_pool import browser_pool
+from app.services.fill_pipeline_service import FillPipelineService
+import asyncio
+import time
+
+
+class BatchFillService:
+    """
+    Fill many URLs concurrently in isolated headless contexts.
+
+    Parallelism never exceeds the browser pool's headless concurrency: fills
+    beyond it would only queue in the pool and could time out there.
+    """
+
+    def __init__(
+        self,
+        parallelism: int = None,
+        per_host_limit: int = None,
+        pipeline: FillPipelineService = None,
+        pool=None
+    ):
+        max_concurrency = (pool or browser_pool).max_concurrency
+        parallelism = parallelism or settings.batch_fill_parallelism or max_concurrency
+        self.parallelism = max(1, min(parallelism, max_concurrency))
+        self.per_host_limit = max(1, per_host_limit or settings.batch_fill_per_host_limit)
+        self.pipeline = pipeline or FillPipelineService()
+
+    async def fill_all(
+        self,
+        urls: List[str],
+        form_data: Dict[str, Any],
+        resume_path: str = None,
+        skip_validation: bool = False,
+        key_info: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        global_slots = asyncio.Semaphore(self.parallelism)
+        host_slots: Dict[str, asyncio.Semaphore] = {}
+
+        async def fill_one(url: str) -> Dict[str, Any]:
+            host = urlparse(url).netloc.lower()
+            if host not in host_slots:
+                host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+
+            async with host_slots[host], global_slots:
+                started = time.perf_counter()
+                url_form_data = form_data
+                try:
+                    result = await self.pipeline.run(
+                        url,
+                        form_data,
+                        resume_path=resume_path,
+                        headless=True,
+                        keep_open=False,
+                        analyze=not skip_validation,
+                        key_info=key_info
+                    )
+                    url_form_data = result.pop("form_data", form_data)
+                    entry = {"url": url, "success": bool(result.get("success")), "result": result}
+                except Exception as e:
+                    entry = {"url": url, "success": False, "error": str(e)}
+                entry["form_data"] = url_form_data
+                entry["elapsed_ms"] = round((time.perf_counter() - started) * 1000)
+                return entry
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(fill_one(url) for url in urls))
+        wall_ms = round((time.perf_counter() - started) * 1000)
+
+        durations = [r["elapsed_ms"] for r in results]
+        succeeded = sum(1 for r in results if r["success"])
+        return {
+            "results": results,
+            "summary": {
+                "total": len(results),
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+                "parallelism": self.parallelism,
+                "per_host_limit": self.per_host_limit,
+                "wall_ms": wall_ms,
+                "total_fill_ms": sum(durations),
+                "avg_fill_ms": round(sum(durations) / len(durations)) if durations else 0,
+                "max_fill_ms": max(durations) if durations else 0
+            }
+        }
@@ -0,0 +1,185 @@
+from playwright.async_api import async_playwright, Playwright, Browser, BrowserContext, Page
+from contextlib import asynccontextmanager
+from app.config import settings
+from app.utils.logger import logger
+from typing import Dict, Any, Optional
+import asyncio
+
+
+class BrowserPoolTimeout(Exception):
+    """Raised when no browser context becomes free within the acquire timeout"""
+
+
+# Only the headed interactive fill needs cross-origin frames to behave like one page;
+# headless browsers keep the same-origin policy and site isolation
+HEADED_ARGS = ['--disable-web-security', '--disable-features=IsolateOrigins,site-per-process']
+
+
+class BrowserPool:
+    """
+    App-wide pool of warm browser processes.
+
+    Browsers are launched once (at startup or on first use) and kept running.
+    Every request leases a fresh, isolated BrowserContext that is closed on
+    release, so no cookies, storage, cache, service workers or permissions
+    carry over to the next lease. At most `max_concurrency` headless contexts
+    are leased at a time; headed contexts, which stay leased until the user
+    closes the window, have their own limit (`max_headed`) so they can't
+    starve headless work.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = None,
+        max_headed: int = None,
+        acquire_timeout: float = None
+    ):
+        self.max_concurrency = max_concurrency or settings.browser_pool_max_concurrency
+        self.max_headed = max_headed or settings.browser_pool_max_headed
+        self.acquire_timeout = acquire_timeout or settings.browser_pool_acquire_timeout
+        self._playwright: Optional[Playwright] = None
+        # Browsers and lease slots are keyed by the headless flag
+        self._browsers: Dict[bool, Browser] = {}
+        self._leased: Dict[BrowserContext, bool] = {}
+        self._semaphores: Dict[bool, asyncio.Semaphore] = {
+            True: asyncio.Semaphore(self.max_concurrency),
+            False: asyncio.Semaphore(self.max_headed)
+        }
+        self._lock = asyncio.Lock()
+        self._launches = 0
+        self._contexts_created = 0
+
+    async def start(self, headless: bool = None):
+        """Launch the warm browser for the given mode ahead of the first request"""
+        if headless is None:
+            headless = settings.playwright_headless
+        await self.get_browser(headless)
+
+    async def get_browser(self, headless: bool = True) -> Browser:
+        async with self._lock:
+            browser = self._browsers.get(headless)
+            if browser is not None and browser.is_connected():
+                return browser
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            browser = await self._launch(headless)
+            browser.on("disconnected", lambda b: self._on_disconnected(headless, b))
+            self._browsers[headless] = browser
+            self._launches += 1
+            logger.info(f"Browser pool launched {'headless' if headless else 'headed'} browser")
+            return browser
+
+    async def _launch(self, headless: bool) -> Browser:
+        # Prefer system Chrome, then bundled Chromium, then Firefox
+        try:
+            return await self._playwright.chromium.launch(
+                headless=headless,
+                channel="chrome",
+                args=[
+                    '--disable-blink-features=AutomationControlled',
+                    '--start-maximized',
+                    *([] if headless else HEADED_ARGS)
+                ]
+            )
+        except Exception:
+            pass
+        try:
+            return await self._playwright.chromium.launch(
+                headless=headless,
+                args=[
+                    '--disable-blink-features=AutomationControlled',
+                    '--start-maximized',
+                    '--no-sandbox'
+                ]
+            )
+        except Exception:
+            return await self._playwright.firefox.launch(headless=headless)
+
+    def _on_disconnected(self, headless: bool, browser: Browser):
+        if self._browsers.get(headless) is browser:
+            del self._browsers[headless]
+        for context, context_headless in list(self._leased.items()):
+            if context.browser is browser:
+                self._leased.pop(context, None)
+                self._semaphores[context_headless].release()
+
+    async def acquire(self, headless: bool = True) -> BrowserContext:
+        """Lease a new isolated context, waiting for a free slot if the pool is saturated"""
+        semaphore = self._semaphores[headless]
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise BrowserPoolTimeout(
+                f"No browser context became available within {self.acquire_timeout}s"
+            )
+
+        try:
+            browser = await self.get_browser(headless)
+            context = await browser.new_context(viewport={"width": 1920, "height": 1080})
+        except Exception:
+            semaphore.release()
+            raise
+
+        self._contexts_created += 1
+        self._leased[context] = headless
+        return context
+
+    async def release(self, context: BrowserContext):
+        """Close a leased context and free its slot"""
+        headless = self._leased.pop(context, None)
+        if headless is None:
+            return
+
+        try:
+            await context.close()
+        except Exception:
+            pass
+        finally:
+            self._semaphores[headless].release()
+
+    def release_on_close(self, context: BrowserContext, page: Page):
+        """Keep the lease until the user closes the page (interactive headed flow)"""
+        async def _release(_):
+            await self.release(context)
+
+        page.on("close", _release)
+
+    @asynccontextmanager
+    async def lease(self, headless: bool = True):
+        context = await self.acquire(headless)
+        try:
+            yield context
+        finally:
+            await self.release(context)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_headed": self.max_headed,
+            "leased": sum(1 for headless in self._leased.values() if headless),
+            "leased_headed": sum(1 for headless in self._leased.values() if not headless),
+            "browsers": len(self._browsers),
+            "launches": self._launches,
+            "contexts_created": self._contexts_created
+        }
+
+    async def close(self):
+        for browser in list(self._browsers.values()):
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers.clear()
+        self._leased.clear()
+        if self._playwright:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            finally:
+                self._playwright = None
+
+
+browser_pool = BrowserPool()
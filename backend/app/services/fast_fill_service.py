@@ -0,0 +1,148 @@
+from playwright.async_api import Page
+from typing import Dict, Any, List
+
+
+# Runs inside the page: writes every value through the native property setters
+# so React/Vue controlled inputs see the change, then fires the events their
+# listeners rely on. Returns one status entry per requested field.
+FAST_FILL_SCRIPT = """
+(items) => {
+    const setterFor = (el) => {
+        const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+            : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+            : HTMLInputElement.prototype;
+        const descriptor = Object.getOwnPropertyDescriptor(proto, 'value');
+        return descriptor && descriptor.set;
+    };
+    const setValue = (el, value) => {
+        const setter = setterFor(el);
+        if (setter) {
+            setter.call(el, value);
+        } else {
+            el.value = value;
+        }
+    };
+    const fire = (el, type) => el.dispatchEvent(new Event(type, { bubbles: true }));
+    const blur = (el) => {
+        el.dispatchEvent(new FocusEvent('blur'));
+        el.dispatchEvent(new FocusEvent('focusout', { bubbles: true }));
+    };
+    // Value sanitisation strips line breaks (and trims emails/URLs); the rest must survive
+    const sameText = (value) => String(value).replace(/[\\r\\n]/g, '').trim().toLowerCase();
+    const truthy = (value) => !['', 'false', 'no', 'off', '0'].includes(String(value).trim().toLowerCase());
+    const radioText = (radio) => {
+        const label = (radio.labels && radio.labels[0]) || radio.closest('label');
+        return ((label && label.textContent) || radio.getAttribute('aria-label') || '').trim().toLowerCase();
+    };
+    const radioFor = (el, value) => {
+        const scope = el.form || document;
+        const group = el.name
+            ? Array.from(scope.querySelectorAll('input[type="radio"]')).filter((r) => r.name === el.name)
+            : [el];
+        const wanted = String(value).trim().toLowerCase();
+        // A partial label match only counts when it is unambiguous ("no" is in "not sure")
+        const partial = wanted ? group.filter((r) => radioText(r).includes(wanted)) : [];
+        const choice = group.find((r) => r.value === String(value))
+            || group.find((r) => r.value.trim().toLowerCase() === wanted)
+            || group.find((r) => radioText(r) === wanted)
+            || (partial.length === 1 ? partial[0] : null);
+        // A lone radio (no group to choose from) is a yes/no switch like a checkbox
+        if (!choice && group.length === 1 && truthy(value)) {
+            return el;
+        }
+        return choice || null;
+    };
+
+    return items.map(({ label, selector, value }) => {
+        let el = null;
+        try {
+            el = selector ? document.querySelector(selector) : null;
+        } catch (e) {
+            el = null;
+        }
+        if (!el) {
+            return { label, status: 'not_found' };
+        }
+        const tag = el.tagName.toLowerCase();
+        const type = (el.getAttribute('type') || '').toLowerCase();
+        if (el.disabled || el.readOnly) {
+            return { label, status: 'disabled', tag, type };
+        }
+        if (type === 'file') {
+            return { label, status: 'file', tag, type };
+        }
+
+        try {
+            if (tag === 'select') {
+                const wanted = String(value).trim().toLowerCase();
+                const options = Array.from(el.options);
+                const option = options.find((o) => o.value === String(value))
+                    || options.find((o) => o.text.trim().toLowerCase() === wanted)
+                    || options.find((o) => wanted && o.text.trim().toLowerCase().includes(wanted));
+                if (!option) {
+                    return { label, status: 'no_option', tag, type };
+                }
+                setValue(el, option.value);
+                fire(el, 'input');
+                fire(el, 'change');
+                blur(el);
+                return { label, status: 'selected', tag, type };
+            }
+            if (type === 'radio') {
+                // The label may have resolved to any radio of the group: pick the one whose
+                // value or label text is the answer, so "No" never submits "Yes"
+                const choice = radioFor(el, value);
+                if (!choice) {
+                    return { label, status: 'no_option', tag, type };
+                }
+                if (choice.checked) {
+                    return { label, status: 'unchanged', tag, type };
+                }
+                choice.click();
+                blur(choice);
+                return { label, status: 'checked', tag, type };
+            }
+            if (type === 'checkbox') {
+                const want = truthy(value);
+                if (el.checked === want) {
+                    return { label, status: 'unchanged', tag, type };
+                }
+                // click() toggles checked and fires click/input/change the way frameworks expect
+                el.click();
+                blur(el);
+                return { label, status: want ? 'checked' : 'unchecked', tag, type };
+            }
+            el.focus();
+            setValue(el, String(value));
+            // Date, number, etc. inputs silently drop values they cannot parse; read the
+            // value back before frameworks get the events and may reformat it
+            if (sameText(el.value) !== sameText(value)) {
+                return { label, status: 'error', tag, type, detail: 'value rejected by the ' + (type || tag) + ' field' };
+            }
+            fire(el, 'input');
+            fire(el, 'change');
+            blur(el);
+            return { label, status: 'filled', tag, type };
+        } catch (e) {
+            return { label, status: 'error', tag, type, detail: String(e && e.message || e) };
+        }
+    });
+}
+"""
+
+
+class FastFillService:
+    """Writes resolved form values with a single page.evaluate call, for headless fills"""
+
+    async def apply(self, page: Page, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill {label, selector, value} items; returns a {label, status, ...} entry per item"""
+        if not items:
+            return []
+        payload = [
+            {"label": item["label"], "selector": item.get("selector"), "value": str(item.get("value", ""))}
+            for item in items
+        ]
+        try:
+            return await page.evaluate(FAST_FILL_SCRIPT, payload)
+        except Exception as e:
+            return [{"label": item["label"], "status": "error", "detail": str(e)} for item in payload]
@@ -0,0 +1,188 @@
+from playwright.async_api import Page
+from typing import Dict, Any, List, Optional
+import hashlib
+
+
+# Runs inside the page: indexes every form control by the texts that can
+# identify it and resolves all requested labels in a single round trip.
+RESOLVE_FIELDS_SCRIPT = """
+(labels) => {
+    const norm = (s) => (s || '').toLowerCase().replace(/\\s+/g, ' ').trim();
+    const skipTypes = new Set(['hidden', 'submit', 'button', 'reset', 'image']);
+
+    const controls = Array.from(document.querySelectorAll('input, select, textarea'))
+        .filter((el) => !skipTypes.has((el.getAttribute('type') || '').toLowerCase()));
+
+    const entries = controls.map((el) => {
+        const labelTexts = [];
+        for (const label of Array.from(el.labels || [])) {
+            labelTexts.push(norm(label.textContent));
+        }
+        const prev = el.previousElementSibling;
+        if (prev && prev.tagName === 'LABEL') {
+            labelTexts.push(norm(prev.textContent));
+        }
+        const ariaLabel = el.getAttribute('aria-label');
+        if (ariaLabel) {
+            labelTexts.push(norm(ariaLabel));
+        }
+        const labelledBy = el.getAttribute('aria-labelledby');
+        if (labelledBy) {
+            for (const id of labelledBy.split(/\\s+/)) {
+                const ref = document.getElementById(id);
+                if (ref) {
+                    labelTexts.push(norm(ref.textContent));
+                }
+            }
+        }
+        return {
+            el,
+            labels: labelTexts.filter(Boolean),
+            attrs: [
+                norm(el.getAttribute('placeholder')),
+                norm(el.getAttribute('name')),
+                norm(el.id)
+            ].filter(Boolean)
+        };
+    });
+
+    const exact = new Map();
+    for (const entry of entries) {
+        for (const text of entry.labels.concat(entry.attrs)) {
+            if (!exact.has(text)) {
+                exact.set(text, entry.el);
+            }
+        }
+    }
+
+    // Markers survive on the page between runs while some of their controls are
+    // removed, so count up from a per-window counter rather than the markers left
+    if (window.__aiffNextMarker === undefined) {
+        window.__aiffNextMarker = 0;
+    }
+    const selectorFor = (el) => {
+        const tag = el.tagName.toLowerCase();
+        if (el.id) {
+            const byId = '#' + CSS.escape(el.id);
+            if (document.querySelectorAll(byId).length === 1) {
+                return byId;
+            }
+        }
+        const name = el.getAttribute('name');
+        if (name) {
+            const byName = tag + '[name="' + CSS.escape(name) + '"]';
+            if (document.querySelectorAll(byName).length === 1) {
+                return byName;
+            }
+        }
+        if (!el.hasAttribute('data-aiff-field')) {
+            el.setAttribute('data-aiff-field', String(window.__aiffNextMarker++));
+        }
+        return '[data-aiff-field="' + el.getAttribute('data-aiff-field') + '"]';
+    };
+
+    // Controls already claimed by a label; the fuzzy strategies skip them so "Name"
+    // can't take the input that "First Name" matched exactly
+    const used = new Set();
+    const findContaining = (needle) => {
+        for (const entry of entries) {
+            if (!used.has(entry.el) && entry.labels.some((text) => text.includes(needle))) {
+                return entry.el;
+            }
+        }
+        for (const entry of entries) {
+            if (!used.has(entry.el) && entry.attrs.some((text) => text.includes(needle))) {
+                return entry.el;
+            }
+        }
+        return null;
+    };
+
+    // Exact matches claim their controls first, then the rest fall back to substrings
+    const found = new Map();
+    for (const label of labels) {
+        const query = norm(label);
+        if (query && exact.has(query)) {
+            found.set(label, { el: exact.get(query), strategy: 'exact' });
+            used.add(exact.get(query));
+        }
+    }
+    for (const label of labels) {
+        if (found.has(label)) {
+            continue;
+        }
+        const query = norm(label);
+        let el = query ? findContaining(query) : null;
+        let strategy = 'contains';
+        if (!el) {
+            for (const word of query.split(' ').filter((w) => w.length > 3)) {
+                el = findContaining(word);
+                if (el) {
+                    strategy = 'partial';
+                    break;
+                }
+            }
+        }
+        if (el) {
+            found.set(label, { el, strategy });
+            used.add(el);
+        }
+    }
+
+    const results = {};
+    for (const label of labels) {
+        const match = found.get(label);
+        results[label] = match ? { selector: selectorFor(match.el), strategy: match.strategy } : null;
+    }
+    return results;
+}
+"""
+
+
+# Structure of the page's form controls, ignoring ids that frameworks regenerate per load
+FORM_SIGNATURE_SCRIPT = """
+() => Array.from(document.querySelectorAll('input, select, textarea'))
+    .map((el) => [
+        el.tagName.toLowerCase(),
+        (el.getAttribute('type') || '').toLowerCase(),
+        el.getAttribute('name') || ''
+    ].join('|'))
+    .join('\\n')
+"""
+
+
+class FieldResolverService:
+    """Resolves form labels to element selectors with one page.evaluate call"""
+
+    async def resolve_fields(self, page: Page, labels: List[str]) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Return {label: {"selector", "strategy"} or None} for every label.
+
+        None means the script ran and found no control for the label. If the
+        script itself fails the labels are left out, so callers can tell that
+        apart and fall back to probing the page themselves.
+        """
+        labels = [label for label in labels if label]
+        if not labels:
+            return {}
+        try:
+            return await page.evaluate(RESOLVE_FIELDS_SCRIPT, labels)
+        except Exception:
+            return {}
+
+    async def form_signature(self, page: Page) -> str:
+        """Short structural hash of the form controls, used to key learned selectors"""
+        try:
+            structure = await page.evaluate(FORM_SIGNATURE_SCRIPT)
+        except Exception:
+            return ""
+        return hashlib.sha1(structure.encode("utf-8")).hexdigest()[:16]
+
+    async def query_resolved(self, page: Page, resolution: Optional[Dict[str, str]]) -> Any:
+        """Turn a resolver result into an element handle, or None if it went stale"""
+        if not resolution or not resolution.get("selector"):
+            return None
+        try:
+            return await page.query_selector(resolution["selector"])
+        except Exception:
+            return None
@@ -0,0 +1,215 @@
+from datetime import datetime
+from typing import Dict, Any, List, Optional, AsyncIterator
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.fill_pipeline_service import FillPipelineService
+from app.utils.logger import logger
+import asyncio
+import uuid
+
+
+class FillJobQueueFull(Exception):
+    """Raised when a user already has the maximum number of pending fill jobs"""
+
+
+class FillJob:
+
+    def __init__(self, user_id: str, url: str, form_data: Dict[str, Any], options: Dict[str, Any]):
+        self.id = str(uuid.uuid4())
+        self.user_id = user_id
+        self.url = url
+        self.form_data = form_data
+        self.options = options
+        self.status = "queued"  # queued, running, completed, failed
+        self.events: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.application_id: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    async def add_event(self, event: Dict[str, Any]):
+        event = dict(event)
+        event["seq"] = len(self.events)
+        event["time"] = datetime.utcnow().isoformat()
+        self.events.append(event)
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def stream_events(self, after: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """Yield events from index `after` onwards until the job finishes"""
+        position = after
+        while True:
+            while position < len(self.events):
+                yield self.events[position]
+                position += 1
+            if self.finished:
+                return
+            async with self._changed:
+                if position >= len(self.events) and not self.finished:
+                    await self._changed.wait()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "url": self.url,
+            "status": self.status,
+            "progress": [e for e in self.events if e.get("type") == "field"],
+            "result": self.result,
+            "error": self.error,
+            "application_id": self.application_id,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class FillJobService:
+    """
+    In-process fill job queue.
+
+    A fixed set of workers (the global concurrency cap) picks the oldest queued
+    job whose owner is below the per-user running cap, so one user submitting
+    many jobs cannot starve everyone else.
+    """
+
+    def __init__(
+        self,
+        workers: int = None,
+        per_user_limit: int = None,
+        max_queued_per_user: int = None,
+        retention_seconds: int = None,
+        pipeline: FillPipelineService = None,
+        session_factory=None
+    ):
+        self.workers = workers or settings.fill_job_workers
+        self.per_user_limit = per_user_limit or settings.fill_job_per_user_limit
+        self.max_queued_per_user = max_queued_per_user or settings.fill_job_max_queued_per_user
+        self.retention_seconds = retention_seconds or settings.fill_job_retention_seconds
+        self.pipeline = pipeline or FillPipelineService()
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.jobs: Dict[str, FillJob] = {}
+        self._queue: List[FillJob] = []
+        self._running: Dict[str, int] = {}
+        self._ready = asyncio.Condition()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        if self._tasks:
+            return
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, user_id: str, url: str, form_data: Dict[str, Any], **options) -> FillJob:
+        self._prune()
+        pending = sum(1 for job in self.jobs.values() if job.user_id == user_id and not job.finished)
+        if pending >= self.max_queued_per_user:
+            raise FillJobQueueFull(
+                f"You already have {pending} fill jobs pending. Wait for some to finish."
+            )
+
+        job = FillJob(user_id, url, form_data, options)
+        self.jobs[job.id] = job
+        await job.add_event({"type": "status", "status": "queued"})
+
+        # Workers are started lazily so the service works without a startup hook
+        self.start()
+        async with self._ready:
+            self._queue.append(job)
+            self._ready.notify_all()
+        return job
+
+    def get(self, job_id: str) -> Optional[FillJob]:
+        return self.jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": len(self._queue),
+            "running": sum(self._running.values()),
+            "tracked_jobs": len(self.jobs)
+        }
+
+    def _next_runnable(self) -> Optional[FillJob]:
+        for job in self._queue:
+            if self._running.get(job.user_id, 0) < self.per_user_limit:
+                return job
+        return None
+
+    async def _worker(self):
+        while True:
+            async with self._ready:
+                job = self._next_runnable()
+                while job is None:
+                    await self._ready.wait()
+                    job = self._next_runnable()
+                self._queue.remove(job)
+                self._running[job.user_id] = self._running.get(job.user_id, 0) + 1
+
+            try:
+                await self._run(job)
+            finally:
+                async with self._ready:
+                    self._running[job.user_id] -= 1
+                    if not self._running[job.user_id]:
+                        del self._running[job.user_id]
+                    self._ready.notify_all()
+
+    async def _run(self, job: FillJob):
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        await job.add_event({"type": "status", "status": "running"})
+
+        headless = job.options.get("headless", True)
+        try:
+            result = await self.pipeline.run(
+                job.url,
+                job.form_data,
+                resume_path=job.options.get("resume_path"),
+                multi_step=job.options.get("multi_step", False),
+                headless=headless,
+                keep_open=not headless,
+                progress_callback=job.add_event,
+                analyze=not job.options.get("skip_validation", False),
+                key_info=job.options.get("key_info")
+            )
+            job.form_data = result.pop("form_data", job.form_data)
+            result["profile_used"] = job.options.get("profile_used", False)
+
+            async with self.session_factory() as db:
+                job.application_id = await FillPipelineService.save_application(
+                    db, job.user_id, job.url, job.form_data, result
+                )
+            if job.application_id:
+                result["application_id"] = job.application_id
+
+            job.result = result
+            job.status = "completed"
+        except Exception as e:
+            logger.warning(f"Fill job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.utcnow()
+            await job.add_event({"type": "status", "status": job.status, "error": job.error})
+
+    def _prune(self):
+        now = datetime.utcnow()
+        for job_id, job in list(self.jobs.items()):
+            if job.finished and (now - job.finished_at).total_seconds() > self.retention_seconds:
+                del self.jobs[job_id]
+
+
+fill_job_service = FillJobService()
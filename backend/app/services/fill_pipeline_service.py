@@ -0,0 +1,215 @@
+from playwright.async_api import Page
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+from urllib.parse import urlparse
+from app.config import settings
+from app.services.automation_service import AutomationService
+from app.services.browser_pool import browser_pool
+from app.services.html_parser_service import HTMLParserService
+from app.services.multi_step_service import MultiStepService
+from app.services.page_readiness_service import PageReadinessService
+from app.services.resource_blocker import ResourceBlocker
+from app.utils.field_matcher import FieldMatcher
+from app.utils.fill_plan import FillPlan
+from app.utils.logger import logger
+from app.utils.timing import PhaseTimer, fill_timings
+
+
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class FillPipelineService:
+    """Navigate, settle and fill one URL; shared by /api/fill and the fill job workers"""
+
+    def __init__(self, pool=None):
+        self.pool = pool or browser_pool
+
+    @staticmethod
+    async def _report(progress_callback: Optional[ProgressCallback], event: Dict[str, Any]):
+        if progress_callback:
+            try:
+                await progress_callback(event)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+    @staticmethod
+    def resolve_fill_mode(headless: bool, fill_mode: Optional[str] = None) -> str:
+        """Pick "fast" or "interactive"; "auto" uses the one-script fill only when nobody is watching"""
+        mode = fill_mode or settings.fill_mode
+        if mode == "auto":
+            return "fast" if headless else "interactive"
+        return mode if mode in ("fast", "interactive") else "interactive"
+
+    async def plan_fill(
+        self,
+        url: str,
+        form_data: Dict[str, Any],
+        page: Optional[Page] = None,
+        key_info: Optional[Dict[str, Tuple[str, Optional[str]]]] = None
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Match form_data to the page's fields and compile a selector-based fill plan.
+
+        With `page` the analysis reads the DOM the browser already rendered instead
+        of fetching the URL again over HTTP. `key_info` is the profile's stored key
+        descriptions (see FieldMatcher.match_form_data_to_fields).
+        """
+        html_parser = HTMLParserService()
+        try:
+            if page is not None:
+                analysis = await html_parser.analyze_form_from_page(page)
+            else:
+                analysis = await html_parser.analyze_form_from_url(url)
+            form_structure = analysis.get('form_structure', {})
+            fields = form_structure.get('fields', [])
+
+            if fields:
+                matcher = FieldMatcher()
+                # Match and update form_data, but don't fail on validation errors
+                matched_data = matcher.match_form_data_to_fields(form_data, fields, key_info=key_info)
+                logger.info(f"Matched {len(matched_data)} fields out of {len(fields)} available fields")
+                return matched_data, FillPlan.build(matched_data, form_structure)
+        except Exception as e:
+            logger.warning(f"Validation warning: {e} - continuing with available data")
+        finally:
+            await html_parser.close()
+        return form_data, []
+
+    async def run(
+        self,
+        url: str,
+        form_data: Dict[str, Any],
+        resume_path: str = None,
+        multi_step: bool = False,
+        headless: bool = False,
+        keep_open: bool = True,
+        progress_callback: Optional[ProgressCallback] = None,
+        fill_mode: Optional[str] = None,
+        analyze: bool = False,
+        timer: Optional[PhaseTimer] = None,
+        key_info: Optional[Dict[str, Tuple[str, Optional[str]]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fill the form at `url` in a leased browser context.
+
+        With `keep_open` the page is left open for the user to finish and submit,
+        and the context only returns to the pool once the page is closed.
+        `fill_mode` overrides settings.fill_mode for this run. With `analyze` the
+        form_data keys are matched to the form's fields first (see plan_fill), using
+        the profile's stored `key_info` when given; the form_data actually used is
+        returned in result["form_data"]. Phase timings go to `timer` (a fresh one by
+        default) and into the per-domain histograms.
+        """
+        timer = timer or PhaseTimer()
+        mode = self.resolve_fill_mode(headless, fill_mode)
+        analyze_in_page = analyze and settings.analysis_source != "http"
+        fill_plan = None
+        if analyze and not analyze_in_page:
+            await self._report(progress_callback, {"type": "phase", "phase": "analyzing"})
+            with timer.span("analysis"):
+                form_data, fill_plan = await self.plan_fill(url, form_data, key_info=key_info)
+
+        with timer.span("browser_acquire"):
+            context = await self.pool.acquire(headless=headless)
+
+        try:
+            page = await context.new_page()
+            # Headed pages stay in front of the user, so only trackers are dropped there
+            blocker = ResourceBlocker(profile="analysis" if headless else "interactive")
+            await blocker.attach(page, url)
+
+            await self._report(progress_callback, {"type": "phase", "phase": "navigating"})
+            with timer.span("navigation"):
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            # Wait for the DOM to settle and lazy content to load before detecting the form
+            with timer.span("load_wait"):
+                await PageReadinessService().wait_until_ready(page)
+
+            if analyze_in_page:
+                # Analyse the rendered DOM so the URL is only navigated once
+                await self._report(progress_callback, {"type": "phase", "phase": "analyzing"})
+                with timer.span("analysis"):
+                    form_data, fill_plan = await self.plan_fill(url, form_data, page=page, key_info=key_info)
+            await self._report(progress_callback, {"type": "phase", "phase": "filling"})
+
+            # Try to detect if it's a multi-step form
+            multi_step_service = MultiStepService(timer=timer)
+            with timer.span("multi_step_detect"):
+                is_multi_step = await multi_step_service.detect_multi_step_form(page)
+
+            automation_service = AutomationService(timer=timer)
+
+            if is_multi_step and multi_step:
+                # Use multi-step service
+                result = await multi_step_service.fill_multi_step_form(
+                    page, form_data, resume_path=resume_path, progress_callback=progress_callback
+                )
+                result["form_type"] = "multi-step"
+            else:
+                # Use regular form filling - fill as much as possible
+                result = await automation_service.fill_form_with_page(
+                    page, form_data, resume_path=resume_path, progress_callback=progress_callback,
+                    mode=mode, fill_plan=fill_plan, settled=True
+                )
+                result["form_type"] = "single-page"
+                result["fillable"] = result.get("filled_count", 0) > 0
+            result["url"] = url
+            result["form_data"] = form_data
+            result["network"] = blocker.stats()
+            result["timing"] = timer.summary()
+            fill_timings.record(urlparse(url).netloc.lower(), result["timing"])
+        except Exception:
+            # Hand the context back to the pool on error
+            await self.pool.release(context)
+            raise
+
+        if keep_open:
+            # Don't close the page - keep it open for user to complete and submit
+            # The context goes back to the pool once the user closes the page
+            self.pool.release_on_close(context, page)
+            result["browser_open"] = True
+        else:
+            await self.pool.release(context)
+            result["browser_open"] = False
+
+        return result
+
+    @staticmethod
+    async def save_application(
+        db: AsyncSession,
+        user_id: str,
+        url: str,
+        form_data: Dict[str, Any],
+        result: Dict[str, Any]
+    ) -> Optional[str]:
+        """Persist a fill result as an Application; returns its id, or None on failure"""
+        try:
+            from app.services.application_service import ApplicationService
+            from app.models.application import ApplicationCreate
+
+            # Extract job title and company from URL if possible
+            job_title = None
+            company_name = None
+            if "greenhouse.io" in url:
+                parts = url.split("/")
+                if len(parts) > 2:
+                    company_name = parts[-2] if parts[-2] != "jobs" else None
+
+            application_data = ApplicationCreate(
+                job_url=url,
+                job_title=job_title,
+                company_name=company_name,
+                form_data=form_data,
+                filled_fields={
+                    "filled_count": result.get("filled_count", 0),
+                    "total_fields": len(form_data),
+                    "actions": result.get("executed_actions", [])
+                }
+            )
+            application = await ApplicationService.create_application(
+                db, user_id, application_data
+            )
+            return application.id
+        except Exception as e:
+            logger.warning(f"Could not save application: {e}")
+            return None
@@ -0,0 +1,154 @@
+from app.config import settings
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
+import hashlib
+import json
+import re
+import threading
+import zlib
+
+
+# Hidden inputs / meta tags carrying per-request anti-forgery tokens
+TOKEN_TAG = re.compile(r'<(?:input|meta)\b[^>]*>', re.I)
+TOKEN_NAME = re.compile(r'csrf|xsrf|authenticity_token|requestverificationtoken|\b_?token\b', re.I)
+# Only entity-free token values are templated, so the parsed value equals the raw text
+TOKEN_VALUE = re.compile(r'''(\s(?:value|content)\s*=\s*)(["'])([A-Za-z0-9+/=_\-.:]+)\2''', re.I)
+
+# Parts of a page that change per request but never reach the form structure
+NONCE_ATTR = re.compile(r'''\snonce\s*=\s*(["'])[^"']*\1''', re.I)
+RAW_TEXT_BODY = re.compile(r'(<(script|style)\b[^>]*>).*?(</\2\s*>)', re.I | re.S)
+COMMENT_BODY = re.compile(r'<!--.*?-->', re.S)
+
+# Private-use characters delimit token placeholders, e.g. "\ue0003\ue001" for the fourth token
+PLACEHOLDER_OPEN, PLACEHOLDER_CLOSE = '\ue000', '\ue001'
+PLACEHOLDER = re.compile(PLACEHOLDER_OPEN + r'(\d+)' + PLACEHOLDER_CLOSE)
+
+
+class FormStructureCacheService:
+    """
+    Parsed form structures keyed by a hash of the normalised page.
+
+    CSRF token values are swapped for numbered placeholders before parsing,
+    and script/style bodies, comment text and nonces are dropped from the
+    key, so two renders of the same page version share one entry. Entries
+    are zlib-compressed JSON in a byte-bounded LRU; each hit decodes a fresh
+    copy and puts the current page's token values back in.
+    """
+
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = max_bytes or settings.form_structure_cache_max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.uncacheable = 0
+
+    @staticmethod
+    def template_tokens(html: str) -> Tuple[str, List[str]]:
+        """Replace anti-forgery token values with placeholders; returns (html, values)"""
+        values: List[str] = []
+
+        def template_value(match):
+            values.append(match.group(3))
+            placeholder = f"{PLACEHOLDER_OPEN}{len(values) - 1}{PLACEHOLDER_CLOSE}"
+            return f"{match.group(1)}{match.group(2)}{placeholder}{match.group(2)}"
+
+        def template_tag(match):
+            tag = match.group(0)
+            if not TOKEN_NAME.search(tag):
+                return tag
+            return TOKEN_VALUE.sub(template_value, tag)
+
+        return TOKEN_TAG.sub(template_tag, html), values
+
+    @staticmethod
+    def key(templated_html: str) -> str:
+        normalized = RAW_TEXT_BODY.sub(r'\1\3', templated_html)
+        normalized = COMMENT_BODY.sub('<!---->', normalized)
+        normalized = NONCE_ATTR.sub('', normalized)
+        return hashlib.blake2b(normalized.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+    def get_or_parse(self, html: str, parse: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return parse(html), reusing the structure of any earlier page with the same normalised content"""
+        if PLACEHOLDER_OPEN in html:
+            # The page already uses our placeholder characters; don't risk a wrong substitution
+            self.uncacheable += 1
+            return parse(html)
+
+        templated, values, key, payload = self._lookup(html)
+        if payload is None:
+            payload = self._encode(key, parse(templated))
+        return self._decode(payload, values)
+
+    async def get_or_parse_async(
+        self, html: str, parse: Callable[[str], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """get_or_parse for a coroutine parser, e.g. one that runs in the parse pool"""
+        if PLACEHOLDER_OPEN in html:
+            self.uncacheable += 1
+            return await parse(html)
+
+        templated, values, key, payload = self._lookup(html)
+        if payload is None:
+            payload = self._encode(key, await parse(templated))
+        return self._decode(payload, values)
+
+    def _lookup(self, html: str) -> Tuple[str, List[str], str, Optional[bytes]]:
+        templated, values = self.template_tokens(html)
+        key = self.key(templated)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        return templated, values, key, payload
+
+    def _encode(self, key: str, structure: Dict[str, Any]) -> bytes:
+        payload = zlib.compress(
+            json.dumps(structure, ensure_ascii=False, separators=(',', ':')).encode('utf-8', 'surrogatepass')
+        )
+        self._store(key, payload)
+        self.misses += 1
+        return payload
+
+    @staticmethod
+    def _decode(payload: bytes, values: List[str]) -> Dict[str, Any]:
+        # Every caller gets a fresh copy with its own page's token values
+        text = zlib.decompress(payload).decode('utf-8', 'surrogatepass')
+        if values:
+            text = PLACEHOLDER.sub(lambda match: values[int(match.group(1))], text)
+        return json.loads(text)
+
+    def _store(self, key: str, payload: bytes):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = payload
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "uncacheable": self.uncacheable,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes
+        }
+
+
+form_structure_cache = FormStructureCacheService()
@@ -0,0 +1,226 @@
+from app.config import settings
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urldefrag
+import asyncio
+import sqlite3
+import threading
+import time
+import zlib
+import httpx
+
+
+class CachedPage:
+    """One cached response: zlib-compressed body plus its revalidation headers"""
+
+    __slots__ = ("url", "body", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str], fetched_at: float):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    @property
+    def text(self) -> str:
+        return zlib.decompress(self.body).decode("utf-8")
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HtmlCacheService:
+    """
+    Two-tier cache of fetched HTML keyed by URL.
+
+    A byte-bounded in-memory LRU sits in front of a SQLite file. Entries younger
+    than `ttl_seconds` are served without touching the network; older ones are
+    kept for `max_stale_seconds` so they can be revalidated with
+    If-None-Match / If-Modified-Since instead of downloaded again.
+    fetch() runs the SQLite reads and writes and the zlib work in a thread, so
+    multi-megabyte pages never block the event loop; get() and store() are the
+    synchronous building blocks.
+    """
+
+    def __init__(
+        self,
+        db_path: str = None,
+        ttl_seconds: int = None,
+        max_stale_seconds: int = None,
+        memory_max_bytes: int = None,
+        disk_max_bytes: int = None
+    ):
+        self.db_path = db_path or settings.html_cache_path
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.html_cache_ttl_seconds
+        self.max_stale_seconds = (
+            max_stale_seconds if max_stale_seconds is not None else settings.html_cache_max_stale_seconds
+        )
+        self.memory_max_bytes = memory_max_bytes or settings.html_cache_memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes or settings.html_cache_disk_max_bytes
+        self._memory: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._memory_bytes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        return urldefrag(url)[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS html_cache ("
+                "url TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT, "
+                "fetched_at REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_html_cache_fetched_at ON html_cache (fetched_at)")
+            self._conn.commit()
+        return self._conn
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return time.time() - page.fetched_at < self.ttl_seconds
+
+    async def fetch(self, client: httpx.AsyncClient, url: str, headers: Dict[str, str] = None) -> str:
+        """GET `url` through the cache; raises httpx errors like a plain client.get would"""
+        page, tier = await asyncio.to_thread(self.get, url)
+        if page is not None and self.is_fresh(page):
+            if tier == "memory":
+                self.memory_hits += 1
+            else:
+                self.disk_hits += 1
+            return await asyncio.to_thread(lambda: page.text)
+
+        request_headers = dict(headers or {})
+        if page is not None:
+            request_headers.update(page.validators())
+        response = await client.get(url, headers=request_headers)
+        if response.status_code == 304 and page is not None:
+            return await asyncio.to_thread(self._revalidated_text, page)
+
+        response.raise_for_status()
+        self.misses += 1
+        html = response.text
+        if "no-store" not in response.headers.get("cache-control", "").lower():
+            await asyncio.to_thread(
+                self.store, url, html, response.headers.get("etag"), response.headers.get("last-modified")
+            )
+        return html
+
+    def get(self, url: str) -> Tuple[Optional[CachedPage], Optional[str]]:
+        """Return (page, tier) for a fresh or revalidatable entry, memory tier first"""
+        key = self.key(url)
+        now = time.time()
+        with self._lock:
+            page = self._memory.get(key)
+            if page is not None:
+                if now - page.fetched_at < self.max_stale_seconds:
+                    self._memory.move_to_end(key)
+                    return page, "memory"
+                self._drop_memory(key)
+
+            row = self._connection().execute(
+                "SELECT body, etag, last_modified, fetched_at FROM html_cache WHERE url = ? AND fetched_at > ?",
+                (key, now - self.max_stale_seconds)
+            ).fetchone()
+            if row is None:
+                return None, None
+            page = CachedPage(key, row[0], row[1], row[2], row[3])
+            self._remember(page)
+            return page, "disk"
+
+    def store(self, url: str, html: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> CachedPage:
+        key = self.key(url)
+        page = CachedPage(key, zlib.compress(html.encode("utf-8"), 6), etag, last_modified, time.time())
+        with self._lock:
+            self._remember(page)
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO html_cache (url, body, etag, last_modified, fetched_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, page.body, etag, last_modified, page.fetched_at, len(page.body))
+            )
+            self._evict_disk(conn)
+            conn.commit()
+            self.stores += 1
+        return page
+
+    def mark_revalidated(self, page: CachedPage):
+        """The origin answered 304: the cached body is fresh again"""
+        page.fetched_at = time.time()
+        with self._lock:
+            self._connection().execute(
+                "UPDATE html_cache SET fetched_at = ? WHERE url = ?", (page.fetched_at, page.url)
+            )
+            self._conn.commit()
+            self.revalidated += 1
+
+    def _revalidated_text(self, page: CachedPage) -> str:
+        self.mark_revalidated(page)
+        return page.text
+
+    def _remember(self, page: CachedPage):
+        self._drop_memory(page.url)
+        self._memory[page.url] = page
+        self._memory_bytes += len(page.body)
+        while self._memory_bytes > self.memory_max_bytes and len(self._memory) > 1:
+            oldest = next(iter(self._memory))
+            self._drop_memory(oldest)
+            self.evictions += 1
+
+    def _drop_memory(self, key: str):
+        page = self._memory.pop(key, None)
+        if page is not None:
+            self._memory_bytes -= len(page.body)
+
+    def _evict_disk(self, conn: sqlite3.Connection):
+        expired = conn.execute(
+            "DELETE FROM html_cache WHERE fetched_at <= ?", (time.time() - self.max_stale_seconds,)
+        ).rowcount
+        self.evictions += max(expired, 0)
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM html_cache").fetchone()[0]
+        if total <= self.disk_max_bytes:
+            return
+        # Drop the oldest fetches until the file is back under budget
+        for url, size in conn.execute("SELECT url, size FROM html_cache ORDER BY fetched_at ASC").fetchall():
+            if total <= self.disk_max_bytes:
+                break
+            conn.execute("DELETE FROM html_cache WHERE url = ?", (url,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "revalidated": self.revalidated,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+html_cache = HtmlCacheService()
@@ -1,19 +1,56 @@
 from bs4 import BeautifulSoup
+from lxml import etree
 import httpx
-from typing import Dict, List, Any, Optional
+from app.config import settings
+from app.services.form_structure_cache_service import FormStructureCacheService, form_structure_cache
+from app.services.html_cache_service import HtmlCacheService, html_cache
+from app.services.http_client_service import http_client
+from app.services.parse_pool import parse_pool
+from app.utils.form_stream import StreamingLabelIndex
+from app.utils.frame_discovery import FrameDiscovery
+from app.utils.label_index import LabelIndex
+from app.utils.single_flight import SingleFlight
+from typing import Dict, List, Any, Optional, Tuple
+import asyncio
 import re
 
 
+analysis_flight = SingleFlight("analyze_form")
+
+
+def parse_form_structure(html: str, url: str = "", extractor: str = None) -> Dict[str, Any]:
+    """Uncached parse; module-level so the parse pool can ship it to a worker process"""
+    return HTMLParserService(extractor=extractor)._parse_form_fields(html, url)
+
+
 class HTMLParserService:
     
-    def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+    def __init__(
+        self,
+        client: httpx.AsyncClient = None,
+        cache: HtmlCacheService = None,
+        extractor: str = None,
+        structure_cache: FormStructureCacheService = None
+    ):
+        self._client = client
+        self.cache = cache or (html_cache if settings.html_cache_enabled else None)
+        self.extractor = extractor or settings.html_extractor
+        self.structure_cache = structure_cache or (
+            form_structure_cache if settings.form_structure_cache_enabled else None
+        )
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Fetches go through the app-wide pooled client unless one is injected
+        return self._client or http_client.client
     
     async def fetch_html(self, url: str) -> str:
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
+            if self.cache is not None:
+                return await self.cache.fetch(self.client, url, headers)
             response = await self.client.get(url, headers=headers)
             response.raise_for_status()
             return response.text
@@ -21,20 +58,31 @@ class HTMLParserService:
             raise Exception(f"Failed to fetch HTML from {url}: {str(e)}")
     
     def parse_form_fields(self, html: str, url: str = "") -> Dict[str, Any]:
-        soup = BeautifulSoup(html, 'lxml')
+        # Every route shares one cache, so each distinct page version is parsed once
+        if self.structure_cache is not None:
+            return self.structure_cache.get_or_parse(html, lambda page: self._parse_form_fields(page, url))
+        return self._parse_form_fields(html, url)
+    
+    async def parse_form_fields_async(self, html: str, url: str = "") -> Dict[str, Any]:
+        """parse_form_fields for async handlers: the cache is checked here, parsing runs in the parse pool"""
+        def parse(page: str):
+            return parse_pool.run(parse_form_structure, page, url, self.extractor)
         
-        forms = soup.find_all('form')
-        if not forms:
-            forms = [soup]
+        if self.structure_cache is not None:
+            return await self.structure_cache.get_or_parse_async(html, parse)
+        return await parse(html)
+    
+    def _parse_form_fields(self, html: str, url: str = "") -> Dict[str, Any]:
+        # One walk over the document indexes forms, controls and label candidates,
+        # so label association no longer rescans the page for every input
+        index = self._index_document(html)
         
         all_fields = []
         all_actions = []
         
-        for form in forms:
-            inputs = form.find_all(['input', 'select', 'textarea'])
-            
+        for inputs in index.control_groups():
             for inp in inputs:
-                field_info = self._extract_field_info(inp, url)
+                field_info = self._extract_field_info(inp, url, index)
                 if field_info:
                     all_fields.append(field_info['field'])
                     all_actions.append(field_info['action'])
@@ -44,7 +92,23 @@ class HTMLParserService:
             "actions": all_actions
         }
     
-    def _extract_field_info(self, element, base_url: str = "") -> Optional[Dict[str, Any]]:
+    def _index_document(self, html: str):
+        if self._use_stream(html):
+            try:
+                # Large pages are parsed as an lxml event stream; no soup tree is built
+                return StreamingLabelIndex.from_html(html, max_text_chars=settings.html_stream_max_text_chars)
+            except (etree.ParserError, UnicodeDecodeError, LookupError):
+                pass
+        return LabelIndex(BeautifulSoup(html, 'lxml'))
+    
+    def _use_stream(self, html: str) -> bool:
+        if self.extractor == "stream":
+            return True
+        if self.extractor == "auto":
+            return len(html) >= settings.html_stream_min_chars
+        return False
+    
+    def _extract_field_info(self, element, base_url: str = "", index: LabelIndex = None) -> Optional[Dict[str, Any]]:
         tag_name = element.name.lower()
         
         field_type = element.get('type', 'text').lower()
@@ -53,7 +117,7 @@ class HTMLParserService:
         placeholder = element.get('placeholder', '')
         required = element.has_attr('required') or element.get('aria-required') == 'true'
         
-        label_text = self._find_label_text(element, field_id, name)
+        label_text = self._find_label_text(element, field_id, name, index)
         
         if not label_text:
             label_text = placeholder or name or field_id
@@ -66,7 +130,10 @@ class HTMLParserService:
             "type": self._determine_field_type(tag_name, field_type, name, label_text),
             "required": required,
             "value": element.get('value', ''),
-            "options": []
+            "options": [],
+            # Raw hints for the field taxonomy: what the page itself says the control holds
+            "name": name,
+            "autocomplete": element.get('autocomplete', '').strip().lower()
         }
         
         if tag_name == 'select':
@@ -85,21 +152,27 @@ class HTMLParserService:
             "action": action
         }
     
-    def _find_label_text(self, element, field_id: str, name: str) -> str:
+    def _find_label_text(self, element, field_id: str, name: str, index: LabelIndex = None) -> str:
         label_text = ""
         
         if field_id:
-            label = element.find_previous('label', {'for': field_id})
+            if index is not None:
+                label = index.label_for(element, field_id)
+            else:
+                label = element.find_previous('label', {'for': field_id})
             if label:
                 label_text = label.get_text(strip=True)
         
         if not label_text:
-            parent_label = element.find_parent('label')
+            parent_label = index.wrapping_label(element) if index is not None else element.find_parent('label')
             if parent_label:
                 label_text = parent_label.get_text(strip=True)
         
         if not label_text:
-            prev_sibling = element.find_previous_sibling(['label', 'span', 'div'])
+            if index is not None:
+                prev_sibling = index.previous_sibling(element)
+            else:
+                prev_sibling = element.find_previous_sibling(['label', 'span', 'div'])
             if prev_sibling:
                 label_text = prev_sibling.get_text(strip=True)
         
@@ -135,15 +208,33 @@ class HTMLParserService:
     
     def _generate_selector(self, element, field_id: str, name: str) -> str:
         if field_id:
-            return f"#{field_id}"
+            # Ids like "job_application[first_name]" or "2fa" are not valid after '#'
+            if re.fullmatch(r'-?[A-Za-z_][\w-]*', field_id):
+                return f"#{field_id}"
+            return f"[id='{self._escape_attr(field_id)}']"
         if name:
-            return f"[name='{name}']"
+            selector = f"[name='{self._escape_attr(name)}']"
+            # Radio/checkbox groups share a name, so pin the option by its value
+            value = element.get('value')
+            if element.get('type', '').lower() in ['radio', 'checkbox'] and value:
+                selector += f"[value='{self._escape_attr(value)}']"
+            return selector
         return ""
     
+    @staticmethod
+    def _escape_attr(value: str) -> str:
+        return value.replace('\\', '\\\\').replace("'", "\\'")
+    
     async def analyze_form_from_url(self, url: str) -> Dict[str, Any]:
+        # Concurrent analyses of the same posting wait on one fetch and parse
+        return await analysis_flight.do(HtmlCacheService.key(url), lambda: self._analyze_form_from_url(url))
+    
+    async def _analyze_form_from_url(self, url: str) -> Dict[str, Any]:
         try:
             html = await self.fetch_html(url)
-            form_structure = self.parse_form_fields(html, url)
+            form_structure = await self.parse_form_fields_async(html, url)
+            if settings.iframe_max_depth > 0:
+                await self._merge_frames(form_structure, html, url)
             
             return {
                 "success": True,
@@ -154,6 +245,66 @@ class HTMLParserService:
         except Exception as e:
             raise Exception(f"HTML parsing error: {str(e)}")
     
+    async def _merge_frames(self, form_structure: Dict[str, Any], html: str, url: str):
+        """Fetch embedded application iframes level by level and append their fields, tagged with their frame"""
+        frames = []
+        seen = {HtmlCacheService.key(url)}
+        level = [(url, html)]
+        for depth in range(1, settings.iframe_max_depth + 1):
+            sources = []
+            for page_url, page_html in level:
+                for frame_url in FrameDiscovery.frame_urls(page_html, page_url, settings.iframe_extra_hosts):
+                    key = HtmlCacheService.key(frame_url)
+                    if key not in seen and len(seen) <= settings.iframe_max_frames:
+                        seen.add(key)
+                        sources.append(frame_url)
+            if not sources:
+                break
+            
+            results = await asyncio.gather(*(self._analyze_frame(frame_url) for frame_url in sources))
+            level = []
+            for frame_url, (frame_html, frame_structure, error) in zip(sources, results):
+                frame = {"url": frame_url, "depth": depth, "fields": 0}
+                if error:
+                    frame["error"] = error
+                    frames.append(frame)
+                    continue
+                for field, action in zip(frame_structure["fields"], frame_structure["actions"]):
+                    field["frame"] = frame_url
+                    action["frame"] = frame_url
+                    form_structure["fields"].append(field)
+                    form_structure["actions"].append(action)
+                frame["fields"] = len(frame_structure["fields"])
+                frames.append(frame)
+                level.append((frame_url, frame_html))
+        
+        if frames:
+            form_structure["frames"] = frames
+    
+    async def _analyze_frame(self, frame_url: str) -> Tuple[str, Dict[str, Any], Optional[str]]:
+        try:
+            frame_html = await self.fetch_html(frame_url)
+            return frame_html, await self.parse_form_fields_async(frame_html, frame_url), None
+        except Exception as e:
+            # One unreachable frame shouldn't fail the whole analysis
+            return "", {}, str(e)
+    
+    async def analyze_form_from_page(self, page) -> Dict[str, Any]:
+        """Analyze the DOM a browser page has already rendered, so client-side forms are included"""
+        try:
+            html = await page.content()
+            form_structure = await self.parse_form_fields_async(html, page.url)
+            
+            return {
+                "success": True,
+                "method": "rendered_dom",
+                "url": page.url,
+                "form_structure": form_structure
+            }
+        except Exception as e:
+            raise Exception(f"Rendered DOM parsing error: {str(e)}")
+    
     async def close(self):
-        await self.client.aclose()
+        # The client is shared and outlives this parser; it is closed on app shutdown
+        pass
 
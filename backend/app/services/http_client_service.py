@@ -0,0 +1,241 @@
+from app.config import settings
+from app.utils.logger import logger
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import socket
+import time
+import httpcore
+import httpx
+# Private, but it is how httpx itself reads proxy variables; httpx is pinned for it
+from httpx._utils import get_environment_proxies
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class DNSCacheBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that caches host lookups and counts the TCP connections it opens.
+
+    TLS still verifies against the original hostname because httpcore passes the
+    request host as SNI, not the address we connected to.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend or httpcore.AnyIOBackend()
+        self._cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self.connections_opened = 0
+        self.dns_hits = 0
+        self.dns_misses = 0
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = []
+        for info in infos:
+            address = info[4][0]
+            if address not in addresses:
+                addresses.append(address)
+        return addresses
+
+    async def lookup(self, host: str, port: int) -> List[str]:
+        key = (host, port)
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self.dns_hits += 1
+            return cached[1]
+        self.dns_misses += 1
+        addresses = await self._resolve(host, port)
+        if addresses:
+            self._cache[key] = (time.monotonic() + self.ttl_seconds, addresses)
+        return addresses or [host]
+
+    async def connect_tcp(self, host: str, port: int, timeout=None, local_address=None, socket_options=None):
+        addresses = await self.lookup(host, port)
+        last_error = None
+        for address in addresses:
+            try:
+                stream = await self.backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+                self.connections_opened += 1
+                return stream
+            except (httpcore.ConnectError, httpcore.ConnectTimeout, OSError) as e:
+                last_error = e
+        # Every cached address failed - the host may have moved, so look it up again next time
+        self._cache.pop((host, port), None)
+        raise last_error
+
+    async def connect_unix_socket(self, path: str, timeout=None, socket_options=None):
+        stream = await self.backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+        self.connections_opened += 1
+        return stream
+
+    async def sleep(self, seconds: float):
+        await self.backend.sleep(seconds)
+
+
+class PooledTransport(httpx.AsyncHTTPTransport):
+    """httpx transport whose connection pool, direct or through a proxy, dials through a DNSCacheBackend"""
+
+    def __init__(
+        self,
+        network_backend: httpcore.AsyncNetworkBackend,
+        limits: httpx.Limits,
+        http2: bool,
+        proxy: Optional[httpx.Proxy] = None
+    ):
+        # AsyncHTTPTransport.__init__ isn't called: it would build a pool without our
+        # network backend only for it to be thrown away. Its request handling only
+        # reads self._pool (httpx is pinned in requirements.txt for this)
+        options = dict(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=network_backend
+        )
+        if proxy is None:
+            self._pool = httpcore.AsyncConnectionPool(**options)
+            return
+        proxy_url = httpcore.URL(
+            scheme=proxy.url.raw_scheme, host=proxy.url.raw_host, port=proxy.url.port, target=proxy.url.raw_path
+        )
+        if proxy.url.scheme in ("http", "https"):
+            self._pool = httpcore.AsyncHTTPProxy(
+                proxy_url=proxy_url, proxy_auth=proxy.raw_auth, proxy_headers=proxy.headers.raw, **options
+            )
+        elif proxy.url.scheme == "socks5":
+            self._pool = httpcore.AsyncSOCKSProxy(proxy_url=proxy_url, proxy_auth=proxy.raw_auth, **options)
+        else:
+            raise ValueError(f"Unsupported proxy scheme {proxy.url.scheme!r}")
+
+    @property
+    def open_connections(self) -> int:
+        return len(self._pool.connections)
+
+
+class HttpClientService:
+    """
+    Application-lifetime httpx client for outbound page fetches.
+
+    One pooled client keeps connections to career-site hosts alive between
+    requests instead of paying a TCP+TLS handshake per HTMLParserService.
+    HTTP/2 is used when the optional `h2` package is installed. With
+    `trust_env` the HTTP_PROXY / HTTPS_PROXY / ALL_PROXY / NO_PROXY variables
+    are honoured the way a plain httpx client would, through pooled proxy
+    transports mounted per URL pattern.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = None,
+        max_keepalive_connections: int = None,
+        keepalive_expiry: float = None,
+        http2: bool = None,
+        dns_cache_ttl: float = None,
+        timeout: float = None,
+        trust_env: bool = True
+    ):
+        self.max_connections = max_connections or settings.http_max_connections
+        self.max_keepalive_connections = max_keepalive_connections or settings.http_max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry or settings.http_keepalive_expiry
+        wants_http2 = settings.http2_enabled if http2 is None else http2
+        self.http2 = wants_http2 and _http2_available()
+        if wants_http2 and not self.http2:
+            logger.info("h2 is not installed; outbound fetches will use HTTP/1.1")
+        self.timeout = timeout or settings.http_timeout
+        self.trust_env = trust_env
+        self.backend = DNSCacheBackend(ttl_seconds=dns_cache_ttl or settings.http_dns_cache_ttl)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._transport: Optional[PooledTransport] = None
+        self._proxy_transports: List[PooledTransport] = []
+        self.requests = 0
+        # Requests that got a response; failed ones must not count as reused connections
+        self.responses = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            )
+            self._transport = PooledTransport(self.backend, limits, self.http2)
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                mounts=self._proxy_mounts(limits),
+                trust_env=self.trust_env,
+                timeout=self.timeout,
+                follow_redirects=True,
+                event_hooks={"request": [self._on_request], "response": [self._on_response]}
+            )
+        return self._client
+
+    def _proxy_mounts(self, limits: httpx.Limits) -> Dict[str, Optional[PooledTransport]]:
+        """URL pattern -> proxy transport (None for NO_PROXY hosts) from the environment"""
+        # httpx drops environment proxies when a transport is passed in, so mount them here
+        self._proxy_transports = []
+        if not self.trust_env:
+            return {}
+        mounts = {}
+        for pattern, proxy_url in get_environment_proxies().items():
+            if proxy_url is None:
+                mounts[pattern] = None
+                continue
+            transport = PooledTransport(self.backend, limits, self.http2, proxy=httpx.Proxy(proxy_url))
+            self._proxy_transports.append(transport)
+            mounts[pattern] = transport
+        return mounts
+
+    async def _on_request(self, request: httpx.Request):
+        self.requests += 1
+
+    async def _on_response(self, response: httpx.Response):
+        self.responses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        opened = self.backend.connections_opened
+        reused = max(self.responses - opened, 0)
+        return {
+            "http2": self.http2,
+            "requests": self.requests,
+            "responses": self.responses,
+            "connections_opened": opened,
+            "connections_reused": reused,
+            "reuse_rate": round(reused / self.responses, 3) if self.responses else 0.0,
+            "open_connections": sum(
+                transport.open_connections for transport in filter(None, [self._transport, *self._proxy_transports])
+            ),
+            "proxies": len(self._proxy_transports),
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "dns_cache": {
+                "hits": self.backend.dns_hits,
+                "misses": self.backend.dns_misses,
+                "entries": len(self.backend._cache)
+            }
+        }
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._transport = None
+            self._proxy_transports = []
+
+
+http_client = HttpClientService()
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """FastAPI dependency returning the shared outbound client"""
+    return http_client.client
@@ -1,11 +1,13 @@
 from playwright.async_api import Page
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+from app.services.automation_service import AutomationService
+from app.utils.timing import PhaseTimer
 import asyncio
 
 
 class MultiStepService:
     
-    def __init__(self):
+    def __init__(self, timer: PhaseTimer = None):
         self.step_indicators = [
             "step", "page", "stage", "part", "section",
             "progress", "wizard", "form-step"
@@ -17,6 +19,8 @@ class MultiStepService:
         self.back_button_texts = [
             "back", "previous", "return", "<", "go back"
         ]
+        self.timer = timer or PhaseTimer()
+        self.automation = AutomationService(timer=self.timer)
     
     async def detect_multi_step_form(self, page: Page) -> bool:
         try:
@@ -146,8 +150,10 @@ class MultiStepService:
         page: Page,
         form_data: Dict[str, Any],
         max_steps: int = 10,
-        resume_path: str = None
+        resume_path: str = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
+        """Fill each step's fields and move on, reporting per-field outcomes to progress_callback"""
         executed_actions = []
         errors = []
         current_step_num = 1
@@ -163,11 +169,13 @@ class MultiStepService:
             
             # Try to upload resume if available (usually in first step)
             if resume_path:
-                from app.services.automation_service import AutomationService
-                automation = AutomationService()
-                resume_uploaded = await automation._upload_resume_if_present(page, resume_path)
+                with self.timer.span("resume_upload"):
+                    resume_uploaded = await self.automation._upload_resume_if_present(page, resume_path)
                 if resume_uploaded:
                     executed_actions.append("Step 1: Uploaded resume file")
+                    await self.automation._report_progress(progress_callback, {
+                        "type": "field", "label": "resume", "status": "filled", "detail": "Uploaded resume file", "step": 1
+                    })
             
             if isinstance(list(form_data.values())[0] if form_data else None, dict):
                 step_data = form_data
@@ -179,40 +187,59 @@ class MultiStepService:
                     errors.append(f"Maximum steps ({max_steps}) reached")
                     break
                 
+                with self.timer.span("field_resolve"):
+                    resolved, cache_key = await self.automation._resolve_labels(page, list(step_fields.keys()))
+                
                 for label, value in step_fields.items():
+                    errors_before = len(errors)
+                    actions_before = len(executed_actions)
                     try:
-                        from app.services.automation_service import AutomationService
-                        automation = AutomationService()
-                        field = await automation._find_field_by_label(page, label)
+                        with self.timer.span("field_lookup"):
+                            field = await self.automation._locate_resolved_field(page, label, resolved, cache_key)
+                            if not field and label not in resolved:
+                                field = await self.automation._find_field_by_label(page, label)
                         
                         if not field:
                             errors.append(f"Field not found in step {current_step_num}: {label}")
                             continue
                         
-                        await field.scroll_into_view_if_needed()
-                        await page.wait_for_timeout(200)
-                        
-                        tag_name = await field.evaluate("el => el.tagName.toLowerCase()")
-                        field_type = await field.get_attribute("type") or ""
+                        with self.timer.span("scroll"):
+                            await field.scroll_into_view_if_needed()
+                            await page.wait_for_timeout(200)
                         
-                        if tag_name == "select":
-                            await field.select_option(value)
-                            executed_actions.append(f"Step {current_step_num}: Selected '{value}' in {label}")
-                        elif field_type == "checkbox":
-                            is_checked = await field.is_checked()
-                            if value and not is_checked:
-                                await field.check()
-                            elif not value and is_checked:
-                                await field.uncheck()
-                            executed_actions.append(f"Step {current_step_num}: Set checkbox {label}")
-                        else:
-                            await field.fill(str(value))
-                            executed_actions.append(f"Step {current_step_num}: Filled {label}")
+                        with self.timer.span("field_action"):
+                            tag_name = await field.evaluate("el => el.tagName.toLowerCase()")
+                            field_type = await field.get_attribute("type") or ""
+                            
+                            if tag_name == "select":
+                                await field.select_option(value)
+                                executed_actions.append(f"Step {current_step_num}: Selected '{value}' in {label}")
+                            elif field_type == "checkbox":
+                                is_checked = await field.is_checked()
+                                if value and not is_checked:
+                                    await field.check()
+                                elif not value and is_checked:
+                                    await field.uncheck()
+                                executed_actions.append(f"Step {current_step_num}: Set checkbox {label}")
+                            else:
+                                await field.fill(str(value))
+                                executed_actions.append(f"Step {current_step_num}: Filled {label}")
                     except Exception as e:
                         errors.append(f"Error filling {label} in step {current_step_num}: {str(e)}")
+                    finally:
+                        if len(errors) > errors_before:
+                            status, detail = "error", errors[-1]
+                        elif len(executed_actions) > actions_before:
+                            status, detail = "filled", executed_actions[-1]
+                        else:
+                            status, detail = "skipped", ""
+                        await self.automation._report_progress(progress_callback, {
+                            "type": "field", "label": label, "status": status, "detail": detail, "step": current_step_num
+                        })
                 
                 if step_key != list(step_data.keys())[-1]:
-                    nav_result = await self.navigate_to_next_step(page)
+                    with self.timer.span("step_navigation"):
+                        nav_result = await self.navigate_to_next_step(page)
                     if not nav_result.get("success"):
                         errors.append(f"Failed to navigate from step {current_step_num}")
                         break
@@ -222,7 +249,8 @@ class MultiStepService:
                 "success": len(errors) == 0,
                 "steps_completed": current_step_num,
                 "executed_actions": executed_actions,
-                "errors": errors
+                "errors": errors,
+                "timing": self.timer.summary()
             }
         except Exception as e:
             return {
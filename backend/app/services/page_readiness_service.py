@@ -0,0 +1,184 @@
+from playwright.async_api import Page
+from app.config import settings
+from typing import Dict, Any
+import time
+
+
+DEFAULT_SENTINEL_SELECTOR = (
+    'img[loading="lazy"], [data-src]:not([src]), [aria-busy="true"], [class*="skeleton"]'
+)
+
+
+# Runs inside the page: a MutationObserver tracks the last DOM change and an
+# IntersectionObserver tracks which lazy-load sentinels have been on screen.
+# Resolves once the DOM has been quiet for `quietMs` and no sentinel is
+# pending, or when `budgetMs` runs out.
+READINESS_SCRIPT = """
+async ({ quietMs, budgetMs, sentinelSelector }) => {
+    const now = () => performance.now();
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+    const started = now();
+    const deadline = started + budgetMs;
+
+    let lastMutation = now();
+    let mutationCount = 0;
+    const mutations = new MutationObserver((records) => {
+        lastMutation = now();
+        mutationCount += records.length;
+    });
+    mutations.observe(document.documentElement, {
+        childList: true,
+        subtree: true,
+        characterData: true,
+        attributes: true,
+        attributeFilter: ['src', 'hidden', 'aria-busy']
+    });
+
+    const seen = new WeakSet();
+    const visibility = new IntersectionObserver((entries) => {
+        for (const entry of entries) {
+            if (entry.isIntersecting) {
+                seen.add(entry.target);
+            }
+        }
+    });
+
+    const isRendered = (el) => el.getClientRects().length > 0;
+    const isLoaded = (el) => el.tagName === 'IMG' && el.complete;
+    const sentinels = () => Array.from(document.querySelectorAll(sentinelSelector))
+        .filter((el) => isRendered(el) && !isLoaded(el));
+
+    const waitQuiet = async () => {
+        while (now() < deadline && now() - lastMutation < quietMs) {
+            await sleep(Math.min(50, quietMs));
+        }
+    };
+
+    await waitQuiet();
+
+    const scroller = document.scrollingElement || document.documentElement;
+    const isTall = () => scroller.scrollHeight > window.innerHeight + 1;
+    let scrollSteps = 0;
+
+    if (isTall()) {
+        // Visit only the sentinels that have not been on screen yet
+        const visited = new Set();
+        const nextUnseen = async () => {
+            const pending = sentinels();
+            pending.forEach((el) => visibility.observe(el));
+            await sleep(50);
+            return pending.find((el) => !seen.has(el) && !visited.has(el));
+        };
+        let target = await nextUnseen();
+        while (target && now() < deadline) {
+            visited.add(target);
+            target.scrollIntoView({ block: 'center', behavior: 'instant' });
+            scrollSteps += 1;
+            await waitQuiet();
+            target = await nextUnseen();
+        }
+
+        // One jump to the bottom still triggers infinite-scroll style loaders
+        if (now() < deadline) {
+            window.scrollTo({ top: scroller.scrollHeight, behavior: 'instant' });
+            scrollSteps += 1;
+            await sleep(50);
+            await waitQuiet();
+        }
+        window.scrollTo({ top: 0, behavior: 'instant' });
+    }
+
+    while (sentinels().length && now() < deadline) {
+        await sleep(50);
+    }
+    await waitQuiet();
+
+    mutations.disconnect();
+    visibility.disconnect();
+
+    return {
+        settled: now() < deadline,
+        elapsed_ms: Math.round(now() - started),
+        scroll_steps: scrollSteps,
+        mutations: mutationCount,
+        pending_sentinels: sentinels().length
+    };
+}
+"""
+
+
+class PageReadinessService:
+    """Decides when a loaded page has settled enough to be analysed or filled"""
+
+    def __init__(self, mode: str = None, quiet_ms: int = None, budget_ms: int = None):
+        self.mode = mode or settings.page_readiness_mode
+        self.quiet_ms = quiet_ms or settings.page_quiet_window_ms
+        self.budget_ms = budget_ms or settings.page_ready_budget_ms
+        self.sentinel_selector = DEFAULT_SENTINEL_SELECTOR
+
+    async def wait_until_ready(self, page: Page) -> Dict[str, Any]:
+        if self.mode == "legacy":
+            await self._legacy_scroll_through_page(page)
+            return {"mode": "legacy", "settled": True}
+
+        # An SPA's DOM can sit quiet while the XHR that renders its form is still in
+        # flight, so wait for the network first; pages that never go idle (polling,
+        # websockets) just use up their share of the budget
+        started = time.perf_counter()
+        try:
+            await page.wait_for_load_state("networkidle", timeout=self.budget_ms)
+            network_idle = True
+        except Exception:
+            network_idle = False
+        remaining_ms = self.budget_ms - (time.perf_counter() - started) * 1000
+
+        try:
+            result = await page.evaluate(READINESS_SCRIPT, {
+                "quietMs": self.quiet_ms,
+                "budgetMs": max(self.quiet_ms, int(remaining_ms)),
+                "sentinelSelector": self.sentinel_selector
+            })
+        except Exception as e:
+            # Navigation in the middle of the check destroys the execution context
+            result = {"settled": False, "error": str(e)}
+        result["mode"] = "observer"
+        result["network_idle"] = network_idle
+        return result
+
+    async def _legacy_scroll_through_page(self, page: Page):
+        """Fixed-sleep scroll pass used before the observer-based detector existed"""
+        try:
+            # Wait for network to be idle
+            await page.wait_for_load_state("networkidle", timeout=15000)
+            await page.wait_for_timeout(2000)  # Extra wait for dynamic content
+
+            # First, scroll all the way to bottom to trigger lazy loading
+            await page.evaluate("window.scrollTo({ top: document.body.scrollHeight, behavior: 'smooth' })")
+            await page.wait_for_timeout(2000)
+
+            # Scroll through the entire page to trigger lazy loading
+            viewport_height = await page.evaluate("window.innerHeight")
+            total_height = await page.evaluate("document.body.scrollHeight")
+
+            # Scroll down in increments to load all content
+            current_position = 0
+            scroll_step = viewport_height * 0.7  # Scroll 70% of viewport at a time
+
+            while current_position < total_height:
+                await page.evaluate(f"window.scrollTo({{ top: {current_position}, behavior: 'smooth' }})")
+                await page.wait_for_timeout(1000)  # Longer wait for content to load
+                current_position += scroll_step
+                # Re-check total height in case it increased
+                new_height = await page.evaluate("document.body.scrollHeight")
+                if new_height > total_height:
+                    total_height = new_height
+                    # Scroll to new bottom
+                    await page.evaluate(f"window.scrollTo({{ top: {new_height}, behavior: 'smooth' }})")
+                    await page.wait_for_timeout(1000)
+
+            # Scroll back to top
+            await page.evaluate("window.scrollTo({ top: 0, behavior: 'smooth' })")
+            await page.wait_for_timeout(1500)
+        except Exception:
+            # Continue even if scrolling fails
+            pass
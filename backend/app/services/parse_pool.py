@@ -0,0 +1,115 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from app.config import settings
+from app.utils.logger import logger
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import multiprocessing
+import time
+
+
+def _timed_call(fn: Callable, args: Tuple) -> Tuple[Any, float, float]:
+    """Runs in the worker: returns (result, wall-clock start, execution ms)"""
+    started_at = time.time()
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, started_at, (time.perf_counter() - started) * 1000
+
+
+class ParseWorkerCrashed(Exception):
+    """Raised when the worker parsing a document dies, typically OOM-killed on a pathological page"""
+
+
+class ParsePool:
+    """
+    Process pool for CPU-bound HTML parsing, so big pages don't stall the event loop.
+
+    `run(fn, html, ...)` ships a module-level function and plain str/dict
+    arguments to a worker process and awaits the (picklable) result.
+    Documents shorter than `min_chars` are parsed inline, where a worker
+    round trip would cost more than the parse. Workers are spawned lazily on
+    the first large document. With `workers` at 0, everything runs inline.
+    A document whose worker dies fails with ParseWorkerCrashed; it is never
+    retried inline, where it could take the server down the same way.
+    """
+
+    def __init__(self, workers: int = None, min_chars: int = None):
+        self.workers = workers if workers is not None else settings.parse_pool_workers
+        self.min_chars = min_chars if min_chars is not None else settings.parse_pool_min_chars
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.submitted = 0
+        self.completed = 0
+        self.inline = 0
+        self.failed = 0
+        self.restarts = 0
+        self.exec_ms_total = 0.0
+        self.exec_ms_max = 0.0
+        self.queue_wait_ms_total = 0.0
+        self.queue_wait_ms_max = 0.0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers don't inherit the server's event loop, threads or sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, fn: Callable, html: str, *args) -> Any:
+        """Run fn(html, *args) in a worker, or inline for small documents"""
+        if self.workers <= 0 or len(html) < self.min_chars:
+            self.inline += 1
+            return fn(html, *args)
+
+        loop = asyncio.get_running_loop()
+        submitted_at = time.time()
+        self.submitted += 1
+        try:
+            result, started_at, exec_ms = await loop.run_in_executor(self._pool(), _timed_call, fn, (html,) + args)
+        except BrokenProcessPool:
+            # A worker died (OOM on a pathological page); replace the pool for the next document
+            self.failed += 1
+            self.restarts += 1
+            logger.warning(f"Parse pool worker died on a {len(html)}-character document; restarting the pool")
+            self._shutdown()
+            raise ParseWorkerCrashed(f"Parse worker died on a {len(html)}-character document")
+        except Exception:
+            self.failed += 1
+            raise
+
+        self.completed += 1
+        queue_wait_ms = max(0.0, (started_at - submitted_at) * 1000)
+        self.exec_ms_total += exec_ms
+        self.exec_ms_max = max(self.exec_ms_max, exec_ms)
+        self.queue_wait_ms_total += queue_wait_ms
+        self.queue_wait_ms_max = max(self.queue_wait_ms_max, queue_wait_ms)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        in_flight = self.submitted - self.completed - self.failed
+        return {
+            "workers": self.workers,
+            "started": self._executor is not None,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - self.workers),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "inline": self.inline,
+            "failed": self.failed,
+            "restarts": self.restarts,
+            "exec_ms_avg": round(self.exec_ms_total / self.completed, 2) if self.completed else 0.0,
+            "exec_ms_max": round(self.exec_ms_max, 2),
+            "queue_wait_ms_avg": round(self.queue_wait_ms_total / self.completed, 2) if self.completed else 0.0,
+            "queue_wait_ms_max": round(self.queue_wait_ms_max, 2)
+        }
+
+    def _shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def close(self):
+        self._shutdown()
+
+
+parse_pool = ParsePool()
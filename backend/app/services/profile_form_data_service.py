@@ -0,0 +1,104 @@
+from app.config import settings
+from app.utils.field_taxonomy import TAXONOMY_FINGERPRINT
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import threading
+import time
+
+
+# Bump when profile_to_form_data or the stored record changes shape
+FORM_DATA_FORMAT = 1
+# The stored key descriptions are field taxonomy classifications, so the stamp also
+# covers the taxonomy's tables; rows stamped with anything else are rebuilt the next
+# time they're read
+FORM_DATA_SCHEMA = f"{FORM_DATA_FORMAT}:{TAXONOMY_FINGERPRINT}"
+
+
+class ProfileFormData:
+    """A profile's materialised form data, the per-key matcher inputs and the resume to upload"""
+
+    __slots__ = ("form_data", "keys", "resume_path", "version", "loaded_at")
+
+    def __init__(
+        self,
+        form_data: Dict[str, Any],
+        keys: Dict[str, Tuple[str, Optional[str]]],
+        resume_path: Optional[str],
+        version: int
+    ):
+        self.form_data = form_data
+        # profile key -> (normalised key, canonical field or None)
+        self.keys = keys
+        self.resume_path = resume_path
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], version: int, resume_path: Optional[str]) -> "ProfileFormData":
+        keys = {key: (normalized, canonical) for key, (normalized, canonical) in record.get("keys", {}).items()}
+        return cls(record.get("form_data", {}), keys, resume_path, version)
+
+
+class ProfileFormDataCache:
+    """
+    Materialised profile form data per user, in memory.
+
+    Profile writes drop the user's entry; entries also expire after
+    `ttl_seconds` so a write handled by another worker process is picked up.
+    Callers get the cached object itself and must copy form_data before
+    changing it.
+    """
+
+    def __init__(self, max_entries: int = None, ttl_seconds: int = None):
+        self.max_entries = max_entries or settings.profile_form_data_cache_max_entries
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.profile_form_data_cache_ttl_seconds
+        self._entries: "OrderedDict[str, ProfileFormData]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[ProfileFormData]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and time.monotonic() - entry.loaded_at < self.ttl_seconds:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, user_id: str, entry: ProfileFormData):
+        with self._lock:
+            current = self._entries.get(user_id)
+            # A slow reader mustn't replace what a newer write already produced
+            if current is not None and current.version > entry.version:
+                return
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations
+        }
+
+
+profile_form_data_cache = ProfileFormDataCache()
@@ -3,6 +3,8 @@ from sqlalchemy import select
 from sqlalchemy.orm.attributes import flag_modified
 from typing import List, Optional
 from app.models.profile import Profile, ProfileCreate, ProfileUpdate, ProfileResponse
+from app.services.profile_form_data_service import FORM_DATA_SCHEMA, ProfileFormData, profile_form_data_cache
+from app.utils.field_matcher import FieldMatcher
 from datetime import datetime
 
 
@@ -32,6 +34,7 @@ class ProfileService:
             additional_data=profile_data.additional_data,
             quick_apply_data=quick_apply_data
         )
+        ProfileService.materialize_form_data(profile)
         db.add(profile)
         await db.commit()
         await db.refresh(profile)
@@ -118,6 +121,7 @@ class ProfileService:
         # Mark as modified - CRITICAL for JSON fields in SQLAlchemy
         # Even with a new dict, we need to flag it as modified
         flag_modified(profile, "quick_apply_data")
+        ProfileService.materialize_form_data(profile)
         
         try:
             # Flush to ensure changes are tracked before commit
@@ -127,6 +131,7 @@ class ProfileService:
             # Commit the transaction
             await db.commit()
             print("✓ Commit successful - data saved to database")
+            profile_form_data_cache.invalidate(profile.user_id)
             
             # Refresh to get the latest data from database
             await db.refresh(profile)
@@ -151,8 +156,48 @@ class ProfileService:
         
         await db.delete(profile)
         await db.commit()
+        profile_form_data_cache.invalidate(profile.user_id)
         return True
     
+    @staticmethod
+    def materialize_form_data(profile: Profile):
+        """Store profile_to_form_data output and its key descriptions on the row and bump its version; the caller commits"""
+        form_data = ProfileService.profile_to_form_data(profile)
+        profile.form_data_cache = {
+            "schema": FORM_DATA_SCHEMA,
+            "form_data": form_data,
+            "keys": {key: list(FieldMatcher.describe_key(key)) for key in form_data}
+        }
+        profile.form_data_version = (profile.form_data_version or 0) + 1
+    
+    @staticmethod
+    async def get_form_data(db: AsyncSession, user_id: str) -> Optional[ProfileFormData]:
+        """The user's materialised form data, from memory when possible; None without a profile"""
+        cached = profile_form_data_cache.get(user_id)
+        if cached is not None:
+            return cached
+        
+        # Only the materialised columns: resume_data (with the resume's full text) stays on disk
+        result = await db.execute(
+            select(Profile.id, Profile.form_data_cache, Profile.form_data_version, Profile.resume_path)
+            .where(Profile.user_id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        
+        record, version = row.form_data_cache, row.form_data_version or 0
+        if not record or record.get("schema") != FORM_DATA_SCHEMA:
+            # Written before materialisation (or in an older format): build it once and store it
+            profile = await ProfileService.get_profile(db, row.id)
+            ProfileService.materialize_form_data(profile)
+            await db.commit()
+            record, version = profile.form_data_cache, profile.form_data_version
+        
+        entry = ProfileFormData.from_record(record, version, row.resume_path)
+        profile_form_data_cache.put(user_id, entry)
+        return entry
+    
     @staticmethod
     def profile_to_form_data(profile: Profile) -> dict:
         form_data = {}
@@ -0,0 +1,120 @@
+from playwright.async_api import Page, Route
+from urllib.parse import urlparse
+from app.config import settings
+from typing import Dict, Any, List, Optional
+
+
+# Resource types that never matter for finding or filling form controls
+HEAVY_RESOURCE_TYPES = {"image", "media", "font"}
+
+# Analytics, ads and session-replay hosts commonly embedded in career sites
+DEFAULT_BLOCKED_HOSTS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "googleadservices.com", "facebook.net",
+    "connect.facebook.net", "ads.linkedin.com", "snap.licdn.com", "bat.bing.com",
+    "clarity.ms", "hotjar.com", "fullstory.com", "mixpanel.com", "segment.io",
+    "segment.com", "cdn.segment.com", "amplitude.com", "heap.io", "newrelic.com",
+    "nr-data.net", "optimizely.com", "quantserve.com", "scorecardresearch.com",
+    "adsrvr.org", "criteo.com", "taboola.com", "outbrain.com", "intercom.io",
+    "drift.com", "qualtrics.com", "onetrust.com", "cookielaw.org"
+]
+
+# Rough transfer sizes used to estimate what an aborted request would have cost
+ESTIMATED_BYTES_BY_TYPE = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 30_000,
+    "stylesheet": 20_000,
+    "xhr": 2_000,
+    "fetch": 2_000
+}
+DEFAULT_ESTIMATED_BYTES = 5_000
+
+# "analysis" strips everything that is not needed to read the form,
+# "interactive" keeps the page looking normal for a user and only drops trackers
+PROFILES = {
+    "analysis": {"block_types": True, "block_hosts": True},
+    "interactive": {"block_types": False, "block_hosts": True},
+    "off": {"block_types": False, "block_hosts": False}
+}
+
+
+def _host_matches(host: str, suffixes: List[str]) -> bool:
+    return any(host == suffix or host.endswith("." + suffix) for suffix in suffixes)
+
+
+class ResourceBlocker:
+    """
+    Page-level request router that aborts heavy resources and tracker hosts.
+
+    Per-domain allowlists map a page host suffix to the resource types or
+    request host suffixes that must still load on that site, e.g.
+    {"myworkdayjobs.com": ["font", "wd5.myworkdaysite.com"]}.
+    """
+
+    def __init__(
+        self,
+        profile: str = "analysis",
+        blocked_hosts: Optional[List[str]] = None,
+        allowlist: Optional[Dict[str, List[str]]] = None
+    ):
+        if not settings.resource_blocking_enabled:
+            profile = "off"
+        self.profile = profile
+        self.rules = PROFILES.get(profile, PROFILES["analysis"])
+        self.blocked_hosts = blocked_hosts or (DEFAULT_BLOCKED_HOSTS + list(settings.resource_blocked_hosts_extra))
+        self.allowlist = allowlist if allowlist is not None else dict(settings.resource_block_allowlist)
+        self.allowed_for_page: List[str] = []
+        self.requests_blocked = 0
+        self.requests_allowed = 0
+        self.estimated_bytes_saved = 0
+        self.blocked_by_type: Dict[str, int] = {}
+
+    async def attach(self, page: Page, page_url: str):
+        """Start routing the page's requests; the route is page-scoped and goes away with the page"""
+        if self.profile == "off":
+            return
+        page_host = urlparse(page_url).netloc.lower().split(":")[0]
+        self.allowed_for_page = []
+        for domain, allowed in self.allowlist.items():
+            if _host_matches(page_host, [domain.lower()]):
+                self.allowed_for_page.extend(item.lower() for item in allowed)
+        await page.route("**/*", self._handle)
+
+    def should_block(self, request_url: str, resource_type: str) -> bool:
+        if resource_type == "document":
+            return False
+        host = urlparse(request_url).netloc.lower().split(":")[0]
+        if resource_type in self.allowed_for_page or _host_matches(host, self.allowed_for_page):
+            return False
+        if self.rules["block_hosts"] and _host_matches(host, self.blocked_hosts):
+            return True
+        if self.rules["block_types"] and resource_type in HEAVY_RESOURCE_TYPES:
+            return True
+        return False
+
+    async def _handle(self, route: Route):
+        request = route.request
+        resource_type = request.resource_type
+        try:
+            if self.should_block(request.url, resource_type):
+                self.requests_blocked += 1
+                self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+                self.estimated_bytes_saved += ESTIMATED_BYTES_BY_TYPE.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+                await route.abort()
+            else:
+                self.requests_allowed += 1
+                await route.continue_()
+        except Exception:
+            # The page may have been closed while the request was in flight
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "profile": self.profile,
+            "requests_blocked": self.requests_blocked,
+            "requests_allowed": self.requests_allowed,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "blocked_by_type": dict(self.blocked_by_type)
+        }
@@ -2,11 +2,13 @@ from typing import Dict, List, Any
 from app.services.automation_service import AutomationService
 from app.utils.field_validator import FieldValidator
 from app.utils.field_matcher import FieldMatcher
+from app.utils.form_types import FieldIndex
 
 
 class SafetyService:
     
-    def __init__(self):
+    def __init__(self, client=None):
+        self.client = client
         self.automation_service = AutomationService()
         self.validator = FieldValidator()
         self.matcher = FieldMatcher()
@@ -14,7 +16,7 @@ class SafetyService:
     async def preview_actions(self, url: str, form_data: Dict[str, Any], form_structure: Dict[str, Any] = None) -> Dict[str, Any]:
         if not form_structure:
             from app.services.html_parser_service import HTMLParserService
-            html_parser = HTMLParserService()
+            html_parser = HTMLParserService(client=self.client)
             try:
                 result = await html_parser.analyze_form_from_url(url)
                 form_structure = result.get('form_structure', {})
@@ -23,23 +25,23 @@ class SafetyService:
             finally:
                 await html_parser.close()
         
-        fields = form_structure.get('fields', [])
+        # One label index serves matching, validation and the per-value lookups below
+        fields = FieldIndex.from_structure(form_structure)
         
         matched_data = self.matcher.match_form_data_to_fields(form_data, fields)
         
-        is_valid, errors = self.validator.validate_form_data(matched_data, form_structure)
+        is_valid, errors = self.validator.validate_form_data(matched_data, fields)
         
         actions = []
         for label, value in matched_data.items():
-            field = next((f for f in fields if f['label'] == label), None)
-            if field:
-                field_type = field.get('type', 'text')
+            field = fields.get(label)
+            if field is not None:
                 actions.append({
-                    "action": "fill" if field_type != 'select' else "select",
+                    "action": "fill" if field.type != 'select' else "select",
                     "field": label,
-                    "type": field_type,
+                    "type": field.type,
                     "value": str(value),
-                    "required": field.get('required', False)
+                    "required": field.required
                 })
         
         return {
@@ -54,23 +56,22 @@ class SafetyService:
             "warnings": self._generate_warnings(matched_data, fields)
         }
     
-    def _generate_warnings(self, form_data: Dict[str, Any], fields: List[Dict[str, Any]]) -> List[str]:
+    def _generate_warnings(self, form_data: Dict[str, Any], fields: FieldIndex) -> List[str]:
         warnings = []
         
-        required_fields = [f for f in fields if f.get('required', False)]
-        for field in required_fields:
-            if field['label'] not in form_data or not form_data[field['label']]:
-                warnings.append(f"Required field '{field['label']}' is missing")
+        for field in fields.required():
+            if field.label not in form_data or not form_data[field.label]:
+                warnings.append(f"Required field '{field.label}' is missing")
         
         for key in form_data:
-            if not any(f['label'] == key for f in fields):
+            if key not in fields:
                 warnings.append(f"Field '{key}' not found in form structure")
         
         return warnings
     
     async def dry_run(self, url: str, form_data: Dict[str, Any]) -> Dict[str, Any]:
         from app.services.html_parser_service import HTMLParserService
-        html_parser = HTMLParserService()
+        html_parser = HTMLParserService(client=self.client)
         
         try:
             result = await html_parser.analyze_form_from_url(url)
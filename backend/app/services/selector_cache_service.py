@@ -0,0 +1,162 @@
+from app.config import settings
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import sqlite3
+import threading
+import time
+
+
+class SelectorCacheService:
+    """
+    Learned label -> selector mappings, keyed by host and a structural hash of the form.
+
+    Stored in a small SQLite file so repeat applications on the same ATS skip
+    field discovery. Entries expire after `ttl_seconds`; when the table grows
+    past `max_entries` the least recently used rows are evicted.
+
+    The async methods run the SQLite work in a thread so fills never block the
+    event loop on disk I/O. Lookups don't write: hits are remembered in memory
+    and their last_used times written in one batch on the next store, or once
+    `touch_batch` of them are pending.
+    """
+
+    touch_batch = 256
+
+    def __init__(self, db_path: str = None, ttl_seconds: int = None, max_entries: int = None):
+        self.db_path = db_path or settings.selector_cache_path
+        self.ttl_seconds = ttl_seconds or settings.selector_cache_ttl_seconds
+        self.max_entries = max_entries or settings.selector_cache_max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # (host, form_hash, label) -> last hit time, not yet written
+        self._touched: Dict[Tuple[str, str, str], float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS learned_selectors ("
+                "host TEXT NOT NULL, form_hash TEXT NOT NULL, label TEXT NOT NULL, "
+                "selector TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL, "
+                "PRIMARY KEY (host, form_hash, label))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_learned_selectors_last_used ON learned_selectors (last_used)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    async def lookup(self, host: str, form_hash: str, labels: List[str]) -> Dict[str, str]:
+        """Return cached selectors for the labels that have a fresh entry"""
+        if not labels:
+            return {}
+        return await asyncio.to_thread(self.lookup_sync, host, form_hash, labels)
+
+    async def store(self, host: str, form_hash: str, selectors: Dict[str, str]):
+        if selectors:
+            await asyncio.to_thread(self.store_sync, host, form_hash, selectors)
+
+    async def invalidate(self, host: str, form_hash: str, label: str):
+        """Drop a selector that no longer matched anything on the page"""
+        await asyncio.to_thread(self.invalidate_sync, host, form_hash, label)
+
+    def lookup_sync(self, host: str, form_hash: str, labels: List[str]) -> Dict[str, str]:
+        if not labels:
+            return {}
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            placeholders = ",".join("?" for _ in labels)
+            rows = conn.execute(
+                f"SELECT label, selector FROM learned_selectors "
+                f"WHERE host = ? AND form_hash = ? AND created_at > ? AND label IN ({placeholders})",
+                [host, form_hash, now - self.ttl_seconds, *labels]
+            ).fetchall()
+            found = dict(rows)
+            for label in found:
+                self._touched[(host, form_hash, label)] = now
+            if len(self._touched) >= self.touch_batch:
+                self._flush_touches(conn)
+                conn.commit()
+        self.hits += len(found)
+        self.misses += len(labels) - len(found)
+        return found
+
+    def store_sync(self, host: str, form_hash: str, selectors: Dict[str, str]):
+        if not selectors:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO learned_selectors "
+                "(host, form_hash, label, selector, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                [(host, form_hash, label, selector, now, now) for label, selector in selectors.items()]
+            )
+            for label in selectors:
+                self._touched.pop((host, form_hash, label), None)
+            self.stores += len(selectors)
+            # Eviction goes by last_used, so pending hits are written first
+            self._flush_touches(conn)
+            self._evict(conn, now)
+            conn.commit()
+
+    def invalidate_sync(self, host: str, form_hash: str, label: str):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "DELETE FROM learned_selectors WHERE host = ? AND form_hash = ? AND label = ?",
+                (host, form_hash, label)
+            )
+            conn.commit()
+            self._touched.pop((host, form_hash, label), None)
+        self.stale += 1
+
+    def _flush_touches(self, conn: sqlite3.Connection):
+        if self._touched:
+            conn.executemany(
+                "UPDATE learned_selectors SET last_used = ? WHERE host = ? AND form_hash = ? AND label = ?",
+                [(used, host, form_hash, label) for (host, form_hash, label), used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        expired = conn.execute(
+            "DELETE FROM learned_selectors WHERE created_at <= ?", (now - self.ttl_seconds,)
+        ).rowcount
+        count = conn.execute("SELECT COUNT(*) FROM learned_selectors").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM learned_selectors WHERE rowid IN "
+                "(SELECT rowid FROM learned_selectors ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+        self.evictions += max(expired, 0) + max(overflow, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stale": self.stale,
+            "stores": self.stores,
+            "evictions": self.evictions
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._flush_touches(self._conn)
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+
+selector_cache = SelectorCacheService()
@@ -0,0 +1,117 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+import numpy as np
+
+
+def trigrams(text: str) -> set:
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity_matrix(keys: List[str], labels: List[str]) -> np.ndarray:
+    """
+    Dice coefficient of padded character trigram sets, for every (key, label) pair.
+
+    Only trigrams that occur in some key can be shared, so the label side is
+    one-hot encoded over the keys' vocabulary; a thousand-label form stays a
+    (labels x a few hundred) matrix however many distinct trigrams it has.
+    """
+    key_grams = [trigrams(key) for key in keys]
+    label_grams = [trigrams(label) for label in labels]
+    vocabulary = {gram: column for column, gram in enumerate(sorted(set().union(*key_grams)))}
+
+    key_vectors = np.zeros((len(keys), len(vocabulary)), dtype=np.float32)
+    for row, grams in enumerate(key_grams):
+        key_vectors[row, [vocabulary[gram] for gram in grams]] = 1.0
+    label_vectors = np.zeros((len(labels), len(vocabulary)), dtype=np.float32)
+    for row, grams in enumerate(label_grams):
+        label_vectors[row, [vocabulary[gram] for gram in grams if gram in vocabulary]] = 1.0
+
+    shared = key_vectors @ label_vectors.T
+    sizes = (
+        np.array([len(grams) for grams in key_grams], dtype=np.float32)[:, None]
+        + np.array([len(grams) for grams in label_grams], dtype=np.float32)[None, :]
+    )
+    return np.divide(2.0 * shared, sizes, out=np.zeros_like(shared), where=sizes > 0)
+
+
+def solve_assignment(scores: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    (row, column) pairs of a one-to-one assignment maximising the total score.
+
+    The Hungarian algorithm in its shortest-augmenting-path form: O(n^2 m) for
+    n rows and m >= n columns, with the per-column work done as array operations.
+    """
+    rows, columns = scores.shape
+    if rows == 0 or columns == 0:
+        return []
+    if rows > columns:
+        return [(row, column) for column, row in solve_assignment(scores.T)]
+
+    cost = -scores.astype(np.float64)
+    u = np.zeros(rows + 1)
+    v = np.zeros(columns + 1)
+    # owner[j]: the 1-based row assigned to column j (0 for none); column 0 is the scratch slot
+    owner = np.zeros(columns + 1, dtype=np.int64)
+    way = np.zeros(columns + 1, dtype=np.int64)
+
+    for row in range(1, rows + 1):
+        owner[0] = row
+        column = 0
+        min_slack = np.full(columns + 1, np.inf)
+        used = np.zeros(columns + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current_row = owner[column]
+            slack = cost[current_row - 1] - u[current_row] - v[1:]
+            better = ~used[1:] & (slack < min_slack[1:])
+            min_slack[1:][better] = slack[better]
+            way[1:][better] = column
+            candidates = np.where(used[1:], np.inf, min_slack[1:])
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_slack[~used] -= delta
+            column = next_column
+            if owner[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    return sorted((int(owner[column]) - 1, column - 1) for column in range(1, columns + 1) if owner[column])
+
+
+@dataclass(slots=True)
+class FieldAssignment:
+    """Which form label each profile key fills, one key per label at most"""
+
+    labels: Dict[str, str] = field(default_factory=dict)
+    scores: Dict[str, float] = field(default_factory=dict)
+    unassigned: List[str] = field(default_factory=list)
+
+    def apply(self, form_data: Dict[str, Any]) -> Dict[str, Any]:
+        """form_data re-keyed by form label; unassigned keys are left out"""
+        return {self.labels[key]: value for key, value in form_data.items() if key in self.labels}
+
+
+def assign_fields(keys: List[Tuple[str, str]], candidates: List[Tuple[str, str]], threshold: float) -> FieldAssignment:
+    """
+    One-to-one assignment of (key, normalised key) pairs to (label, normalised label) candidates.
+
+    Pairs scoring under the threshold are zeroed before solving, so the
+    assignment maximises the total score over acceptable pairs only, and
+    keys that end up on a zero are reported as unassigned.
+    """
+    scores = similarity_matrix([key_norm for _, key_norm in keys], [label_norm for _, label_norm in candidates])
+    scores[scores < threshold] = 0.0
+
+    assignment = FieldAssignment()
+    for row, column in solve_assignment(scores):
+        if scores[row, column] > 0.0:
+            assignment.labels[keys[row][0]] = candidates[column][0]
+            assignment.scores[keys[row][0]] = round(float(scores[row, column]), 4)
+    assignment.unassigned = [key for key, _ in keys if key not in assignment.labels]
+    return assignment
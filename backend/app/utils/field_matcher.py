@@ -1,6 +1,9 @@
-from typing import Dict, Any, Optional, List
-import re
+from typing import Dict, Any, Optional, List, Tuple, Union
 from difflib import SequenceMatcher
+from app.config import settings
+from app.utils.field_assignment import FieldAssignment, assign_fields
+from app.utils.field_taxonomy import classify_label
+from app.utils.form_types import FieldIndex, normalize_label
 
 
 class FieldMatcher:
@@ -11,22 +14,25 @@ class FieldMatcher:
     
     @staticmethod
     def normalize_label(label: str) -> str:
-        label = label.strip()
-        label = re.sub(r'[^\w\s]', '', label)
-        label = re.sub(r'\s+', ' ', label)
-        return label.lower()
+        return normalize_label(label)
     
     @staticmethod
     def find_best_match(target: str, candidates: List[str], threshold: float = 0.6) -> Optional[str]:
         if not candidates:
             return None
         
-        target_norm = FieldMatcher.normalize_label(target)
+        normalized = [(candidate, FieldMatcher.normalize_label(candidate)) for candidate in candidates]
+        return FieldMatcher.find_best_normalized_match(FieldMatcher.normalize_label(target), normalized, threshold)
+    
+    @staticmethod
+    def find_best_normalized_match(
+        target_norm: str, candidates: List[Tuple[str, str]], threshold: float = 0.6
+    ) -> Optional[str]:
+        """find_best_match over (label, normalised label) pairs normalised ahead of time"""
         best_match = None
         best_score = 0.0
         
-        for candidate in candidates:
-            candidate_norm = FieldMatcher.normalize_label(candidate)
+        for candidate, candidate_norm in candidates:
             score = FieldMatcher.similarity(target_norm, candidate_norm)
             
             if score > best_score and score >= threshold:
@@ -36,16 +42,100 @@ class FieldMatcher:
         return best_match
     
     @staticmethod
-    def match_form_data_to_fields(form_data: Dict[str, Any], available_fields: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def describe_key(key: str) -> Tuple[str, Optional[str]]:
+        """(normalised key, canonical field or None) for a profile key"""
+        key_norm = normalize_label(key)
+        return key_norm, classify_label(key_norm)
+    
+    @staticmethod
+    def match_form_data_to_fields(
+        form_data: Dict[str, Any],
+        available_fields: Union[FieldIndex, List[Dict[str, Any]]],
+        mode: str = None,
+        key_info: Dict[str, Tuple[str, Optional[str]]] = None
+    ) -> Dict[str, Any]:
+        """key_info: describe_key results computed ahead of time, e.g. stored with the profile"""
         matched_data = {}
-        field_labels = [field['label'] for field in available_fields]
+        if not isinstance(available_fields, FieldIndex):
+            available_fields = FieldIndex.from_fields(available_fields)
+        key_info = key_info or {}
+        
+        def describe(key: str) -> Tuple[str, Optional[str]]:
+            return key_info.get(key) or FieldMatcher.describe_key(key)
+        
+        if settings.field_taxonomy_enabled:
+            # Known fields (names, email, phone, address...) are paired through the taxonomy,
+            # each filled once; only what it can't classify goes through fuzzy matching
+            targets, remaining = FieldMatcher.match_canonical_fields(form_data, available_fields, key_info)
+        else:
+            targets, remaining = {}, list(form_data)
+        unclassified_only = settings.field_taxonomy_enabled
+        
+        if (mode or settings.field_match_mode) == "assignment":
+            keys = [(key, describe(key)[0]) for key in remaining]
+            assignment = assign_fields(
+                keys, available_fields.candidates(unclassified_only), settings.field_assignment_threshold
+            )
+            targets.update(assignment.labels)
+        else:
+            # Field labels are normalised and indexed once per form, not once per profile key
+            label_matcher = available_fields.label_matcher(unclassified_only)
+            for user_key in remaining:
+                targets[user_key] = label_matcher.best_match(describe(user_key)[0]) or user_key
         
         for user_key, value in form_data.items():
-            matched_label = FieldMatcher.find_best_match(user_key, field_labels)
-            if matched_label:
-                matched_data[matched_label] = value
-            else:
-                matched_data[user_key] = value
+            if user_key in targets:
+                matched_data[targets[user_key]] = value
         
         return matched_data
-
+    
+    @staticmethod
+    def match_canonical_fields(
+        form_data: Dict[str, Any], fields: FieldIndex, key_info: Dict[str, Tuple[str, Optional[str]]] = None
+    ) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Pair profile keys with form labels by canonical field.
+        
+        Returns ({profile key: form label}, keys left for fuzzy matching). The first
+        key of each canonical field (profile order) stands for it; later aliases
+        ("Email Address" after "Email") are dropped rather than matched again. A
+        canonical field the form doesn't have leaves its key for fuzzy matching.
+        """
+        targets = {}
+        remaining = []
+        key_info = key_info or {}
+        canonical_labels = fields.canonical_labels()
+        seen = set()
+        
+        for user_key in form_data:
+            _, canonical = key_info.get(user_key) or FieldMatcher.describe_key(user_key)
+            if canonical is None:
+                remaining.append(user_key)
+                continue
+            if canonical in seen:
+                continue
+            seen.add(canonical)
+            if canonical in canonical_labels:
+                targets[user_key] = canonical_labels[canonical]
+            else:
+                remaining.append(user_key)
+        
+        return targets, remaining
+    
+    @staticmethod
+    def assign_form_data_to_fields(
+        form_data: Dict[str, Any], available_fields: Union[FieldIndex, List[Dict[str, Any]]], threshold: float = None
+    ) -> FieldAssignment:
+        """
+        Give each form label at most one profile key, maximising total trigram similarity.
+        
+        Unlike the greedy match, "Name", "Full Name" and "First Name" can't all land
+        on one label, and keys with no acceptable label come back as unassigned
+        instead of being passed through under their own names.
+        """
+        if not isinstance(available_fields, FieldIndex):
+            available_fields = FieldIndex.from_fields(available_fields)
+        keys = [(key, FieldMatcher.normalize_label(key)) for key in form_data]
+        if threshold is None:
+            threshold = settings.field_assignment_threshold
+        return assign_fields(keys, available_fields.candidates(), threshold)
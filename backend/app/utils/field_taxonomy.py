@@ -0,0 +1,156 @@
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import re
+
+
+# Canonical field -> label phrases (already normalised: lower case, no punctuation).
+# Fields the profile never fills (middle name, address line 2) are listed too, so
+# their labels count as classified and aren't fuzzy-matched onto a nearby profile key.
+CANONICAL_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "name": ("name", "full name", "your name", "legal name", "full legal name", "candidate name", "applicant name"),
+    "given_name": ("first name", "first names", "given name", "given names", "forename", "legal first name", "fname"),
+    "additional_name": ("middle name", "middle names", "middle initial"),
+    "family_name": ("last name", "family name", "surname", "legal last name", "lname"),
+    "preferred_name": ("preferred name", "preferred first name", "nickname"),
+    "email": ("email", "email address", "e mail", "mail address", "your email"),
+    "tel": (
+        "phone", "phone number", "mobile", "mobile number", "mobile phone", "cell",
+        "cell phone", "telephone", "telephone number", "tel"
+    ),
+    "street_address": ("address", "street", "street address", "address line 1", "address 1", "mailing address", "home address"),
+    "address_line2": ("address line 2", "address 2", "apartment", "suite"),
+    "city": ("city", "town", "city town"),
+    "state": ("state", "province", "region", "state province", "state region", "county"),
+    "postal_code": ("zip", "zip code", "zipcode", "postal code", "postcode", "post code"),
+    "country": ("country", "country region", "country of residence"),
+    "location": ("location", "current location", "where are you located"),
+    "organization": ("company", "current company", "employer", "current employer", "organization", "organisation"),
+    "linkedin": ("linkedin", "linkedin profile", "linkedin url", "linkedin profile url"),
+    "github": ("github", "github url", "github profile"),
+    "website": ("website", "personal website", "website url", "portfolio", "portfolio url", "personal site"),
+}
+
+# autocomplete field names (WHATWG autofill) -> canonical field
+AUTOCOMPLETE_FIELDS: Dict[str, str] = {
+    "name": "name",
+    "given-name": "given_name",
+    "additional-name": "additional_name",
+    "family-name": "family_name",
+    "nickname": "preferred_name",
+    "email": "email",
+    "tel": "tel",
+    "tel-national": "tel",
+    "tel-local": "tel",
+    "street-address": "street_address",
+    "address-line1": "street_address",
+    "address-line2": "address_line2",
+    "address-line3": "address_line2",
+    "address-level2": "city",
+    "address-level1": "state",
+    "postal-code": "postal_code",
+    "country": "country",
+    "country-name": "country",
+    "organization": "organization",
+    "url": "website",
+}
+
+# input types that say what a field holds when nothing else does
+TYPE_FIELDS: Dict[str, str] = {"email": "email", "tel": "tel"}
+
+TEXT_TYPES = {"text", "email", "tel", "number", "textarea"}
+# Fields whose value may be picked from a dropdown
+SELECTABLE_FIELDS = {"country", "state", "city", "location"}
+
+# Changes whenever a table above does, so classifications stored elsewhere can tell they're stale
+TAXONOMY_FINGERPRINT = hashlib.sha1(json.dumps({
+    "fields": CANONICAL_FIELDS,
+    "autocomplete": AUTOCOMPLETE_FIELDS,
+    "types": TYPE_FIELDS,
+    "text_types": sorted(TEXT_TYPES),
+    "selectable": sorted(SELECTABLE_FIELDS),
+}, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+NAME_TOKEN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+_END = "$"
+
+
+def _compile_trie(fields: Dict[str, Tuple[str, ...]]) -> Dict[str, dict]:
+    trie: Dict[str, dict] = {}
+    for canonical, aliases in fields.items():
+        for alias in aliases:
+            node = trie
+            for token in alias.split():
+                node = node.setdefault(token, {})
+            node.setdefault(_END, canonical)
+    return trie
+
+
+ALIASES: Dict[str, str] = {alias: canonical for canonical, aliases in CANONICAL_FIELDS.items() for alias in aliases}
+ALIAS_TRIE = _compile_trie(CANONICAL_FIELDS)
+
+
+def longest_alias(tokens: List[str], last_wins: bool = False) -> Tuple[Optional[str], int]:
+    """(canonical, token count) of the longest alias phrase anywhere in tokens; earliest wins ties unless last_wins"""
+    best, best_length = None, 0
+    for start in range(len(tokens)):
+        node = ALIAS_TRIE
+        for position in range(start, len(tokens)):
+            node = node.get(tokens[position])
+            if node is None:
+                break
+            length = position - start + 1
+            if _END in node and (length > best_length or (last_wins and length == best_length)):
+                best, best_length = node[_END], length
+    return best, best_length
+
+
+def classify_label(normalized_label: str) -> Optional[str]:
+    """Canonical field for a label: an exact alias, or an alias covering at least half its words"""
+    canonical = ALIASES.get(normalized_label)
+    if canonical is not None:
+        return canonical
+    tokens = normalized_label.split()
+    canonical, length = longest_alias(tokens)
+    # "Location (City)" is a location; "Phone Device Type" is not a phone number
+    return canonical if canonical is not None and 2 * length >= len(tokens) else None
+
+
+def classify_name(name: str) -> Optional[str]:
+    """Canonical field for a name attribute like job_application[first_name] or legalNameSection_firstName"""
+    # Names run from section to leaf, so on a tie the later (more specific) phrase wins
+    return longest_alias([token.lower() for token in NAME_TOKEN.findall(name)], last_wins=True)[0]
+
+
+def classify_autocomplete(autocomplete: str) -> Optional[str]:
+    # "section-apply shipping given-name": the field name is the last known token
+    for token in reversed(autocomplete.lower().split()):
+        if token in AUTOCOMPLETE_FIELDS:
+            return AUTOCOMPLETE_FIELDS[token]
+    return None
+
+
+def accepts(canonical: str, field_type: str) -> bool:
+    return field_type in TEXT_TYPES or (field_type == "select" and canonical in SELECTABLE_FIELDS)
+
+
+def classify_field(normalized_label: str, field_type: str, autocomplete: str = "", name: str = "") -> Optional[str]:
+    """
+    Canonical field a form control holds, or None when the taxonomy can't tell.
+
+    The autocomplete attribute is the page's own statement and wins; then the
+    label, the name attribute and the input type, in that order. A guess is
+    dropped when the control can't take that kind of value (a checkbox labelled
+    "Email me updates", a "Phone type" dropdown).
+    """
+    candidates = (
+        classify_autocomplete(autocomplete) if autocomplete else None,
+        classify_label(normalized_label),
+        classify_name(name) if name else None,
+        TYPE_FIELDS.get(field_type),
+    )
+    for canonical in candidates:
+        if canonical is not None and accepts(canonical, field_type):
+            return canonical
+    return None
@@ -1,5 +1,6 @@
 import re
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Union
+from app.utils.form_types import FieldIndex
 
 
 class FieldValidator:
@@ -68,25 +69,17 @@ class FieldValidator:
         return True, ""
     
     @staticmethod
-    def validate_form_data(form_data: Dict[str, Any], form_structure: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    def validate_form_data(form_data: Dict[str, Any], form_structure: Union[FieldIndex, Dict[str, Any]]) -> Tuple[bool, List[str]]:
         errors = []
-        fields = form_structure.get('fields', [])
+        index = form_structure if isinstance(form_structure, FieldIndex) else FieldIndex.from_structure(form_structure)
         
-        field_map = {field['label']: field for field in fields}
-        
-        for field in fields:
-            label = field['label']
-            field_type = field.get('type', 'text')
-            required = field.get('required', False)
-            value = form_data.get(label, '')
-            
-            is_valid, error = FieldValidator.validate_field(field_type, value, label, required)
+        for field in index:
+            is_valid, error = FieldValidator.validate_field(field.type, form_data.get(field.label, ''), field.label, field.required)
             if not is_valid:
                 errors.append(error)
         
         for key in form_data:
-            if key not in field_map:
+            if key not in index:
                 errors.append(f"Unknown field: {key}")
         
         return len(errors) == 0, errors
-
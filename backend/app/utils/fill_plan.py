@@ -0,0 +1,58 @@
+from typing import Dict, Any, List, Optional
+from app.utils.form_types import FieldIndex
+
+
+class FillPlan:
+    """
+    Compiled fill instructions carried from HTML analysis to the browser.
+
+    Each step is {"label", "selector", "type", "options", "value"}; the selector
+    comes from HTMLParserService so the executor can address the element directly
+    and only fall back to label search when it no longer matches.
+    """
+
+    @staticmethod
+    def build(form_data: Dict[str, Any], form_structure: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # First field wins when a label repeats, same as label search would
+        index = FieldIndex.from_structure(form_structure)
+
+        plan = []
+        for label, value in form_data.items():
+            field, action = index.get(label), index.action_for(label)
+            if action is None or value is None or str(value).strip() == "":
+                continue
+            plan.append({
+                "label": label,
+                "selector": action.selector,
+                "type": field.type,
+                "options": field.options,
+                "value": FillPlan.choose_value(value, field.options)
+            })
+        return plan
+
+    @staticmethod
+    def choose_value(value: Any, options: List[str]) -> Any:
+        """Map a value onto the matching select option text when there is one"""
+        if not options:
+            return value
+        wanted = str(value).strip().lower()
+        for option in options:
+            if option.strip().lower() == wanted:
+                return option
+        for option in options:
+            if wanted and wanted in option.strip().lower():
+                return option
+        return value
+
+    @staticmethod
+    def to_resolutions(plan: Optional[List[Dict[str, Any]]]) -> Dict[str, Dict[str, str]]:
+        """Turn plan steps into resolver-style {label: {"selector", "strategy"}} entries"""
+        return {
+            step['label']: {"selector": step['selector'], "strategy": "plan"}
+            for step in plan or []
+            if step.get('selector')
+        }
+
+    @staticmethod
+    def values(plan: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        return {step['label']: step['value'] for step in plan or []}
@@ -0,0 +1,228 @@
+from typing import Dict, List, Any, Optional
+from lxml import etree
+from app.utils.label_index import CONTROL_TAGS, SIBLING_LABEL_TAGS
+
+
+# BeautifulSoup stores strings under these as Script/Stylesheet/TemplateString/Ruby*
+# strings, which Tag.get_text() skips, so they never reach a label's text
+STRING_CONTAINER_TAGS = {'script', 'style', 'template', 'rt', 'rp'}
+TEXT_HOLDER_TAGS = SIBLING_LABEL_TAGS | {'option'}
+FEED_CHUNK_SIZE = 64 * 1024
+
+
+class StreamedElement:
+    """The part of a bs4 Tag that field extraction reads: name, attributes, options and text"""
+
+    __slots__ = ("name", "attrs", "options", "_segments", "_start", "_end")
+
+    def __init__(self, name: str, attrs: Dict[str, str], segments: List[str]):
+        self.name = name
+        self.attrs = attrs
+        self.options: List["StreamedElement"] = []
+        self._segments = segments
+        self._start = len(segments)
+        self._end: Optional[int] = None
+
+    def get(self, key: str, default=None):
+        return self.attrs.get(key, default)
+
+    def has_attr(self, key: str) -> bool:
+        return key in self.attrs
+
+    def find_all(self, name: str) -> List["StreamedElement"]:
+        return list(self.options) if name == 'option' else []
+
+    def get_text(self, strip: bool = True) -> str:
+        """Same result as Tag.get_text(strip=True); strings are stripped as they are parsed"""
+        end = self._end if self._end is not None else len(self._segments)
+        return "".join(self._segments[self._start:end])
+
+
+class StreamingLabelIndex:
+    """
+    LabelIndex built from lxml parser events instead of a BeautifulSoup tree.
+
+    The document is fed to lxml's HTML parser with this object as its target,
+    so no tree is materialised. Controls, forms and label candidates are
+    recorded as their start tags arrive. Script/style/template/ruby text is
+    dropped as it streams past. Label text is kept as slices of one shared
+    list of stripped strings and is only joined when a control asks for it,
+    which handles labels that close after the control they name. Strings are
+    split at tags, comments and processing instructions exactly where
+    BeautifulSoup splits them, so lookups return what the soup path would.
+
+    Every div and span is a possible sibling label, so on text-heavy pages
+    most of the page's text would be kept. `max_text_chars` caps that: once
+    that much text is buffered, only text inside labels and options is kept,
+    and later div/span sibling labels come back empty.
+    """
+
+    def __init__(self, max_text_chars: Optional[int] = None):
+        self.forms: List[StreamedElement] = []
+        self.controls_by_form: List[List[StreamedElement]] = []
+        self.all_controls: List[StreamedElement] = []
+        self._label_for: Dict[int, StreamedElement] = {}
+        self._wrapping_label: Dict[int, StreamedElement] = {}
+        self._previous_sibling: Dict[int, StreamedElement] = {}
+        self._latest_label_for: Dict[str, StreamedElement] = {}
+        self._labels_with_for = 0
+        self._segments: List[str] = []
+        self._pending: List[str] = []
+        # [tag, recorded element or None, last label/span/div child] per open element
+        self._open: List[list] = [[None, None, None]]
+        self._open_labels: List[StreamedElement] = []
+        self._open_forms: List[int] = []
+        self._open_selects: List[StreamedElement] = []
+        self._containers = 0
+        self._holders = 0
+        self._options = 0
+        self.max_text_chars = max_text_chars
+        self._text_chars = 0
+        self._text_capped = False
+
+    @classmethod
+    def from_html(
+        cls, html: str, chunk_size: int = FEED_CHUNK_SIZE, max_text_chars: Optional[int] = None
+    ) -> "StreamingLabelIndex":
+        index = cls(max_text_chars)
+        # Same recovery mode BeautifulSoup's lxml builder uses, so the event stream matches
+        parser = etree.HTMLParser(target=index, recover=True)
+        if html.startswith('\ufeff'):
+            html = html[1:]
+        # Feeding slices keeps lxml's encoded copy of the input to one chunk at a time
+        for offset in range(0, len(html), chunk_size):
+            parser.feed(html[offset:offset + chunk_size])
+        if not html:
+            parser.feed(html)
+        return parser.close()
+
+    # lxml parser target interface
+
+    def start(self, tag, attrib):
+        self._flush()
+        element = None
+        if tag in TEXT_HOLDER_TAGS or tag in CONTROL_TAGS or tag == 'form':
+            element = StreamedElement(tag, dict(attrib), self._segments)
+
+        if tag == 'form':
+            self.forms.append(element)
+            self.controls_by_form.append([])
+            self._open_forms.append(len(self.forms) - 1)
+        elif tag == 'label':
+            target = element.attrs.get('for')
+            if isinstance(target, str):
+                self._latest_label_for[target] = element
+                self._labels_with_for += 1
+        elif tag in CONTROL_TAGS:
+            self._record_control(element)
+        elif tag == 'option':
+            for select in self._open_selects:
+                select.options.append(element)
+
+        if tag in TEXT_HOLDER_TAGS:
+            self._holders += 1
+        if tag == 'option':
+            self._options += 1
+        if tag in STRING_CONTAINER_TAGS:
+            self._containers += 1
+        if tag == 'label':
+            self._open_labels.append(element)
+        elif tag == 'select':
+            self._open_selects.append(element)
+        self._open.append([tag, element, None])
+
+    def end(self, tag):
+        self._flush()
+        name, element, _ = self._open.pop()
+        if element is not None:
+            element._end = len(self._segments)
+
+        if name in TEXT_HOLDER_TAGS:
+            self._holders -= 1
+        if name == 'option':
+            self._options -= 1
+        if name in STRING_CONTAINER_TAGS:
+            self._containers -= 1
+        if name == 'label':
+            self._open_labels.pop()
+        elif name == 'select':
+            self._open_selects.pop()
+        elif name == 'form':
+            self._open_forms.pop()
+        if name in SIBLING_LABEL_TAGS:
+            self._open[-1][2] = element
+
+    def data(self, content):
+        # Text outside label candidates (and all script/style bodies) is never buffered
+        if not self._holders or self._containers:
+            return
+        if self._over_text_cap() and not (self._open_labels or self._options):
+            self._text_capped = True
+            return
+        self._pending.append(content)
+        self._text_chars += len(content)
+
+    def comment(self, text):
+        self._flush()
+
+    def pi(self, target, data=None):
+        self._flush()
+
+    def doctype(self, *args):
+        self._flush()
+
+    def close(self) -> "StreamingLabelIndex":
+        self._flush()
+        return self
+
+    def _flush(self):
+        """End the current string, as BeautifulSoup does at every tag and comment"""
+        if not self._pending:
+            return
+        text = "".join(self._pending).strip()
+        self._pending = []
+        if text:
+            self._segments.append(text)
+
+    def _over_text_cap(self) -> bool:
+        return self.max_text_chars is not None and self._text_chars >= self.max_text_chars
+
+    def _record_control(self, element: StreamedElement):
+        key = id(element)
+        field_id = element.attrs.get('id')
+        if field_id and field_id in self._latest_label_for:
+            self._label_for[key] = self._latest_label_for[field_id]
+        if self._open_labels:
+            self._wrapping_label[key] = self._open_labels[-1]
+        previous = self._open[-1][2]
+        if previous is not None:
+            self._previous_sibling[key] = previous
+        self.all_controls.append(element)
+        for form_index in self._open_forms:
+            self.controls_by_form[form_index].append(element)
+
+    # LabelIndex interface
+
+    def control_groups(self) -> List[List[StreamedElement]]:
+        if self.forms:
+            return self.controls_by_form
+        return [self.all_controls]
+
+    def label_for(self, element: StreamedElement, field_id: str) -> Optional[StreamedElement]:
+        return self._label_for.get(id(element))
+
+    def wrapping_label(self, element: StreamedElement) -> Optional[StreamedElement]:
+        return self._wrapping_label.get(id(element))
+
+    def previous_sibling(self, element: StreamedElement) -> Optional[StreamedElement]:
+        return self._previous_sibling.get(id(element))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "forms": len(self.forms),
+            "controls": len(self.all_controls),
+            "labels_with_for": self._labels_with_for,
+            "text_segments": len(self._segments),
+            "text_chars": self._text_chars,
+            "text_capped": self._text_capped
+        }
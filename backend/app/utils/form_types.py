@@ -0,0 +1,190 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from app.utils.field_taxonomy import classify_field
+from app.utils.label_matcher import LabelMatcher
+import re
+
+
+FIELD_KEYS = ("label", "type", "required", "value", "options", "frame")
+ACTION_KEYS = ("type", "target", "value", "selector", "frame")
+
+
+def normalize_label(label: str) -> str:
+    label = label.strip()
+    label = re.sub(r'[^\w\s]', '', label)
+    label = re.sub(r'\s+', ' ', label)
+    return label.lower()
+
+
+def _extra(data: Dict[str, Any], known: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    return {key: value for key, value in data.items() if key not in known} or None
+
+
+@dataclass(slots=True)
+class FormField:
+    """One entry of form_structure['fields'], with its label normalised once up front"""
+
+    label: str
+    type: str = "text"
+    required: bool = False
+    value: Any = ""
+    options: List[str] = field(default_factory=list)
+    frame: Optional[str] = None
+    # Keys this class doesn't model, kept so to_dict() gives back what from_dict() got
+    extra: Optional[Dict[str, Any]] = None
+    normalized_label: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.normalized_label = normalize_label(self.label)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FormField":
+        return cls(
+            label=data['label'],
+            type=data.get('type', 'text'),
+            required=data.get('required', False),
+            value=data.get('value', ''),
+            options=list(data.get('options', [])),
+            frame=data.get('frame'),
+            extra=_extra(data, FIELD_KEYS)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "label": self.label,
+            "type": self.type,
+            "required": self.required,
+            "value": self.value,
+            "options": list(self.options)
+        }
+        if self.frame is not None:
+            data["frame"] = self.frame
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
+class FillAction:
+    """One entry of form_structure['actions']: how to reach the field with the same index"""
+
+    type: str
+    target: str
+    value: Any = ""
+    selector: str = ""
+    frame: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FillAction":
+        return cls(
+            type=data.get('type', 'type'),
+            target=data.get('target', ''),
+            value=data.get('value', ''),
+            selector=data.get('selector', ''),
+            frame=data.get('frame'),
+            extra=_extra(data, ACTION_KEYS)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"type": self.type, "target": self.target, "value": self.value, "selector": self.selector}
+        if self.frame is not None:
+            data["frame"] = self.frame
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+class FieldIndex:
+    """
+    The fields of one form (and their actions, paired by position) keyed by label.
+
+    When a label repeats the first field wins, the same answer the old
+    next(f for f in fields if f['label'] == label) scans gave.
+    """
+
+    __slots__ = ("fields", "actions", "_by_label", "_matchers", "_canonical")
+
+    def __init__(self, fields: List[FormField], actions: Optional[List[FillAction]] = None):
+        self.fields = fields
+        self.actions = actions or []
+        self._by_label: Dict[str, int] = {}
+        for position, form_field in enumerate(fields):
+            self._by_label.setdefault(form_field.label, position)
+        self._matchers: Dict[bool, LabelMatcher] = {}
+        self._canonical: Optional[Dict[str, Optional[str]]] = None
+
+    @classmethod
+    def from_fields(cls, fields: List[Dict[str, Any]]) -> "FieldIndex":
+        return cls([FormField.from_dict(data) for data in fields])
+
+    @classmethod
+    def from_structure(cls, form_structure: Dict[str, Any]) -> "FieldIndex":
+        return cls(
+            [FormField.from_dict(data) for data in form_structure.get('fields', [])],
+            [FillAction.from_dict(data) for data in form_structure.get('actions', [])]
+        )
+
+    def to_structure(self) -> Dict[str, Any]:
+        return {
+            "fields": [form_field.to_dict() for form_field in self.fields],
+            "actions": [action.to_dict() for action in self.actions]
+        }
+
+    def get(self, label: str) -> Optional[FormField]:
+        position = self._by_label.get(label)
+        return self.fields[position] if position is not None else None
+
+    def action_for(self, label: str) -> Optional[FillAction]:
+        position = self._by_label.get(label)
+        if position is None or position >= len(self.actions):
+            return None
+        return self.actions[position]
+
+    def candidates(self, unclassified_only: bool = False) -> List[Tuple[str, str]]:
+        """(label, normalised label) per distinct label, in form order"""
+        labels = [self.fields[position] for position in self._by_label.values()]
+        if unclassified_only:
+            labels = [form_field for form_field in labels if self.canonical_field(form_field.label) is None]
+        return [(form_field.label, form_field.normalized_label) for form_field in labels]
+
+    def label_matcher(self, unclassified_only: bool = False) -> LabelMatcher:
+        """Fuzzy lookup over candidates(), built on first use and kept with the index"""
+        if unclassified_only not in self._matchers:
+            self._matchers[unclassified_only] = LabelMatcher(self.candidates(unclassified_only))
+        return self._matchers[unclassified_only]
+
+    def canonical_field(self, label: str) -> Optional[str]:
+        """The taxonomy's canonical field for a label (e.g. "given_name"), or None"""
+        return self._classify().get(label)
+
+    def canonical_labels(self) -> Dict[str, str]:
+        """Canonical field -> label of the first field holding it, in form order"""
+        labels: Dict[str, str] = {}
+        for label, canonical in self._classify().items():
+            if canonical is not None:
+                labels.setdefault(canonical, label)
+        return labels
+
+    def _classify(self) -> Dict[str, Optional[str]]:
+        if self._canonical is None:
+            self._canonical = {}
+            for position in self._by_label.values():
+                form_field = self.fields[position]
+                extra = form_field.extra or {}
+                self._canonical[form_field.label] = classify_field(
+                    form_field.normalized_label, form_field.type, extra.get('autocomplete') or "", extra.get('name') or ""
+                )
+        return self._canonical
+
+    def required(self) -> List[FormField]:
+        return [form_field for form_field in self.fields if form_field.required]
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._by_label
+
+    def __iter__(self) -> Iterator[FormField]:
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
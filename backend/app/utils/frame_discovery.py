@@ -0,0 +1,53 @@
+from html import unescape
+from typing import List
+from urllib.parse import urljoin, urlparse
+import re
+
+
+# Applicant tracking systems that serve application forms inside embeddable iframes
+KNOWN_ATS_FRAME_HOSTS = [
+    "greenhouse.io", "lever.co", "myworkdayjobs.com", "myworkdaysite.com",
+    "ashbyhq.com", "smartrecruiters.com", "workable.com", "icims.com",
+    "jobvite.com", "bamboohr.com", "breezy.hr", "recruitee.com",
+    "applytojob.com", "taleo.net", "successfactors.com", "teamtailor.com",
+    "pinpointhq.com", "personio.de", "personio.com", "comeet.co"
+]
+
+IFRAME_SRC = re.compile(
+    r'''<iframe\b[^>]*?\ssrc\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>"']+))''',
+    re.I
+)
+
+
+def _host_matches(host: str, suffixes: List[str]) -> bool:
+    return any(host == suffix or host.endswith("." + suffix) for suffix in suffixes)
+
+
+def _on_page_host(frame_host: str, page_host: str) -> bool:
+    # The page's own host or a subdomain of it. Sibling hosts (careers.acme.com ->
+    # jobs.acme.com) aren't inferred: without a public suffix list, "same last two
+    # labels" would also tie evil.co.uk to victim.co.uk. Allowlist them with extra_hosts.
+    return bool(page_host) and _host_matches(frame_host, [page_host])
+
+
+class FrameDiscovery:
+    """Finds iframes worth fetching for form analysis without parsing the page"""
+
+    @staticmethod
+    def frame_urls(html: str, page_url: str, extra_hosts: List[str] = None) -> List[str]:
+        """Absolute same-host, known-ATS or allowlisted iframe URLs in document order, without duplicates"""
+        page_host = (urlparse(page_url).hostname or "").lower()
+        ats_hosts = KNOWN_ATS_FRAME_HOSTS + list(extra_hosts or [])
+        urls = []
+        for match in IFRAME_SRC.finditer(html):
+            src = unescape(next(group for group in match.groups() if group is not None)).strip()
+            if not src or src.startswith(("about:", "javascript:", "data:")):
+                continue
+            frame_url = urljoin(page_url, src)
+            parsed = urlparse(frame_url)
+            if parsed.scheme not in ("http", "https") or not parsed.hostname:
+                continue
+            frame_host = parsed.hostname.lower()
+            if (_on_page_host(frame_host, page_host) or _host_matches(frame_host, ats_hosts)) and frame_url not in urls:
+                urls.append(frame_url)
+        return urls
@@ -0,0 +1,103 @@
+from bisect import bisect_left
+from typing import Dict, List, Any, Optional
+from bs4 import BeautifulSoup, Tag
+
+
+CONTROL_TAGS = {'input', 'select', 'textarea'}
+SIBLING_LABEL_TAGS = {'label', 'span', 'div'}
+
+
+class LabelIndex:
+    """
+    One-pass index of a parsed document for label association.
+
+    A single pre-order walk records, for every form control, its document
+    position, nearest wrapping <label>, nearest preceding label/span/div
+    sibling and enclosing <form>s, plus the positions of every label[for].
+    Lookups then answer what find_previous / find_parent /
+    find_previous_sibling would, without rescanning the document per control.
+    """
+
+    def __init__(self, soup: BeautifulSoup):
+        self.forms: List[Tag] = []
+        self.controls_by_form: List[List[Tag]] = []
+        self.all_controls: List[Tag] = []
+        self._position: Dict[int, int] = {}
+        self._wrapping_label: Dict[int, Tag] = {}
+        self._previous_sibling: Dict[int, Tag] = {}
+        self._labels_for: Dict[str, List[int]] = {}
+        self._label_at: Dict[int, Tag] = {}
+        self._build(soup)
+
+    def _build(self, root: Tag):
+        position = 0
+        # (node, nearest wrapping label, indexes of enclosing forms, previous label/span/div sibling)
+        stack = [(child, None, (), None) for child in reversed(self._sibling_chain(root))]
+        while stack:
+            node, label, forms, previous = stack.pop()
+            position += 1
+            name = node.name
+
+            if name == 'form':
+                self.forms.append(node)
+                self.controls_by_form.append([])
+                forms = forms + (len(self.forms) - 1,)
+            elif name == 'label':
+                target = node.get('for')
+                if isinstance(target, str):
+                    self._labels_for.setdefault(target, []).append(position)
+                    self._label_at[position] = node
+            elif name in CONTROL_TAGS:
+                key = id(node)
+                self._position[key] = position
+                if label is not None:
+                    self._wrapping_label[key] = label
+                if previous is not None:
+                    self._previous_sibling[key] = previous
+                self.all_controls.append(node)
+                for form_index in forms:
+                    self.controls_by_form[form_index].append(node)
+
+            child_label = node if name == 'label' else label
+            children = self._sibling_chain(node)
+            entries = []
+            sibling = None
+            for child in children:
+                entries.append((child, child_label, forms, sibling))
+                if child.name in SIBLING_LABEL_TAGS:
+                    sibling = child
+            stack.extend(reversed(entries))
+
+    @staticmethod
+    def _sibling_chain(node: Tag) -> List[Tag]:
+        return [child for child in node.children if isinstance(child, Tag)]
+
+    def control_groups(self) -> List[List[Tag]]:
+        """Controls grouped per <form> in document order, or one group for the whole page"""
+        if self.forms:
+            return self.controls_by_form
+        return [self.all_controls]
+
+    def label_for(self, element: Tag, field_id: str) -> Optional[Tag]:
+        """Nearest label[for=field_id] that starts before the element, like find_previous"""
+        positions = self._labels_for.get(field_id)
+        position = self._position.get(id(element))
+        if not positions or position is None:
+            return None
+        index = bisect_left(positions, position)
+        if index == 0:
+            return None
+        return self._label_at[positions[index - 1]]
+
+    def wrapping_label(self, element: Tag) -> Optional[Tag]:
+        return self._wrapping_label.get(id(element))
+
+    def previous_sibling(self, element: Tag) -> Optional[Tag]:
+        return self._previous_sibling.get(id(element))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "forms": len(self.forms),
+            "controls": len(self.all_controls),
+            "labels_with_for": sum(len(positions) for positions in self._labels_for.values())
+        }
@@ -0,0 +1,146 @@
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+
+
+SEED_CANDIDATES = 4
+
+
+def _trigrams(text: str) -> set:
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _position_masks(text: str) -> Dict[str, int]:
+    masks: Dict[str, int] = defaultdict(int)
+    for position, char in enumerate(text):
+        masks[char] |= 1 << position
+    return masks
+
+
+def lcs_length(a: str, b_masks: Dict[str, int], b_length: int) -> int:
+    """Longest common subsequence of a and b, bit-parallel over b's positions (Hyyro 2004)"""
+    full = (1 << b_length) - 1
+    row = full
+    for char in a:
+        matches = row & b_masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & full
+    return b_length - row.bit_count()
+
+
+class _Candidate:
+    __slots__ = ("label", "text", "position", "counts", "_masks", "_matcher")
+
+    def __init__(self, label: str, text: str, position: int):
+        self.label = label
+        self.text = text
+        self.position = position
+        self.counts = dict(Counter(text))
+        self._masks: Optional[Dict[str, int]] = None
+        self._matcher: Optional[SequenceMatcher] = None
+
+    def shared_chars(self, target_chars: List[str], target_counts: List[int]) -> int:
+        """Size of the multiset intersection with the target's characters"""
+        return sum(map(min, target_counts, map(self.counts.get, target_chars, repeat(0))))
+
+    def lcs(self, target: str) -> int:
+        if self._masks is None:
+            self._masks = _position_masks(self.text)
+        return lcs_length(target, self._masks, len(self.text))
+
+    def ratio(self, target: str) -> float:
+        # SequenceMatcher caches its analysis of the second sequence, so each
+        # candidate is analysed once per form rather than once per profile key
+        if self._matcher is None:
+            self._matcher = SequenceMatcher(None, b=self.text)
+        self._matcher.set_seq1(target)
+        return self._matcher.ratio()
+
+
+class LabelMatcher:
+    """
+    FieldMatcher.find_best_normalized_match over one form's labels, without scoring every label.
+
+    Scores are still SequenceMatcher ratios with the same threshold and the
+    same winner (highest score, earliest label on ties); the index only
+    decides which labels can't win and skips them. A trigram inverted index
+    picks a few likely labels to score first, which sets the bar; the rest
+    are then ruled out by upper bounds on the ratio that get tighter and
+    dearer in turn: label length, shared characters, then the longest
+    common subsequence (the indel similarity, computed bit-parallel).
+    SequenceMatcher only runs on labels that clear all three.
+    """
+
+    def __init__(self, candidates: List[Tuple[str, str]]):
+        self._candidates: List[_Candidate] = []
+        self._by_length: Dict[int, List[_Candidate]] = defaultdict(list)
+        self._by_trigram: Dict[str, List[int]] = defaultdict(list)
+        seen = set()
+        for label, label_norm in candidates:
+            text = label_norm.lower()
+            # A later label with the same text can only tie, and ties go to the earlier one
+            if text in seen:
+                continue
+            seen.add(text)
+            candidate = _Candidate(label, text, len(self._candidates))
+            self._candidates.append(candidate)
+            self._by_length[len(text)].append(candidate)
+            for gram in _trigrams(text):
+                self._by_trigram[gram].append(candidate.position)
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+    def best_match(self, target_norm: str, threshold: float = 0.6) -> Optional[str]:
+        target = target_norm.lower()
+        target_length = len(target)
+        best: Optional[_Candidate] = None
+        best_score = 0.0
+
+        def consider(candidate: _Candidate, score: float):
+            nonlocal best, best_score
+            if score < threshold or score <= 0.0:
+                return
+            if score > best_score or (score == best_score and candidate.position < best.position):
+                best, best_score = candidate, score
+
+        scored = set()
+        for candidate in self._seeds(target):
+            consider(candidate, candidate.ratio(target))
+            scored.add(candidate.position)
+
+        target_chars, target_counts = zip(*Counter(target).items()) if target else ((), ())
+        for length, bucket in self._by_length.items():
+            total = target_length + length
+            if total == 0:
+                # Two empty strings: SequenceMatcher calls that a perfect match
+                for candidate in bucket:
+                    consider(candidate, 1.0)
+                continue
+            if not self._may_win(2.0 * min(target_length, length) / total, threshold, best_score):
+                continue
+            for candidate in bucket:
+                if candidate.position in scored:
+                    continue
+                shared = candidate.shared_chars(target_chars, target_counts)
+                if not self._may_win(2.0 * shared / total, threshold, best_score):
+                    continue
+                common = candidate.lcs(target)
+                if not self._may_win(2.0 * common / total, threshold, best_score):
+                    continue
+                consider(candidate, candidate.ratio(target))
+
+        return best.label if best is not None else None
+
+    @staticmethod
+    def _may_win(bound: float, threshold: float, best_score: float) -> bool:
+        return bound > 0.0 and bound >= threshold and bound >= best_score
+
+    def _seeds(self, target: str) -> List[_Candidate]:
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in _trigrams(target):
+            for position in self._by_trigram.get(gram, ()):
+                shared[position] += 1
+        ranked = sorted(shared.items(), key=lambda item: (-item[1], item[0]))[:SEED_CANDIDATES]
+        return [self._candidates[position] for position, _ in ranked]
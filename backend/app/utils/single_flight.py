@@ -0,0 +1,58 @@
+from typing import Awaitable, Callable, Dict, Any, Hashable
+import asyncio
+import copy
+
+
+_groups: Dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key onto one in-flight task.
+
+    The first caller for a key starts the work; callers arriving while it runs
+    await the same task instead of repeating it. The work runs as its own task,
+    so a caller that disconnects doesn't cancel it for the others. Followers
+    get a deep copy of the result, so nobody can mutate someone else's answer.
+    Nothing is cached once the task finishes.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        _groups[name] = self
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+            result = await asyncio.shield(task)
+            return copy.deepcopy(result)
+
+        self.leaders += 1
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.coalesced
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesce_rate": round(self.coalesced / calls, 3) if calls else 0.0,
+            "in_flight": len(self._calls)
+        }
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: group.stats() for name, group in _groups.items()}
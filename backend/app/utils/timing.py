@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+import threading
+import time
+
+
+# Upper bounds (ms) of the latency histogram buckets; anything slower lands in "inf"
+HISTOGRAM_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+
+class PhaseTimer:
+    """
+    Accumulates wall time per named phase for one fill.
+
+    Spans with the same name add up, so per-field phases ("field_lookup",
+    "field_action") report their total and how many times they ran.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def span(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started) * 1000)
+
+    def add(self, name: str, elapsed_ms: float):
+        phase = self.phases.setdefault(name, {"ms": 0.0, "count": 0, "max_ms": 0.0})
+        phase["ms"] += elapsed_ms
+        phase["count"] += 1
+        phase["max_ms"] = max(phase["max_ms"], elapsed_ms)
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact breakdown for result payloads: total, per-phase ms and counts, counters"""
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000),
+            "phases": {name: round(phase["ms"]) for name, phase in self.phases.items()},
+            "counts": {name: phase["count"] for name, phase in self.phases.items() if phase["count"] > 1},
+            "counters": dict(self.counters)
+        }
+
+
+class TimingHistograms:
+    """Per-domain latency histograms of fill phases, for /api/metrics"""
+
+    def __init__(self, max_domains: int = 200):
+        self.max_domains = max_domains
+        self._domains: "OrderedDict[str, Dict[str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(elapsed_ms: float) -> str:
+        for bound in HISTOGRAM_BUCKETS_MS:
+            if elapsed_ms <= bound:
+                return f"le_{bound}"
+        return "inf"
+
+    def record(self, domain: str, summary: Dict[str, Any]):
+        """Fold one PhaseTimer.summary() into the domain's histograms"""
+        samples = dict(summary.get("phases", {}))
+        samples["total"] = summary.get("total_ms", 0)
+        with self._lock:
+            phases = self._domains.pop(domain, None) or {}
+            # Least recently recorded domains fall off first
+            self._domains[domain] = phases
+            while len(self._domains) > self.max_domains:
+                self._domains.popitem(last=False)
+            for name, elapsed_ms in samples.items():
+                histogram = phases.setdefault(name, {"count": 0, "sum_ms": 0, "max_ms": 0, "buckets": {}})
+                histogram["count"] += 1
+                histogram["sum_ms"] += elapsed_ms
+                histogram["max_ms"] = max(histogram["max_ms"], elapsed_ms)
+                bucket = self._bucket(elapsed_ms)
+                histogram["buckets"][bucket] = histogram["buckets"].get(bucket, 0) + 1
+
+    def stats(self, domain: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            domains = {domain: self._domains[domain]} if domain in self._domains else (
+                {} if domain else dict(self._domains)
+            )
+            return {
+                name: {
+                    phase: {
+                        "count": histogram["count"],
+                        "avg_ms": round(histogram["sum_ms"] / histogram["count"]),
+                        "max_ms": histogram["max_ms"],
+                        "buckets": dict(histogram["buckets"])
+                    }
+                    for phase, histogram in phases.items()
+                }
+                for name, phases in domains.items()
+            }
+
+
+fill_timings = TimingHistograms()
@@ -0,0 +1,70 @@
+"""
+CPU cost of form extraction on large pages: per-control scans vs the one-pass LabelIndex.
+
+Run from backend/:
+    python -m benchmarks.bench_label_association [--sizes 100 500 2000] [--repeat 3]
+"""
+import argparse
+import time
+from bs4 import BeautifulSoup
+from app.services.html_parser_service import HTMLParserService
+
+
+def synthetic_page(inputs: int) -> str:
+    """A long career page: filler content, then a form mixing every label style"""
+    filler = "".join(f"<section><h2>Team {i}</h2><p>{'Lorem ipsum dolor sit amet. ' * 8}</p></section>" for i in range(200))
+    rows = []
+    for i in range(inputs):
+        style = i % 3
+        if style == 0:
+            rows.append(f'<div class="field"><label for="q{i}">Question {i}</label><input id="q{i}" name="q{i}"></div>')
+        elif style == 1:
+            rows.append(f'<div class="field"><label>Answer {i} <input name="a{i}" type="text"></label></div>')
+        else:
+            # An id with no label[for] makes find_previous walk back to the top of the page
+            rows.append(f'<div class="field"><span>Choice {i}</span><select id="c{i}" name="c{i}"><option value="1">One</option></select></div>')
+    return f"<html><body>{filler}<form>{''.join(rows)}</form></body></html>"
+
+
+def legacy_parse(parser: HTMLParserService, html: str):
+    """The previous extraction: find_all per form and per-control find_previous/find_parent scans"""
+    soup = BeautifulSoup(html, 'lxml')
+    forms = soup.find_all('form') or [soup]
+    fields = []
+    for form in forms:
+        for inp in form.find_all(['input', 'select', 'textarea']):
+            info = parser._extract_field_info(inp)
+            if info:
+                fields.append(info['field'])
+    return fields
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    parser = HTMLParserService()
+    print(f"{'inputs':>8} {'legacy ms':>12} {'indexed ms':>12} {'speedup':>9}")
+    for size in args.sizes:
+        html = synthetic_page(size)
+        indexed = parser._parse_form_fields(html)['fields']
+        assert indexed == legacy_parse(parser, html), "indexed extraction diverged from the legacy scan"
+
+        legacy_ms = best_of(args.repeat, lambda: legacy_parse(parser, html))
+        indexed_ms = best_of(args.repeat, lambda: parser._parse_form_fields(html))
+        print(f"{size:>8} {legacy_ms:>12.1f} {indexed_ms:>12.1f} {legacy_ms / indexed_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Time and peak Python memory of form extraction: BeautifulSoup tree vs lxml event stream.
+
+Run from backend/:
+    python -m benchmarks.bench_stream_extractor [--sizes 100 500 2000] [--script-kb 2048] [--repeat 3]
+"""
+import argparse
+import tracemalloc
+from app.services.html_parser_service import HTMLParserService
+from benchmarks.bench_label_association import best_of, synthetic_page
+
+
+def script_heavy_page(inputs: int, script_kb: int) -> str:
+    """A job board page: megabytes of inline bundles around the form"""
+    entry = '{"k": "' + "x" * 1000 + '"},'
+    bundle = "<script>window.__STATE__ = [" + entry * script_kb + "];</script>"
+    return synthetic_page(inputs).replace("<body>", "<body>" + bundle, 1)
+
+
+def peak_kb(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    arg_parser.add_argument("--script-kb", type=int, default=2048)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    soup = HTMLParserService(extractor="soup")
+    stream = HTMLParserService(extractor="stream")
+    print(f"{'inputs':>8} {'page KB':>9} {'soup ms':>9} {'stream ms':>10} {'soup peak KB':>13} {'stream peak KB':>15}")
+    for size in args.sizes:
+        html = script_heavy_page(size, args.script_kb)
+        assert stream._parse_form_fields(html) == soup._parse_form_fields(html), "stream extraction diverged from soup"
+
+        soup_ms = best_of(args.repeat, lambda: soup._parse_form_fields(html))
+        stream_ms = best_of(args.repeat, lambda: stream._parse_form_fields(html))
+        soup_peak = peak_kb(lambda: soup._parse_form_fields(html))
+        stream_peak = peak_kb(lambda: stream._parse_form_fields(html))
+        print(
+            f"{size:>8} {len(html) // 1024:>9} {soup_ms:>9.1f} {stream_ms:>10.1f} "
+            f"{soup_peak:>13.0f} {stream_peak:>15.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Throughput and peak memory of form parsing, matching, validation and preview over a page corpus.
+
+The corpus is the saved career pages in benchmarks/corpus (Greenhouse, Lever,
+Workday and plain-form markup) plus synthetic pages of 10, 100 and 1000
+inputs. Every page is put through:
+
+    parse          HTMLParserService._parse_form_fields (no structure cache)
+    parse_cached   HTMLParserService.parse_form_fields against a warm cache
+    match          FieldMatcher.match_form_data_to_fields
+    assign         FieldMatcher.assign_form_data_to_fields (one-to-one mode)
+    validate       FieldValidator.validate_form_data
+    preview        SafetyService.preview_actions with the parsed structure
+
+Run from backend/:
+    python -m benchmarks.suite [--out results.json] [--repeat 5]
+    python -m benchmarks.suite --save-baseline
+    python -m benchmarks.suite --compare benchmarks/baseline.json [--tolerance 0.25]
+
+--compare exits with status 1 when any case is slower or uses more peak
+memory than the baseline by more than the tolerance, or when a baseline case
+produced no result. Timings only compare
+meaningfully against a baseline recorded on the same machine.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+from app.services.form_structure_cache_service import FormStructureCacheService
+from app.services.html_parser_service import HTMLParserService
+from app.services.safety_service import SafetyService
+from app.utils.field_matcher import FieldMatcher
+from app.utils.field_validator import FieldValidator
+from app.utils.form_types import FieldIndex
+
+
+BENCH_DIR = Path(__file__).parent
+CORPUS_DIR = BENCH_DIR / "corpus"
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+SYNTHETIC_SIZES = (10, 100, 1000)
+
+# What ProfileService.profile_to_form_data produces for a filled-in profile
+SAMPLE_FORM_DATA = {
+    "First Name": "Jordan",
+    "Last Name": "Rivera",
+    "Full Name": "Jordan Rivera",
+    "Name": "Jordan Rivera",
+    "Preferred First Name": "Jo",
+    "Email": "jordan.rivera@example.com",
+    "Email Address": "jordan.rivera@example.com",
+    "Phone": "+1 (415) 555-0134",
+    "Phone Number": "+1 (415) 555-0134",
+    "Mobile": "+1 (415) 555-0134",
+    "Location": "San Francisco, CA",
+    "City": "San Francisco",
+    "Address": "500 Howard St",
+    "State": "CA",
+    "Zip": "94105",
+    "Zip Code": "94105",
+    "Country": "United States",
+    "LinkedIn": "https://www.linkedin.com/in/jordanrivera",
+    "Website": "https://jordanrivera.dev",
+    "GitHub": "https://github.com/jordanrivera",
+    "Current Company": "Initech",
+    "Years of Experience": "7",
+}
+
+SYNTHETIC_LABELS = [
+    "First Name", "Last Name", "Email", "Phone Number", "City", "State",
+    "Zip Code", "Country", "LinkedIn Profile", "Website", "Current Company",
+]
+
+
+def synthetic_page(inputs: int) -> str:
+    """A career page form with `inputs` controls: common profile labels first, then custom questions"""
+    rows = []
+    for i in range(inputs):
+        label = SYNTHETIC_LABELS[i] if i < len(SYNTHETIC_LABELS) else f"Custom question {i}"
+        if i % 5 == 4:
+            control = f'<select id="f{i}" name="f{i}"><option value="">Select</option><option>Yes</option><option>No</option></select>'
+        elif i % 7 == 6:
+            control = f'<textarea id="f{i}" name="f{i}"></textarea>'
+        else:
+            control = f'<input type="text" id="f{i}" name="f{i}"{" required" if i % 3 == 0 else ""}>'
+        rows.append(f'<div class="field"><label for="f{i}">{label}</label>{control}</div>')
+    return f"<html><body><h1>Apply</h1><form method=\"post\">{''.join(rows)}</form></body></html>"
+
+
+def load_corpus() -> Dict[str, str]:
+    """Page name -> HTML, saved pages first, then the synthetic sizes"""
+    pages = {path.stem: path.read_text(encoding="utf-8") for path in sorted(CORPUS_DIR.glob("*.html"))}
+    for size in SYNTHETIC_SIZES:
+        pages[f"synthetic_{size}"] = synthetic_page(size)
+    return pages
+
+
+def ops_per_sec(fn: Callable[[], Any], repeat: int) -> float:
+    """Best of `repeat` rounds, each long enough (>= 0.2s) to swamp timer noise"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return number / min(timer.repeat(repeat=repeat, number=number))
+
+
+def peak_kb(fn: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def page_cases(html: str, loop: asyncio.AbstractEventLoop) -> Tuple[Dict[str, Callable[[], Any]], int]:
+    """The timed operations for one page, and how many fields it parses to"""
+    parser = HTMLParserService(structure_cache=FormStructureCacheService())
+    form_structure = parser._parse_form_fields(html)
+    parser.parse_form_fields(html)
+    fields = FieldIndex.from_structure(form_structure)
+    matched = FieldMatcher.match_form_data_to_fields(SAMPLE_FORM_DATA, fields, mode="greedy")
+    safety = SafetyService()
+
+    cases = {
+        "parse": lambda: parser._parse_form_fields(html),
+        "parse_cached": lambda: parser.parse_form_fields(html),
+        "match": lambda: FieldMatcher.match_form_data_to_fields(SAMPLE_FORM_DATA, fields, mode="greedy"),
+        "assign": lambda: FieldMatcher.assign_form_data_to_fields(SAMPLE_FORM_DATA, fields),
+        "validate": lambda: FieldValidator.validate_form_data(matched, fields),
+        "preview": lambda: loop.run_until_complete(
+            safety.preview_actions("https://example.com/apply", SAMPLE_FORM_DATA, form_structure)
+        ),
+    }
+    return cases, len(form_structure["fields"])
+
+
+def run_suite(repeat: int = 5, pages: Dict[str, str] = None) -> Dict[str, Any]:
+    pages = pages if pages is not None else load_corpus()
+    results = {}
+    loop = asyncio.new_event_loop()
+    try:
+        for page, html in pages.items():
+            cases, field_count = page_cases(html, loop)
+            for case, fn in cases.items():
+                results[f"{page}/{case}"] = {
+                    "fields": field_count,
+                    "ops_per_sec": round(ops_per_sec(fn, repeat), 2),
+                    "peak_kb": round(peak_kb(fn), 1),
+                }
+    finally:
+        loop.close()
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(), "repeat": repeat},
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """One message per case that got slower or hungrier than the baseline allows, or went missing"""
+    regressions = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None:
+            # A renamed, dropped or crashed case must not pass silently
+            regressions.append(f"{name}: missing from the current results")
+            continue
+        if now["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {now['ops_per_sec']:.1f}/s vs baseline {base['ops_per_sec']:.1f}/s"
+            )
+        if now["peak_kb"] > base["peak_kb"] * (1 + tolerance):
+            regressions.append(f"{name}: peak memory {now['peak_kb']:.0f} KB vs baseline {base['peak_kb']:.0f} KB")
+    return regressions
+
+
+def print_results(current: Dict[str, Any], baseline: Dict[str, Any] = None):
+    print(f"{'case':<28} {'fields':>7} {'ops/sec':>12} {'peak KB':>10} {'vs base':>8}")
+    for name, result in current["results"].items():
+        base = (baseline or {}).get("results", {}).get(name)
+        change = f"{result['ops_per_sec'] / base['ops_per_sec']:>7.2f}x" if base else ""
+        print(f"{name:<28} {result['fields']:>7} {result['ops_per_sec']:>12.1f} {result['peak_kb']:>10.1f} {change:>8}")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--out", type=Path, help="write the results as JSON")
+    arg_parser.add_argument("--save-baseline", action="store_true", help=f"write the results to {BASELINE_PATH.name}")
+    arg_parser.add_argument("--compare", type=Path, help="baseline JSON to check the results against")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25, help="allowed fractional regression")
+    args = arg_parser.parse_args()
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    current = run_suite(args.repeat)
+    print_results(current, baseline)
+
+    for path in filter(None, [args.out, BASELINE_PATH if args.save_baseline else None]):
+        path.write_text(json.dumps(current, indent=2) + "\n")
+
+    if baseline is None:
+        return 0
+    regressions = compare(current, baseline, args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,6 +29,14 @@ async def migrate_database():
             print("Adding quick_apply_data column...")
             cursor.execute("ALTER TABLE profiles ADD COLUMN quick_apply_data JSON")
         
+        if 'form_data_cache' not in columns:
+            print("Adding form_data_cache column...")
+            cursor.execute("ALTER TABLE profiles ADD COLUMN form_data_cache JSON")
+        
+        if 'form_data_version' not in columns:
+            print("Adding form_data_version column...")
+            cursor.execute("ALTER TABLE profiles ADD COLUMN form_data_version INTEGER NOT NULL DEFAULT 0")
+        
         conn.commit()
         print("✅ Database migration completed successfully!")
         
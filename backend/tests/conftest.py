@@ -41,3 +41,20 @@ async def test_db():
         yield session
     
     await engine.dispose()
+
+
+@pytest.fixture
+async def live_page():
+    """A blank headless Chromium page for running in-page scripts; skipped when no browser is installed"""
+    from playwright.async_api import async_playwright, Error as PlaywrightError
+
+    playwright = await async_playwright().start()
+    try:
+        browser = await playwright.chromium.launch()
+    except PlaywrightError as e:
+        await playwright.stop()
+        pytest.skip(f"Chromium is not available: {str(e).splitlines()[0]}")
+    page = await browser.new_page()
+    yield page
+    await browser.close()
+    await playwright.stop()
@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from urllib.parse import urlparse
+from app.services.batch_fill_service import BatchFillService
+
+
+class FakePipeline:
+    def __init__(self, fail_urls=()):
+        self.fail_urls = set(fail_urls)
+        self.running_per_host = {}
+        self.max_per_host = {}
+        self.running = 0
+        self.max_running = 0
+
+    async def run(self, url, form_data, **kwargs):
+        host = urlparse(url).netloc
+        self.running += 1
+        self.running_per_host[host] = self.running_per_host.get(host, 0) + 1
+        self.max_running = max(self.max_running, self.running)
+        self.max_per_host[host] = max(self.max_per_host.get(host, 0), self.running_per_host[host])
+        try:
+            await asyncio.sleep(0.01)
+            if url in self.fail_urls:
+                raise Exception("navigation failed")
+            assert kwargs["headless"] is True
+            assert kwargs["keep_open"] is False
+            return {"success": True, "filled_count": len(form_data)}
+        finally:
+            self.running -= 1
+            self.running_per_host[host] -= 1
+
+
+class FakePool:
+    def __init__(self, max_concurrency):
+        self.max_concurrency = max_concurrency
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_parallelism_and_host_limit():
+    """Test fan-out is bounded globally and per host"""
+    pipeline = FakePipeline()
+    service = BatchFillService(parallelism=3, per_host_limit=1, pipeline=pipeline, pool=FakePool(3))
+    urls = [f"https://boards.greenhouse.io/acme/jobs/{i}" for i in range(3)]
+    urls += [f"https://jobs.lever.co/acme/{i}" for i in range(3)]
+
+    batch = await service.fill_all(urls, {"Email": "a@b.com"})
+
+    assert [r["url"] for r in batch["results"]] == urls
+    assert pipeline.max_running <= 3
+    assert all(count == 1 for count in pipeline.max_per_host.values())
+    assert batch["summary"]["succeeded"] == 6
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_failures_per_url():
+    """Test one failing URL does not fail the whole batch"""
+    bad = "https://example.com/broken"
+    service = BatchFillService(parallelism=2, per_host_limit=2, pipeline=FakePipeline(fail_urls=[bad]), pool=FakePool(3))
+
+    batch = await service.fill_all([bad, "https://example.com/ok"], {"Email": "a@b.com"})
+
+    by_url = {r["url"]: r for r in batch["results"]}
+    assert by_url[bad]["success"] is False
+    assert "navigation failed" in by_url[bad]["error"]
+    assert by_url["https://example.com/ok"]["success"] is True
+    assert batch["summary"]["failed"] == 1
+    assert batch["summary"]["wall_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_parallelism_is_capped_at_the_browser_pool_size():
+    """Test a batch never runs more fills than the pool has headless contexts"""
+    pipeline = FakePipeline()
+    service = BatchFillService(parallelism=8, per_host_limit=8, pipeline=pipeline, pool=FakePool(2))
+
+    batch = await service.fill_all([f"https://example.com/{i}" for i in range(6)], {"Email": "a@b.com"})
+
+    assert pipeline.max_running <= 2
+    assert batch["summary"]["parallelism"] == 2
+    assert BatchFillService(pipeline=pipeline, pool=FakePool(2)).parallelism == 2
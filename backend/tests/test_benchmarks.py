@@ -0,0 +1,33 @@
+from app.services.html_parser_service import HTMLParserService
+from benchmarks.suite import compare, load_corpus
+
+
+def test_corpus_pages_all_parse_to_fields():
+    """Test every saved and synthetic benchmark page yields form fields"""
+    parser = HTMLParserService()
+    pages = load_corpus()
+
+    assert {"greenhouse", "lever", "workday", "plain", "synthetic_1000"} <= set(pages)
+    for name, html in pages.items():
+        assert parser._parse_form_fields(html)['fields'], name
+    assert len(parser._parse_form_fields(pages["synthetic_100"])['fields']) == 100
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    """Test compare reports slower, hungrier and missing cases and ignores noise and new cases"""
+    baseline = {"results": {
+        "plain/parse": {"fields": 9, "ops_per_sec": 100.0, "peak_kb": 50.0},
+        "plain/match": {"fields": 9, "ops_per_sec": 100.0, "peak_kb": 50.0},
+        "lever/parse": {"fields": 17, "ops_per_sec": 100.0, "peak_kb": 50.0},
+    }}
+    current = {"results": {
+        "plain/parse": {"fields": 9, "ops_per_sec": 90.0, "peak_kb": 55.0},
+        "plain/match": {"fields": 9, "ops_per_sec": 60.0, "peak_kb": 80.0},
+        "plain/validate": {"fields": 9, "ops_per_sec": 1.0, "peak_kb": 999.0},
+    }}
+
+    regressions = compare(current, baseline, tolerance=0.25)
+
+    assert len(regressions) == 3
+    assert sum(message.startswith("plain/match:") for message in regressions) == 2
+    assert "lever/parse: missing from the current results" in regressions
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+from app.services.browser_pool import BrowserPool, BrowserPoolTimeout
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self, **kwargs):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = []
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def make_pool(**kwargs) -> BrowserPool:
+    pool = BrowserPool(**kwargs)
+    browser = FakeBrowser()
+
+    async def get_browser(headless=True):
+        return browser
+
+    pool.get_browser = get_browser
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_contexts_are_closed_on_release_and_never_reused():
+    """Test every lease gets a new context, so no storage carries over between requests"""
+    pool = make_pool(max_concurrency=2)
+
+    async with pool.lease() as first:
+        pass
+    async with pool.lease() as second:
+        pass
+    assert first is not second
+    assert first.closed and second.closed
+    assert pool.stats()["leased"] == 0
+    assert pool.stats()["contexts_created"] == 2
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_is_enforced():
+    """Test acquiring beyond max concurrency times out"""
+    pool = make_pool(max_concurrency=1, acquire_timeout=0.05)
+
+    context = await pool.acquire()
+    with pytest.raises(BrowserPoolTimeout):
+        await pool.acquire()
+
+    await pool.release(context)
+    again = await asyncio.wait_for(pool.acquire(), timeout=1)
+    assert again is not context
+    await pool.release(again)
+
+
+@pytest.mark.asyncio
+async def test_headed_leases_do_not_take_headless_slots():
+    """Test windows held open by interactive fills have their own limit"""
+    pool = make_pool(max_concurrency=1, max_headed=1, acquire_timeout=0.05)
+
+    headed = await pool.acquire(headless=False)
+    with pytest.raises(BrowserPoolTimeout):
+        await pool.acquire(headless=False)
+
+    headless = await asyncio.wait_for(pool.acquire(headless=True), timeout=1)
+    assert pool.stats()["leased"] == 1
+    assert pool.stats()["leased_headed"] == 1
+    await pool.release(headless)
+    await pool.release(headed)
+
+
+@pytest.mark.asyncio
+async def test_release_is_idempotent():
+    """Test releasing the same context twice frees only one slot"""
+    pool = make_pool(max_concurrency=1, acquire_timeout=0.05)
+
+    context = await pool.acquire()
+    await pool.release(context)
+    await pool.release(context)
+
+    await pool.acquire()
+    with pytest.raises(BrowserPoolTimeout):
+        await pool.acquire()
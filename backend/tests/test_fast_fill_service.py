@@ -0,0 +1,174 @@
+import pytest
+from app.services.automation_service import AutomationService
+from app.services.fast_fill_service import FastFillService
+from app.services.fill_pipeline_service import FillPipelineService
+
+
+class FakePage:
+    """Stands in for the in-page script: answers each item from a selector -> status table"""
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.evaluate_calls = 0
+        self.url = "https://boards.greenhouse.io/acme/jobs/1"
+
+    async def evaluate(self, script, items):
+        self.evaluate_calls += 1
+        return [
+            {"label": item["label"], **self.statuses.get(item["selector"], {"status": "not_found"})}
+            for item in items
+        ]
+
+
+def make_service(resolved):
+    service = AutomationService()
+
+    async def no_wait(page):
+        return None
+
+    async def resolve(page, labels, fill_plan=None):
+        return {label: resolved.get(label) for label in labels}, None
+
+    service._ensure_page_fully_loaded = no_wait
+    service._resolve_labels = resolve
+    return service
+
+
+@pytest.mark.asyncio
+async def test_fast_fill_writes_all_fields_in_one_call():
+    """Test fast mode fills every resolved field with a single evaluate"""
+    page = FakePage({
+        "#first_name": {"status": "filled", "tag": "input", "type": "text"},
+        "#country": {"status": "selected", "tag": "select", "type": ""},
+        "#sponsor": {"status": "disabled", "tag": "input", "type": "text"},
+    })
+    service = make_service({
+        "First Name": {"selector": "#first_name", "strategy": "exact"},
+        "Country": {"selector": "#country", "strategy": "exact"},
+        "Sponsorship": {"selector": "#sponsor", "strategy": "exact"},
+    })
+    events = []
+
+    async def on_progress(event):
+        events.append(event)
+
+    result = await service.fill_form_with_page(
+        page,
+        {"First Name": "Ada", "Country": "USA", "Sponsorship": "No", "Fax": "123", "Empty": ""},
+        progress_callback=on_progress,
+        mode="fast"
+    )
+
+    assert page.evaluate_calls == 1
+    assert result["fill_mode"] == "fast"
+    assert result["filled_count"] == 2
+    assert "Filled First Name with 'Ada'" in result["executed_actions"]
+    assert "Selected 'USA' in Country" in result["executed_actions"]
+    assert "Field 'Sponsorship' is disabled" in result["errors"]
+    assert "Field not found: Fax" in result["errors"]
+    assert [event["status"] for event in events] == ["filled", "filled", "error", "error"]
+
+
+@pytest.mark.asyncio
+async def test_apply_reports_script_failure_per_field():
+    """Test a failed evaluate turns into an error entry for every item"""
+    class BrokenPage:
+        async def evaluate(self, script, items):
+            raise RuntimeError("Execution context was destroyed")
+
+    statuses = await FastFillService().apply(BrokenPage(), [{"label": "Email", "selector": "#email", "value": "a@b.c"}])
+
+    assert statuses == [{"label": "Email", "status": "error", "detail": "Execution context was destroyed"}]
+
+
+def test_auto_mode_is_fast_only_when_headless():
+    """Test auto picks the one-script fill for headless runs and keeps headed fills interactive"""
+    assert FillPipelineService.resolve_fill_mode(headless=True, fill_mode="auto") == "fast"
+    assert FillPipelineService.resolve_fill_mode(headless=False, fill_mode="auto") == "interactive"
+    assert FillPipelineService.resolve_fill_mode(headless=False, fill_mode="fast") == "fast"
+
+
+@pytest.mark.asyncio
+async def test_radio_answer_without_a_matching_option_is_an_error():
+    """Test a radio group with no option for the answer is reported instead of clicking the resolved radio"""
+    page = FakePage({
+        "#sponsor_yes": {"status": "no_option", "tag": "input", "type": "radio"},
+        "#remote_no": {"status": "checked", "tag": "input", "type": "radio"},
+    })
+    service = make_service({
+        "Sponsorship": {"selector": "#sponsor_yes", "strategy": "exact"},
+        "Remote": {"selector": "#remote_no", "strategy": "exact"},
+    })
+
+    result = await service.fill_form_with_page(page, {"Sponsorship": "Maybe", "Remote": "No"}, mode="fast")
+
+    assert result["errors"] == ["Could not select 'Maybe' in Sponsorship: no matching option"]
+    assert result["executed_actions"] == ["Selected radio Remote"]
+
+
+
+@pytest.mark.asyncio
+async def test_settled_page_skips_the_readiness_wait():
+    """Test a caller that already waited for readiness does not pay for a second wait"""
+    page = FakePage({"#email": {"status": "filled", "tag": "input", "type": "email"}})
+    service = make_service({"Email": {"selector": "#email", "strategy": "exact"}})
+    waits = []
+
+    async def wait(page):
+        waits.append(page)
+
+    service._ensure_page_fully_loaded = wait
+
+    await service.fill_form_with_page(page, {"Email": "a@b.c"}, mode="fast", settled=True)
+    assert waits == []
+    assert "load_wait" not in service.timer.summary()
+
+    await service.fill_form_with_page(page, {"Email": "a@b.c"}, mode="fast")
+    assert waits == [page]
+
+
+@pytest.mark.asyncio
+async def test_value_the_browser_rejects_is_an_error():
+    """Test a value the input dropped (e.g. an unparseable date) is not counted as filled"""
+    page = FakePage({
+        "#start": {"status": "error", "tag": "input", "type": "date", "detail": "value rejected by the date field"},
+    })
+    service = make_service({"Start Date": {"selector": "#start", "strategy": "exact"}})
+
+    result = await service.fill_form_with_page(page, {"Start Date": "next month"}, mode="fast")
+
+    assert result["filled_count"] == 0
+    assert result["errors"] == ["Error filling Start Date: value rejected by the date field"]
+
+
+@pytest.mark.integration
+async def test_fast_fill_script_on_a_real_page(live_page):
+    """Test FAST_FILL_SCRIPT in Chromium: values, options and radios land, and rejected values are errors"""
+    await live_page.set_content("""
+        <form>
+          <input id="name" type="text">
+          <input id="start" type="date">
+          <select id="country"><option value="">--</option><option value="ca">Canada</option></select>
+          <label><input type="radio" name="sponsor" value="y" id="sponsor_yes"> Yes</label>
+          <label><input type="radio" name="sponsor" value="n"> No</label>
+          <input id="locked" disabled>
+        </form>
+    """)
+    items = [
+        {"label": "Name", "selector": "#name", "value": "Ada Lovelace"},
+        {"label": "Start", "selector": "#start", "value": "next month"},
+        {"label": "Country", "selector": "#country", "value": "Canada"},
+        {"label": "Sponsorship", "selector": "#sponsor_yes", "value": "No"},
+        {"label": "Locked", "selector": "#locked", "value": "x"},
+        {"label": "Fax", "selector": "#fax", "value": "1"},
+    ]
+
+    statuses = {s["label"]: s["status"] for s in await FastFillService().apply(live_page, items)}
+
+    assert statuses == {
+        "Name": "filled", "Start": "error", "Country": "selected",
+        "Sponsorship": "checked", "Locked": "disabled", "Fax": "not_found"
+    }
+    assert await live_page.input_value("#name") == "Ada Lovelace"
+    assert await live_page.input_value("#country") == "ca"
+    assert await live_page.evaluate("() => document.querySelector('input[name=sponsor]:checked').value") == "n"
@@ -0,0 +1,77 @@
+import itertools
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from app.config import Settings
+from app.utils.field_assignment import similarity_matrix, solve_assignment
+from app.utils.field_matcher import FieldMatcher
+
+
+def best_total(scores: np.ndarray) -> float:
+    rows, columns = scores.shape
+    if rows > columns:
+        return best_total(scores.T)
+    return max(sum(scores[row, column] for row, column in enumerate(choice)) for choice in itertools.permutations(range(columns), rows))
+
+
+def test_solve_assignment_is_optimal_and_one_to_one():
+    """Test the Hungarian solver matches brute force on small rectangular matrices"""
+    rng = np.random.default_rng(23)
+    for _ in range(200):
+        shape = tuple(rng.integers(1, 6, size=2))
+        scores = rng.random(shape).round(2) * (rng.random(shape) > 0.3)
+        pairs = solve_assignment(scores)
+
+        assert len(pairs) == min(shape)
+        assert len({row for row, _ in pairs}) == len({column for _, column in pairs}) == len(pairs)
+        assert abs(sum(scores[row, column] for row, column in pairs) - best_total(scores)) < 1e-9
+
+
+def test_similarity_matrix_is_trigram_dice():
+    """Test identical labels score 1, disjoint ones 0 and partial overlaps in between"""
+    scores = similarity_matrix(["email", "phone"], ["email", "email address", "zip", ""])
+
+    assert scores.shape == (2, 4)
+    assert scores[0, 0] == 1.0
+    assert 0.5 < scores[0, 1] < 1.0
+    assert scores[0, 2] == scores[1, 0] == scores[1, 3] == 0.0
+
+
+def test_assignment_gives_each_label_one_key():
+    """Test overlapping profile keys spread over distinct labels and junk keys are dropped"""
+    fields = [
+        {"label": "First Name*", "type": "text", "required": True},
+        {"label": "Full name", "type": "text"},
+        {"label": "Email", "type": "email"},
+    ]
+    form_data = {"Name": "Jordan Rivera", "Full Name": "Jordan Rivera", "First Name": "Jordan", "Email": "j@example.com", "Zip Code": "94105"}
+
+    greedy = FieldMatcher.match_form_data_to_fields(form_data, fields, mode="greedy")
+    assignment = FieldMatcher.assign_form_data_to_fields(form_data, fields, threshold=0.5)
+
+    assert "Zip Code" in greedy
+    assert assignment.labels == {"Full Name": "Full name", "First Name": "First Name*", "Email": "Email"}
+    assert assignment.scores["Email"] == 1.0
+    assert assignment.unassigned == ["Name", "Zip Code"]
+    assert FieldMatcher.match_form_data_to_fields(form_data, fields, mode="assignment") == {
+        "Full name": "Jordan Rivera", "First Name*": "Jordan", "Email": "j@example.com"
+    }
+
+
+def test_unknown_field_match_mode_is_rejected_at_startup():
+    """Test a misspelt FIELD_MATCH_MODE fails settings validation instead of falling back to greedy"""
+    with pytest.raises(ValidationError):
+        Settings(field_match_mode="assigment")
+    assert Settings(field_match_mode="assignment").field_match_mode == "assignment"
+
+
+@pytest.mark.parametrize("name,value", [
+    ("page_readiness_mode", "observe"),
+    ("fill_mode", "quick"),
+    ("analysis_source", "browser"),
+    ("html_extractor", "streaming"),
+])
+def test_other_mode_settings_are_validated_too(name, value):
+    """Test every string-valued mode setting rejects values its code paths do not know"""
+    with pytest.raises(ValidationError):
+        Settings(**{name: value})
@@ -0,0 +1,122 @@
+import pytest
+from app.services.field_resolver_service import FieldResolverService
+
+
+class FakePage:
+    def __init__(self, resolutions):
+        self.resolutions = resolutions
+        self.evaluate_calls = 0
+        self.queried = []
+
+    async def evaluate(self, script, labels):
+        self.evaluate_calls += 1
+        return {label: self.resolutions.get(label) for label in labels}
+
+    async def query_selector(self, selector):
+        self.queried.append(selector)
+        return f"handle:{selector}"
+
+
+@pytest.mark.asyncio
+async def test_resolve_fields_uses_single_round_trip():
+    """Test all labels are resolved with one evaluate call"""
+    page = FakePage({
+        "First Name": {"selector": "#first_name", "strategy": "exact"},
+        "Email": {"selector": "input[name=\"email\"]", "strategy": "exact"},
+    })
+    service = FieldResolverService()
+
+    resolved = await service.resolve_fields(page, ["First Name", "Email", "Fax", ""])
+
+    assert page.evaluate_calls == 1
+    assert resolved["First Name"]["selector"] == "#first_name"
+    assert resolved["Fax"] is None
+    assert "" not in resolved
+
+
+@pytest.mark.asyncio
+async def test_query_resolved_handles_missing_resolution():
+    """Test unresolved labels produce no handle and no query"""
+    page = FakePage({})
+    service = FieldResolverService()
+
+    assert await service.query_resolved(page, None) is None
+    assert page.queried == []
+
+    handle = await service.query_resolved(page, {"selector": "#email", "strategy": "exact"})
+    assert handle == "handle:#email"
+
+
+@pytest.mark.asyncio
+async def test_script_failure_leaves_labels_unresolved():
+    """Test a failed resolver script is not reported as 'no such field'"""
+    class BrokenPage:
+        async def evaluate(self, script, labels):
+            raise RuntimeError("Execution context was destroyed")
+
+    assert await FieldResolverService().resolve_fields(BrokenPage(), ["Email"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_label_probing_only_runs_when_the_resolver_could_not():
+    """Test labels the resolver ran for and did not find skip the XPath fallbacks"""
+    from app.services.automation_service import AutomationService
+
+    service = AutomationService()
+    probed = []
+
+    async def no_wait(page):
+        return None
+
+    async def resolve(page, labels, fill_plan=None):
+        # "Fax" was looked up and is absent; "Email" was never looked up
+        return {"Fax": None}, None
+
+    async def probe(page, label):
+        probed.append(label)
+        return None
+
+    service._ensure_page_fully_loaded = no_wait
+    service._resolve_labels = resolve
+    service._find_field_by_label = probe
+    service._find_field_by_partial_label = probe
+
+    result = await service.fill_form_with_page(FakePage({}), {"Fax": "123", "Email": "a@b.c"})
+
+    assert probed == ["Email", "Email"]
+    assert "Field not found: Fax" in result["errors"]
+    assert "Field not found: Email" in result["errors"]
+
+
+@pytest.mark.integration
+async def test_resolver_script_on_a_real_page(live_page):
+    """Test RESOLVE_FIELDS_SCRIPT in Chromium: exact labels win, fuzzy ones skip claimed controls, markers stay unique"""
+    await live_page.set_content("""
+        <form>
+          <label for="fn">First Name</label><input id="fn">
+          <label>Name <input name="full"></label>
+          <input aria-label="Email">
+          <label>Cover letter <textarea></textarea></label>
+        </form>
+    """)
+    service = FieldResolverService()
+
+    resolved = await service.resolve_fields(live_page, ["First Name", "Name", "Email", "Cover letter", "Fax"])
+
+    assert resolved["First Name"]["selector"] == "#fn"
+    assert resolved["Name"]["selector"] == 'input[name="full"]'
+    assert resolved["Fax"] is None
+    email, letter = resolved["Email"]["selector"], resolved["Cover letter"]["selector"]
+    assert email != letter
+    assert await (await service.query_resolved(live_page, resolved["Cover letter"])).evaluate("el => el.tagName") == "TEXTAREA"
+
+    # A control added after an earlier marked one was removed must not reuse its marker
+    await live_page.evaluate("""() => {
+        document.querySelector('[aria-label="Email"]').remove();
+        const input = document.createElement('input');
+        input.setAttribute('aria-label', 'Phone');
+        document.querySelector('form').appendChild(input);
+    }""")
+    phone = (await service.resolve_fields(live_page, ["Phone"]))["Phone"]["selector"]
+    assert phone not in (email, letter)
+    assert await live_page.evaluate("(s) => document.querySelectorAll(s).length", phone) == 1
@@ -0,0 +1,67 @@
+from app.services.html_parser_service import HTMLParserService
+from app.utils.field_matcher import FieldMatcher
+from app.utils.field_taxonomy import classify_field, classify_label, classify_name
+from app.utils.form_types import FieldIndex
+
+
+HTML = """<form>
+    <label for="gn">Given Name(s)*</label><input id="gn" name="legalNameSection_firstName" required>
+    <label for="ln">Surname</label><input id="ln" name="job_application[last_name]">
+    <label for="em">Your e-mail</label><input id="em" type="email" autocomplete="section-apply EMAIL">
+    <label for="loc">Where do you live?</label><input id="loc" name="loc" autocomplete="address-level2">
+    <label for="a1">Street</label><input id="a1" name="addr1">
+    <label for="a2">Address Line 2</label><input id="a2" name="addr2">
+    <label for="pt">Phone Device Type</label><select id="pt" name="phoneType"><option value="m">Mobile</option></select>
+    <label for="tel">Phone</label><input id="tel" name="phone">
+    <label for="why">Why do you want this job?</label><textarea id="why" name="why"></textarea>
+</form>"""
+
+
+def test_labels_classify_by_alias_and_covering_phrase():
+    """Test exact aliases, half-covering phrases and non-matches"""
+    assert classify_label("email address") == "email"
+    assert classify_label("location city") == "location"
+    assert classify_label("preferred first name") == "preferred_name"
+    assert classify_label("phone device type") is None
+    assert classify_label("years of experience") is None
+    assert classify_name("legalNameSection_firstName") == "given_name"
+    assert classify_field("send me texts", "checkbox", autocomplete="tel") is None
+    assert classify_field("phone type", "select", name="phoneType") is None
+
+
+def test_both_extractors_capture_taxonomy_attributes():
+    """Test soup and stream extraction record the same name and autocomplete hints"""
+    soup = HTMLParserService(extractor="soup")._parse_form_fields(HTML)
+    stream = HTMLParserService(extractor="stream")._parse_form_fields(HTML)
+
+    assert soup == stream
+    email = soup["fields"][2]
+    assert (email["name"], email["autocomplete"]) == ("", "section-apply email")
+
+
+def test_each_canonical_field_is_filled_once_and_fuzzy_sees_only_the_rest():
+    """Test aliases collapse onto one field, attributes classify and unknown labels stay fuzzy"""
+    index = FieldIndex.from_structure(HTMLParserService(extractor="soup")._parse_form_fields(HTML))
+    assert index.canonical_labels() == {
+        "given_name": "Given Name(s)*", "family_name": "Surname", "email": "Your e-mail", "city": "Where do you live?",
+        "street_address": "Street", "address_line2": "Address Line 2", "tel": "Phone"
+    }
+    assert index.candidates(unclassified_only=True) == [
+        ("Phone Device Type", "phone device type"), ("Why do you want this job?", "why do you want this job")
+    ]
+
+    profile = {
+        "First Name": "Ada", "Last Name": "Lovelace", "Email": "ada@example.com", "Email Address": "ada@example.com",
+        "Phone": "555 0100", "Phone Number": "555 0100", "Mobile": "555 0100", "City": "London",
+        "Address": "12 St James's Sq", "Zip Code": "SW1Y", "Why do you want this job": "Engines",
+    }
+    matched = FieldMatcher.match_form_data_to_fields(profile, index, mode="greedy")
+
+    assert matched == {
+        "Given Name(s)*": "Ada", "Surname": "Lovelace", "Your e-mail": "ada@example.com", "Phone": "555 0100",
+        "Where do you live?": "London", "Street": "12 St James's Sq", "Zip Code": "SW1Y",
+        "Why do you want this job?": "Engines",
+    }
+    assert FieldMatcher.match_form_data_to_fields(profile, index, mode="assignment") == {
+        label: value for label, value in matched.items() if label != "Zip Code"
+    }
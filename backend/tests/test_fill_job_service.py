@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from app.database import Base
+from app.models.application import Application
+from app.services.application_service import ApplicationService
+from app.services.fill_job_service import FillJobService, FillJobQueueFull
+
+
+class FakePipeline:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.release = asyncio.Event()
+        self.calls = []
+
+    async def run(self, url, form_data, progress_callback=None, **kwargs):
+        self.calls.append(kwargs)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            for label in form_data:
+                await progress_callback({"type": "field", "label": label, "status": "filled"})
+            await self.release.wait()
+            return {"filled_count": len(form_data), "executed_actions": []}
+        finally:
+            self.running -= 1
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def wait_for(predicate, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.asyncio
+async def test_job_runs_streams_progress_and_persists(session_factory):
+    """Test a job reports per-field progress and saves an application"""
+    pipeline = FakePipeline()
+    pipeline.release.set()
+    service = FillJobService(workers=1, pipeline=pipeline, session_factory=session_factory)
+
+    job = await service.submit("user-1", "https://example.com/apply", {"Email": "a@b.com"})
+    events = [event async for event in job.stream_events()]
+    await service.stop()
+
+    assert job.status == "completed"
+    assert [e["status"] for e in events if e["type"] == "status"] == ["queued", "running", "completed"]
+    assert any(e["type"] == "field" and e["label"] == "Email" for e in events)
+    # Unattended jobs run headless and hand their browser lease back when done
+    assert pipeline.calls[0]["headless"] is True and pipeline.calls[0]["keep_open"] is False
+
+    async with session_factory() as db:
+        applications = await ApplicationService.get_user_applications(db, "user-1")
+    assert [a.id for a in applications] == [job.application_id]
+
+
+@pytest.mark.asyncio
+async def test_per_user_limit_lets_other_users_through(session_factory):
+    """Test one user's backlog does not block another user's job"""
+    pipeline = FakePipeline()
+    service = FillJobService(workers=2, per_user_limit=1, pipeline=pipeline, session_factory=session_factory)
+
+    first = await service.submit("user-1", "https://example.com/1", {})
+    second = await service.submit("user-1", "https://example.com/2", {})
+    other = await service.submit("user-2", "https://example.com/3", {})
+
+    await wait_for(lambda: other.status == "running")
+    assert first.status == "running"
+    assert second.status == "queued"
+
+    pipeline.release.set()
+    await wait_for(lambda: second.status == "completed")
+    await service.stop()
+    assert pipeline.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_when_user_queue_full(session_factory):
+    """Test the per-user pending cap"""
+    service = FillJobService(workers=1, max_queued_per_user=1, pipeline=FakePipeline(), session_factory=session_factory)
+
+    await service.submit("user-1", "https://example.com/1", {})
+    with pytest.raises(FillJobQueueFull):
+        await service.submit("user-1", "https://example.com/2", {})
+    await service.stop()
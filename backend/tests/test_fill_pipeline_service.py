@@ -0,0 +1,59 @@
+import pytest
+from app.services.fill_pipeline_service import FillPipelineService
+
+
+# What the browser serialises once a client-side app has rendered its form;
+# the raw HTTP response for the same URL would only contain the mount point
+RENDERED_HTML = """
+<html><body>
+  <div id="root">
+    <form>
+      <label for="email">Email Address</label>
+      <input id="email" name="email" type="email">
+      <label for="phone">Phone</label>
+      <input id="phone" name="phone" type="tel">
+    </form>
+  </div>
+</body></html>
+"""
+
+
+class FakePage:
+    url = "https://jobs.example.com/apply"
+
+    def __init__(self):
+        self.content_calls = 0
+
+    async def content(self):
+        self.content_calls += 1
+        return RENDERED_HTML
+
+
+@pytest.mark.asyncio
+async def test_plan_fill_reads_rendered_page_without_refetching(monkeypatch):
+    """Test in-page analysis uses the rendered DOM instead of a second HTTP fetch"""
+    async def no_fetch(self, url):
+        raise AssertionError("the URL should not be fetched again")
+
+    monkeypatch.setattr("app.services.html_parser_service.HTMLParserService.fetch_html", no_fetch)
+    page = FakePage()
+
+    form_data, plan = await FillPipelineService().plan_fill(
+        page.url, {"E-mail address": "ada@example.com", "phone": "555-0100"}, page=page
+    )
+
+    assert page.content_calls == 1
+    assert form_data == {"Email Address": "ada@example.com", "Phone": "555-0100"}
+    assert [step["selector"] for step in plan] == ["#email", "#phone"]
+
+
+@pytest.mark.asyncio
+async def test_plan_fill_uses_stored_key_descriptions():
+    """Test the profile's stored key descriptions drive matching instead of being re-derived"""
+    page = FakePage()
+
+    form_data, plan = await FillPipelineService().plan_fill(
+        page.url, {"contact": "ada@example.com"}, page=page, key_info={"contact": ("contact", "email")}
+    )
+
+    assert form_data == {"Email Address": "ada@example.com"}
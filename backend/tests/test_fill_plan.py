@@ -0,0 +1,60 @@
+import pytest
+from app.services.automation_service import AutomationService
+from app.services.html_parser_service import HTMLParserService
+from app.utils.fill_plan import FillPlan
+
+
+HTML = """
+<form>
+  <label for="job_application[first_name]">First Name</label>
+  <input id="job_application[first_name]" name="job_application[first_name]">
+  <label for="country">Country</label>
+  <select id="country" name="country">
+    <option value="">Select...</option>
+    <option value="us">United States</option>
+    <option value="ca">Canada</option>
+  </select>
+  <label><input type="radio" name="remote" value="yes"> Remote</label>
+  <label><input type="radio" name="remote" value="no"> Onsite</label>
+</form>
+"""
+
+
+@pytest.mark.asyncio
+async def test_plan_carries_parser_selectors_and_option_choice():
+    """Test the plan keeps each field's selector and picks the matching option text"""
+    parser = HTMLParserService()
+    structure = parser.parse_form_fields(HTML)
+    await parser.close()
+
+    plan = FillPlan.build(
+        {"First Name": "Ada", "Country": "canada", "Onsite": True, "Unknown": "x", "Remote": ""},
+        structure
+    )
+
+    by_label = {step["label"]: step for step in plan}
+    assert set(by_label) == {"First Name", "Country", "Onsite"}
+    assert by_label["First Name"]["selector"] == "[id='job_application[first_name]']"
+    assert by_label["Country"]["value"] == "Canada"
+    assert by_label["Country"]["options"] == ["United States", "Canada"]
+    assert by_label["Onsite"]["selector"] == "[name='remote'][value='no']"
+
+
+class NoResolverPage:
+    url = "https://example.com/apply"
+
+    async def evaluate(self, script, *args):
+        raise AssertionError("planned labels should not need an in-page lookup")
+
+
+@pytest.mark.asyncio
+async def test_planned_labels_skip_in_page_resolution(monkeypatch):
+    """Test labels covered by the plan are addressed by selector directly"""
+    monkeypatch.setattr("app.services.automation_service.settings.selector_cache_enabled", False)
+    service = AutomationService()
+    plan = [{"label": "Email", "selector": "#email", "type": "email", "options": [], "value": "a@b.c"}]
+
+    resolved, cache_key = await service._resolve_labels(NoResolverPage(), ["Email"], plan)
+
+    assert resolved == {"Email": {"selector": "#email", "strategy": "plan"}}
+    assert cache_key is None
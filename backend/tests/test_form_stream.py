@@ -0,0 +1,68 @@
+from app.config import settings
+from app.services.html_parser_service import HTMLParserService
+from app.utils.form_stream import StreamingLabelIndex
+from app.utils.label_index import LabelIndex
+
+
+PAGES = [
+    # Script/style/template/ruby text never counts towards a label
+    """<form>
+        <label for="a">Full <script>var x = "name";</script>name<style>.a{}</style></label><input id="a">
+        <label>Kanji <ruby>漢<rt>kan</rt><rp>(</rp></ruby><input name="k"></label>
+        <template><label for="t">Hidden</label></template><input id="t" name="t">
+    </form>""",
+    # Comments and processing instructions split strings, so stripping differs per piece
+    """<form><label>First <!-- x --> name <input name="fn"></label>
+        <div>Last <?php echo 1 ?> name</div><input name="ln"></form>""",
+    # Labels that close after their control, nested forms, option groups and entities
+    """<form><label for="e">E-mail &amp; <input id="e" type="text"> address</label>
+        <form><span>Country</span><select id="c"><optgroup><option value="us">US</option>
+        <option value="">--</option></optgroup><option value="ca">Canada</option></select></form>
+        <input name="orphan_field"></form>
+        <input name="outside">""",
+    # Unclosed and misnested markup is repaired by libxml2 the same way for both paths
+    """<div><label for="x">X<div><input id="x"></label><span>Y<input name="y"></div>""",
+]
+
+
+def test_stream_extractor_matches_soup_extractor():
+    """Test the lxml event stream gives exactly the soup extractor's form structure"""
+    soup, stream = HTMLParserService(extractor="soup"), HTMLParserService(extractor="stream")
+    for html in PAGES:
+        assert stream._parse_form_fields(html) == soup._parse_form_fields(html)
+
+
+def test_chunk_boundaries_do_not_change_strings():
+    """Test feeding the page one character at a time still splits strings like bs4"""
+    soup = HTMLParserService(extractor="soup")
+    for html in PAGES:
+        index = StreamingLabelIndex.from_html(html, chunk_size=1)
+        fields = [soup._extract_field_info(inp, "", index)['field'] for group in index.control_groups() for inp in group]
+        assert fields == soup._parse_form_fields(html)['fields']
+
+
+def test_auto_mode_streams_only_large_pages(monkeypatch):
+    """Test auto picks the soup tree for small pages and the stream above the threshold"""
+    monkeypatch.setattr(settings, "html_stream_min_chars", 100)
+    parser = HTMLParserService(extractor="auto")
+
+    assert isinstance(parser._index_document("<input name='q'>"), LabelIndex)
+    assert isinstance(parser._index_document("<input name='q'>" + " " * 100), StreamingLabelIndex)
+
+
+def test_text_cap_keeps_labels_and_options():
+    """Test past max_text_chars div/span text is dropped while label and option text is kept"""
+    html = (
+        "<div>" + "filler " * 50 + "</div>"
+        "<form><span>Phone</span><input name='p'>"
+        "<label for='e'>Email</label><input id='e'>"
+        "<select name='c'><option>Canada</option></select></form>"
+    )
+    index = StreamingLabelIndex.from_html(html, max_text_chars=100)
+    phone, email, country = index.all_controls
+
+    assert index.previous_sibling(phone).get_text() == ""
+    assert index.label_for(email, "e").get_text() == "Email"
+    assert country.options[0].get_text() == "Canada"
+    assert index.stats()["text_capped"] is True
+    assert StreamingLabelIndex.from_html(html).stats()["text_capped"] is False
@@ -0,0 +1,50 @@
+from app.services.form_structure_cache_service import FormStructureCacheService
+from app.services.html_parser_service import HTMLParserService
+
+
+def render(token: str, nonce: str, build: str) -> str:
+    """The same application page as a server would render it for two different requests"""
+    return f"""<html><head><meta name="csrf-token" content="{token}">
+        <script nonce="{nonce}">window.build = "{build}";</script><!-- rendered {build} --></head>
+        <body><form><input type="hidden" name="authenticity_token" value="{token}">
+        <label for="email">Email</label><input id="email" name="email">
+        <input type="checkbox" name="csrf_ack" value="{token}"></form></body></html>"""
+
+
+class CountingParser(HTMLParserService):
+    def __init__(self, cache):
+        super().__init__(structure_cache=cache)
+        self.parses = 0
+
+    def _parse_form_fields(self, html, url=""):
+        self.parses += 1
+        return super()._parse_form_fields(html, url)
+
+
+def test_page_versions_differing_only_in_tokens_parse_once():
+    """Test nonces, CSRF tokens, script bodies and comments don't split the cache"""
+    parser = CountingParser(FormStructureCacheService(max_bytes=1024 * 1024))
+    first = parser.parse_form_fields(render("tok-AAA111", "n1", "1001"))
+    second = parser.parse_form_fields(render("tok-BBB222", "n2", "1002"))
+
+    assert parser.parses == 1
+    assert parser.structure_cache.stats()["hits"] == 1
+    # Token values are put back per page, so output equals a fresh parse
+    assert second == parser._parse_form_fields(render("tok-BBB222", "n2", "1002"))
+    assert first["fields"][0]["value"] == "tok-AAA111"
+    assert second["fields"][0]["value"] == "tok-BBB222"
+    assert second["actions"][2]["selector"] == "[name='csrf_ack'][value='tok-BBB222']"
+
+
+def test_hits_are_independent_copies_and_size_is_bounded():
+    """Test callers can mutate results freely and the byte budget evicts oldest pages"""
+    cache = FormStructureCacheService(max_bytes=1)
+    parser = HTMLParserService(structure_cache=cache)
+    html = "<form><input name='q'></form>"
+
+    parser.parse_form_fields(html)["fields"].clear()
+    assert parser.parse_form_fields(html)["fields"][0]["label"] == "Q"
+
+    parser.parse_form_fields("<form><input name='other'></form>")
+    stats = cache.stats()
+    assert stats["entries"] == 1 and stats["evictions"] == 1
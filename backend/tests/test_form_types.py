@@ -0,0 +1,50 @@
+from app.services.html_parser_service import HTMLParserService
+from app.utils.field_matcher import FieldMatcher
+from app.utils.field_validator import FieldValidator
+from app.utils.form_types import FieldIndex, FormField
+
+
+HTML = """<form>
+    <label for="fn">First Name</label><input id="fn" name="first_name" required>
+    <label for="em">E-mail</label><input id="em" type="email">
+    <label for="c">Country</label><select id="c"><option value="us">United States</option></select>
+    <label for="fn2">First Name</label><input id="fn2" name="other_first">
+</form>"""
+
+
+def test_round_trip_is_lossless():
+    """Test parser dicts survive conversion to slotted types and back, extra keys included"""
+    structure = HTMLParserService(extractor="soup")._parse_form_fields(HTML)
+    structure["fields"][1]["frame"] = "https://boards.greenhouse.io/embed/job_app"
+    structure["actions"][1]["frame"] = "https://boards.greenhouse.io/embed/job_app"
+    structure["fields"][2]["autocomplete"] = "country-name"
+
+    assert FieldIndex.from_structure(structure).to_structure() == structure
+    assert not hasattr(FormField("Email"), "__dict__")
+
+
+def test_index_lookups_match_first_field_scans():
+    """Test label lookups return the first field with that label, like the old linear scans"""
+    structure = HTMLParserService(extractor="soup")._parse_form_fields(HTML)
+    index = FieldIndex.from_structure(structure)
+
+    assert index.get("First Name").required is True
+    assert index.action_for("First Name").selector == "#fn"
+    assert "Country" in index and "Surname" not in index
+    assert [label for label, _ in index.candidates()] == ["First Name", "E-mail", "Country"]
+    assert index.get("E-mail").normalized_label == "email"
+
+
+def test_matcher_and_validator_accept_an_index():
+    """Test the prenormalised matcher and validator agree with the dict-based calls"""
+    structure = HTMLParserService(extractor="soup")._parse_form_fields(HTML)
+    index = FieldIndex.from_structure(structure)
+    profile = {"first name": "Ada", "email": "ada@example", "Country": "United States", "pronouns": "she/her"}
+
+    matched = FieldMatcher.match_form_data_to_fields(profile, index)
+    assert matched == FieldMatcher.match_form_data_to_fields(profile, structure["fields"])
+    assert matched == {"First Name": "Ada", "E-mail": "ada@example", "Country": "United States", "pronouns": "she/her"}
+
+    assert FieldValidator.validate_form_data(matched, index) == FieldValidator.validate_form_data(matched, structure)
+    is_valid, errors = FieldValidator.validate_form_data(matched, index)
+    assert not is_valid and "Invalid email format" in errors and "Unknown field: pronouns" in errors
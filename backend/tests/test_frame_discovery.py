@@ -0,0 +1,66 @@
+import httpx
+import pytest
+from app.services.html_cache_service import HtmlCacheService
+from app.services.html_parser_service import HTMLParserService
+from app.utils.frame_discovery import FrameDiscovery
+
+
+def test_frame_urls_keep_same_site_and_ats_frames():
+    """Test only same-site and known-ATS iframes are followed, resolved against the page"""
+    html = """
+        <iframe src="https://boards.greenhouse.io/embed/job_app?for=acme&amp;token=123"></iframe>
+        <iframe title="apply" src='/apply/form'></iframe>
+        <iframe src=https://jobs.acme.com/widget></iframe>
+        <iframe src="https://www.youtube.com/embed/xyz"></iframe>
+        <iframe src="javascript:void(0)"></iframe>
+        <iframe src="/apply/form"></iframe>
+    """
+    assert FrameDiscovery.frame_urls(html, "https://careers.acme.com/jobs/1") == [
+        "https://boards.greenhouse.io/embed/job_app?for=acme&token=123",
+        "https://careers.acme.com/apply/form"
+    ]
+    assert FrameDiscovery.frame_urls(html, "https://careers.acme.com/", ["acme.com", "youtube.com"])[-2:] == [
+        "https://jobs.acme.com/widget", "https://www.youtube.com/embed/xyz"
+    ]
+
+
+def test_frame_urls_do_not_treat_a_shared_public_suffix_as_same_site():
+    """Test a page can't pull in another registrant's host just by sharing co.uk"""
+    html = '<iframe src="https://victim.co.uk/admin"></iframe><iframe src="https://apply.acme.co.uk/form"></iframe>'
+
+    assert FrameDiscovery.frame_urls(html, "https://evil.co.uk/jobs/1") == []
+    assert FrameDiscovery.frame_urls(html, "https://acme.co.uk/jobs/1") == ["https://apply.acme.co.uk/form"]
+
+
+PAGES = {
+    "/jobs/1": "<h1>Engineer</h1><iframe src='https://boards.greenhouse.io/embed/job_app?for=acme'></iframe>"
+               "<iframe src='/broken'></iframe>",
+    "/embed/job_app": "<form><label for='first_name'>First Name</label><input id='first_name'>"
+                      "<iframe src='https://boards.greenhouse.io/embed/questions'></iframe></form>",
+    "/embed/questions": "<form><label for='q1'>Sponsorship needed?</label><input id='q1'>"
+                        "<iframe src='https://boards.greenhouse.io/embed/too_deep'></iframe></form>",
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    body = PAGES.get(request.url.path)
+    return httpx.Response(200, html=body) if body else httpx.Response(404)
+
+
+@pytest.mark.asyncio
+async def test_embedded_forms_are_merged_with_frame_provenance(tmp_path):
+    """Test iframe fields are fetched to the depth limit and tagged with their frame"""
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        parser = HTMLParserService(client=client, cache=HtmlCacheService(db_path=str(tmp_path / "html.db")))
+        analysis = await parser.analyze_form_from_url("https://careers.acme.com/jobs/1")
+
+    structure = analysis["form_structure"]
+    assert [field["label"] for field in structure["fields"]] == ["First Name", "Sponsorship needed?"]
+    assert structure["fields"][0]["frame"] == "https://boards.greenhouse.io/embed/job_app?for=acme"
+    assert structure["actions"][1]["frame"] == "https://boards.greenhouse.io/embed/questions"
+
+    frames = {frame["url"]: frame for frame in structure["frames"]}
+    assert frames["https://careers.acme.com/broken"]["fields"] == 0
+    assert "error" in frames["https://careers.acme.com/broken"]
+    assert frames["https://boards.greenhouse.io/embed/questions"]["depth"] == 2
+    assert "https://boards.greenhouse.io/embed/too_deep" not in frames
@@ -0,0 +1,115 @@
+import httpx
+import pytest
+import threading
+from app.services.html_cache_service import HtmlCacheService
+
+
+class Origin:
+    """Serves one posting with an ETag and answers conditional GETs with 304"""
+
+    def __init__(self, etag='"v1"', cache_control=""):
+        self.etag = etag
+        self.cache_control = cache_control
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304)
+        headers = {"ETag": self.etag, "Last-Modified": "Tue, 13 Oct 2026 08:00:00 GMT"}
+        if self.cache_control:
+            headers["Cache-Control"] = self.cache_control
+        return httpx.Response(200, html="<form><input name='email'></form>", headers=headers)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_served_without_network(tmp_path):
+    """Test a second fetch inside the TTL never reaches the origin"""
+    origin = Origin()
+    cache = HtmlCacheService(db_path=str(tmp_path / "html.db"), ttl_seconds=300)
+    async with origin.client() as client:
+        first = await cache.fetch(client, "https://jobs.example.com/1#apply")
+        second = await cache.fetch(client, "https://jobs.example.com/1")
+
+    assert first == second
+    assert len(origin.requests) == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["memory_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_revalidate_with_conditional_get(tmp_path):
+    """Test an expired entry is revalidated with If-None-Match and kept on 304"""
+    origin = Origin()
+    cache = HtmlCacheService(db_path=str(tmp_path / "html.db"), ttl_seconds=0)
+    async with origin.client() as client:
+        await cache.fetch(client, "https://jobs.example.com/1")
+        html = await cache.fetch(client, "https://jobs.example.com/1")
+
+    assert "email" in html
+    assert origin.requests[1].headers["if-none-match"] == '"v1"'
+    assert origin.requests[1].headers["if-modified-since"] == "Tue, 13 Oct 2026 08:00:00 GMT"
+    assert cache.stats()["revalidated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart_and_memory_is_bounded(tmp_path):
+    """Test entries evicted from memory (or a new process) come back from disk"""
+    origin = Origin()
+    db_path = str(tmp_path / "html.db")
+    cache = HtmlCacheService(db_path=db_path, ttl_seconds=300, memory_max_bytes=1)
+    async with origin.client() as client:
+        await cache.fetch(client, "https://jobs.example.com/1")
+        await cache.fetch(client, "https://jobs.example.com/2")
+        assert cache.stats()["memory_entries"] == 1
+
+        restarted = HtmlCacheService(db_path=db_path, ttl_seconds=300)
+        await restarted.fetch(client, "https://jobs.example.com/1")
+
+    assert len(origin.requests) == 2
+    assert restarted.stats()["disk_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_store_responses_are_not_cached(tmp_path):
+    """Test Cache-Control: no-store is honoured"""
+    origin = Origin(cache_control="private, no-store")
+    cache = HtmlCacheService(db_path=str(tmp_path / "html.db"), ttl_seconds=300)
+    async with origin.client() as client:
+        await cache.fetch(client, "https://jobs.example.com/1")
+        await cache.fetch(client, "https://jobs.example.com/1")
+
+    assert len(origin.requests) == 2
+    assert cache.stats()["stores"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sqlite_and_zlib_work_runs_off_the_event_loop(tmp_path):
+    """Test lookups and stores happen in a worker thread, not the loop's thread"""
+    cache = HtmlCacheService(db_path=str(tmp_path / "html.db"), ttl_seconds=300)
+    threads = []
+    for name in ("get", "store"):
+        method = getattr(cache, name)
+
+        def record(*args, _method=method):
+            threads.append(threading.current_thread())
+            return _method(*args)
+
+        setattr(cache, name, record)
+
+    async with Origin().client() as client:
+        await cache.fetch(client, "https://jobs.example.com/1")
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_zero_limits_are_not_replaced_by_defaults(tmp_path):
+    """Test an explicit 0 TTL or staleness window is kept rather than read as unset"""
+    cache = HtmlCacheService(db_path=str(tmp_path / "html.db"), ttl_seconds=0, max_stale_seconds=0)
+
+    assert cache.ttl_seconds == 0
+    assert cache.max_stale_seconds == 0
@@ -0,0 +1,108 @@
+import httpcore
+import httpx
+import pytest
+from app.services.html_parser_service import HTMLParserService
+from app.services.http_client_service import DNSCacheBackend, HttpClientService, http_client
+
+
+class FakeBackend:
+    def __init__(self, unreachable=()):
+        self.unreachable = set(unreachable)
+        self.connected = []
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        if host in self.unreachable:
+            raise httpcore.ConnectError(f"cannot reach {host}")
+        self.connected.append((host, port))
+        return object()
+
+
+class CountingResolver(DNSCacheBackend):
+    def __init__(self, addresses, **kwargs):
+        super().__init__(**kwargs)
+        self.addresses = addresses
+        self.resolutions = 0
+
+    async def _resolve(self, host, port):
+        self.resolutions += 1
+        return list(self.addresses)
+
+
+@pytest.mark.asyncio
+async def test_dns_lookups_are_cached_and_connections_counted():
+    """Test repeat connections to a host reuse the cached lookup"""
+    inner = FakeBackend()
+    backend = CountingResolver(["10.0.0.1"], ttl_seconds=60, backend=inner)
+
+    await backend.connect_tcp("boards.greenhouse.io", 443)
+    await backend.connect_tcp("boards.greenhouse.io", 443)
+
+    assert backend.resolutions == 1
+    assert backend.dns_hits == 1 and backend.dns_misses == 1
+    assert backend.connections_opened == 2
+    assert inner.connected == [("10.0.0.1", 443), ("10.0.0.1", 443)]
+
+
+@pytest.mark.asyncio
+async def test_unreachable_address_falls_through_and_drops_cache():
+    """Test the next address is tried and a fully failed host is looked up again"""
+    backend = CountingResolver(["10.0.0.1", "10.0.0.2"], backend=FakeBackend(unreachable={"10.0.0.1"}))
+    await backend.connect_tcp("jobs.lever.co", 443)
+    assert backend.backend.connected == [("10.0.0.2", 443)]
+
+    backend.backend.unreachable.add("10.0.0.2")
+    with pytest.raises(httpcore.ConnectError):
+        await backend.connect_tcp("jobs.lever.co", 443)
+    assert ("jobs.lever.co", 443) not in backend._cache
+
+
+@pytest.mark.asyncio
+async def test_parsers_share_the_app_client():
+    """Test parsers reuse one pooled client and closing a parser leaves it open"""
+    first, second = HTMLParserService(), HTMLParserService()
+    assert first.client is second.client is http_client.client
+
+    await first.close()
+    assert not http_client.client.is_closed
+
+    service = HttpClientService(http2=False)
+    stats = service.stats()
+    assert stats["requests"] == 0 and stats["connections_opened"] == 0
+    assert stats["http2"] is False
+
+
+@pytest.mark.asyncio
+async def test_environment_proxies_are_mounted_through_the_pooled_backend(monkeypatch):
+    """Test HTTPS_PROXY and NO_PROXY still apply although the client gets an explicit transport"""
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.internal:3128")
+    monkeypatch.setenv("NO_PROXY", "localhost")
+    service = HttpClientService(http2=False)
+    client = service.client
+
+    proxied = client._transport_for_url(httpx.URL("https://boards.greenhouse.io/acme"))
+    assert isinstance(proxied._pool, httpcore.AsyncHTTPProxy)
+    assert proxied._pool._network_backend is service.backend
+    assert client._transport_for_url(httpx.URL("https://localhost/apply")) is service._transport
+    assert isinstance(service._transport._pool, httpcore.AsyncConnectionPool)
+    assert service.stats()["proxies"] == 1
+    await service.close()
+
+    direct = HttpClientService(http2=False, trust_env=False)
+    assert direct.client._transport_for_url(httpx.URL("https://boards.greenhouse.io/acme")) is direct._transport
+    await direct.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_do_not_count_as_reused_connections():
+    """Test a refused connect leaves the reuse rate at zero"""
+    service = HttpClientService(http2=False, trust_env=False)
+    service.backend = CountingResolver(["10.0.0.1"], backend=FakeBackend(unreachable={"10.0.0.1"}))
+
+    with pytest.raises(httpx.ConnectError):
+        await service.client.get("http://jobs.example.com/apply")
+
+    stats = service.stats()
+    assert stats["requests"] == 1 and stats["responses"] == 0
+    assert stats["connections_reused"] == 0
+    assert stats["reuse_rate"] == 0.0
+    await service.close()
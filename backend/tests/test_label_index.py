@@ -0,0 +1,50 @@
+from bs4 import BeautifulSoup
+from app.services.html_parser_service import HTMLParserService
+from app.utils.label_index import LabelIndex
+
+
+def legacy_fields(parser: HTMLParserService, html: str):
+    soup = BeautifulSoup(html, 'lxml')
+    fields = []
+    for form in soup.find_all('form') or [soup]:
+        for inp in form.find_all(['input', 'select', 'textarea']):
+            info = parser._extract_field_info(inp)
+            if info:
+                fields.append(info['field'])
+    return fields
+
+
+TRICKY_PAGES = [
+    # Wrapping label that also carries a for attribute, and a label[for] placed after its input
+    """<form>
+        <label for="first">First name <input id="first" name="first"></label>
+        <input id="late" name="late"><label for="late">Too late</label>
+        <label for="late">Second</label><input id="late" name="late_dup">
+    </form>""",
+    # No forms at all: the whole page is one group, span/div siblings act as labels
+    """<div><span>City</span><input name="city"></div>
+       <div><div>Country</div><select name="country"><option>US</option></select></div>
+       <textarea name="notes" placeholder="Notes"></textarea>""",
+    # Labels that live in another form, and nested forms
+    """<form><label for="shared">Shared label</label></form>
+       <form><input id="shared" name="shared"><form><input name="inner" aria-label="Inner"></form></form>""",
+]
+
+
+def test_indexed_extraction_matches_legacy_scans():
+    """Test the one-pass index gives exactly the fields the per-control scans did"""
+    parser = HTMLParserService()
+    for html in TRICKY_PAGES:
+        assert parser._parse_form_fields(html)['fields'] == legacy_fields(parser, html)
+
+
+def test_label_for_picks_nearest_preceding_label():
+    """Test label[for] lookups mirror find_previous: nearest label before the control"""
+    soup = BeautifulSoup(TRICKY_PAGES[0], 'lxml')
+    index = LabelIndex(soup)
+    first, late, late_dup = soup.find_all('input')
+
+    assert index.label_for(first, 'first').get_text(strip=True).startswith('First name')
+    assert index.label_for(late, 'late') is None
+    assert index.label_for(late_dup, 'late').get_text(strip=True) == 'Second'
+    assert index.stats() == {"forms": 1, "controls": 3, "labels_with_for": 3}
@@ -0,0 +1,59 @@
+import random
+from app.utils.field_matcher import FieldMatcher
+from app.utils.form_types import FieldIndex, normalize_label
+from app.utils.label_matcher import LabelMatcher, lcs_length
+
+
+def dp_lcs(a: str, b: str) -> int:
+    row = [0] * (len(b) + 1)
+    for char in a:
+        previous = 0
+        for j, other in enumerate(b, 1):
+            previous, row[j] = row[j], previous + 1 if char == other else max(row[j], row[j - 1])
+    return row[-1]
+
+
+def test_bit_parallel_lcs_matches_dynamic_programming():
+    """Test lcs_length agrees with the textbook DP table"""
+    rng = random.Random(7)
+    for _ in range(300):
+        a = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 12)))
+        b = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 70)))
+        masks = {}
+        for position, char in enumerate(b):
+            masks[char] = masks.get(char, 0) | 1 << position
+        assert lcs_length(a, masks, len(b)) == dp_lcs(a, b)
+
+
+def test_indexed_match_picks_what_the_full_scan_picks():
+    """Test LabelMatcher returns the same label as find_best_normalized_match at any threshold"""
+    rng = random.Random(22)
+    words = ["first", "last", "name", "email", "address", "phone", "number", "city", "zip", "code", "url", ""]
+    for _ in range(200):
+        labels = list(dict.fromkeys(
+            " ".join(rng.choice(words) for _ in range(rng.randint(1, 3))) + rng.choice(["", "*", " (optional)"])
+            for _ in range(rng.randint(0, 25))
+        ))
+        candidates = [(label, normalize_label(label)) for label in labels]
+        matcher = LabelMatcher(candidates)
+        for _ in range(10):
+            target = normalize_label(" ".join(rng.choice(words) for _ in range(rng.randint(1, 2))))
+            threshold = rng.choice([0.0, 0.6, 0.6, 0.85, 1.0])
+            assert matcher.best_match(target, threshold) == FieldMatcher.find_best_normalized_match(
+                target, candidates, threshold
+            )
+
+
+def test_ties_and_duplicate_texts_go_to_the_earliest_label():
+    """Test equal scores resolve to the first label in form order"""
+    fields = FieldIndex.from_fields([
+        {"label": "E-mail", "type": "email"},
+        {"label": "Email", "type": "email"},
+        {"label": "Emails", "type": "text"},
+        {"label": "Mail", "type": "text"},
+    ])
+
+    assert fields.label_matcher().best_match("email") == "E-mail"
+    assert fields.label_matcher().best_match("mails") == "Emails"
+    assert fields.label_matcher() is fields.label_matcher()
+    assert len(fields.label_matcher()) == 3
@@ -0,0 +1,60 @@
+import pytest
+from app.services.multi_step_service import MultiStepService
+
+
+class FakeField:
+    def __init__(self):
+        self.value = None
+
+    async def scroll_into_view_if_needed(self):
+        pass
+
+    async def evaluate(self, script):
+        return "input"
+
+    async def get_attribute(self, name):
+        return "text"
+
+    async def fill(self, value):
+        self.value = value
+
+
+class FakePage:
+    async def wait_for_timeout(self, ms):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_multi_step_fill_reports_per_field_progress():
+    """Test every field outcome is reported, tagged with its step"""
+    service = MultiStepService()
+    email = FakeField()
+
+    async def detect(page):
+        return True
+
+    async def resolve(page, labels):
+        return {}, None
+
+    async def locate(page, label, resolved, cache_key):
+        return email if label == "Email" else None
+
+    async def find(page, label):
+        return None
+
+    service.detect_multi_step_form = detect
+    service.automation._resolve_labels = resolve
+    service.automation._locate_resolved_field = locate
+    service.automation._find_field_by_label = find
+    events = []
+
+    async def progress(event):
+        events.append(event)
+
+    result = await service.fill_multi_step_form(
+        FakePage(), {"Email": "ada@example.com", "Fax": "n/a"}, progress_callback=progress
+    )
+
+    assert email.value == "ada@example.com"
+    assert [(e["label"], e["status"], e["step"]) for e in events] == [("Email", "filled", 1), ("Fax", "error", 1)]
+    assert result["errors"] == ["Field not found in step 1: Fax"]
@@ -0,0 +1,97 @@
+import pytest
+from app.services.page_readiness_service import PageReadinessService
+
+
+class FakePage:
+    def __init__(self, result=None, error=None, idle_error=None):
+        self.result = result
+        self.error = error
+        self.idle_error = idle_error
+        self.calls = []
+        self.sleeps = []
+        self.load_states = []
+
+    async def wait_for_load_state(self, state, timeout=None):
+        self.load_states.append((state, timeout))
+        if self.idle_error:
+            raise self.idle_error
+
+    async def evaluate(self, script, arg=None):
+        self.calls.append(arg)
+        if self.error:
+            raise self.error
+        return dict(self.result)
+
+    async def wait_for_timeout(self, ms):
+        self.sleeps.append(ms)
+
+
+@pytest.mark.asyncio
+async def test_observer_mode_runs_single_in_page_check():
+    """Test observer mode hands quiet window and budget to the page without sleeping"""
+    page = FakePage(result={"settled": True, "elapsed_ms": 640, "scroll_steps": 0})
+    service = PageReadinessService(mode="observer", quiet_ms=300, budget_ms=4000)
+
+    result = await service.wait_until_ready(page)
+
+    assert result["settled"] is True
+    assert result["mode"] == "observer"
+    assert result["network_idle"] is True
+    assert page.load_states == [("networkidle", 4000)]
+    assert len(page.calls) == 1
+    assert page.calls[0]["quietMs"] == 300
+    assert 300 <= page.calls[0]["budgetMs"] <= 4000
+    assert page.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_observer_mode_still_checks_the_dom_when_the_network_never_idles():
+    """Test a page that keeps polling uses up its network wait and is then checked as usual"""
+    page = FakePage(result={"settled": True}, idle_error=TimeoutError("networkidle timed out"))
+    service = PageReadinessService(mode="observer", quiet_ms=300, budget_ms=4000)
+
+    result = await service.wait_until_ready(page)
+
+    assert result["network_idle"] is False
+    assert len(page.calls) == 1
+    assert page.calls[0]["budgetMs"] >= 300
+
+
+@pytest.mark.asyncio
+async def test_observer_mode_survives_destroyed_context():
+    """Test a navigation during the check is reported instead of raised"""
+    page = FakePage(error=Exception("Execution context was destroyed"))
+    service = PageReadinessService(mode="observer")
+
+    result = await service.wait_until_ready(page)
+
+    assert result["settled"] is False
+    assert "destroyed" in result["error"]
+
+
+@pytest.mark.integration
+async def test_readiness_script_on_a_real_page(live_page):
+    """Test READINESS_SCRIPT in Chromium waits out late DOM changes before reporting settled"""
+    # Keeps changing for ~3s, well past the network going idle, then renders the field
+    await live_page.set_content("""
+        <p id="status"></p>
+        <form id="apply"></form>
+        <script>
+          let ticks = 0;
+          const timer = setInterval(() => {
+            document.getElementById('status').textContent = 'loading ' + (++ticks);
+            if (ticks === 30) {
+              clearInterval(timer);
+              const input = document.createElement('input');
+              input.name = 'email';
+              document.getElementById('apply').appendChild(input);
+            }
+          }, 100);
+        </script>
+    """)
+
+    result = await PageReadinessService(mode="observer", quiet_ms=400, budget_ms=10000).wait_until_ready(live_page)
+
+    assert result["settled"] is True
+    assert result["mutations"] >= 1
+    assert await live_page.query_selector("input[name=email]") is not None
@@ -0,0 +1,57 @@
+import os
+import pytest
+from app.services.ats_score_service import ATSScoreService
+from app.services.html_parser_service import HTMLParserService, parse_form_structure
+from app.services.parse_pool import ParsePool, ParseWorkerCrashed
+
+
+def crash_worker(html: str):
+    os._exit(1)
+
+
+HTML = "<form><label for='e'>Email</label><input id='e' name='email'></form>" + "<p>filler</p>" * 50
+
+
+@pytest.mark.asyncio
+async def test_large_documents_parse_in_a_worker_process():
+    """Test worker results match an inline parse and execution time is recorded"""
+    pool = ParsePool(workers=1, min_chars=100)
+    try:
+        structure = await pool.run(parse_form_structure, HTML, "https://jobs.example.com/1", "soup")
+        description = await pool.run(ATSScoreService._extract_job_description, "<main>" + "Python developer " * 20 + "</main>")
+    finally:
+        await pool.close()
+
+    assert structure == HTMLParserService(extractor="soup")._parse_form_fields(HTML)
+    assert description.startswith("Python developer")
+    stats = pool.stats()
+    assert stats["completed"] == 2 and stats["inline"] == 0
+    assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+    assert stats["exec_ms_max"] > 0
+
+
+@pytest.mark.asyncio
+async def test_small_documents_and_disabled_pool_run_inline():
+    """Test tiny pages skip the worker round trip, as does a pool with no workers"""
+    small = ParsePool(workers=1, min_chars=10 * len(HTML))
+    disabled = ParsePool(workers=0, min_chars=0)
+
+    assert await small.run(parse_form_structure, HTML) == await disabled.run(parse_form_structure, HTML)
+    assert small.stats()["inline"] == 1 and small.stats()["started"] is False
+    assert disabled.stats()["submitted"] == 0
+
+
+@pytest.mark.asyncio
+async def test_a_document_that_kills_its_worker_fails_instead_of_parsing_inline():
+    """Test the pool is replaced and the crashing document is reported, not retried on the server"""
+    pool = ParsePool(workers=1, min_chars=100)
+    try:
+        with pytest.raises(ParseWorkerCrashed):
+            await pool.run(crash_worker, HTML)
+        assert pool.stats()["restarts"] == 1 and pool.stats()["inline"] == 0
+
+        structure = await pool.run(parse_form_structure, HTML)
+    finally:
+        await pool.close()
+
+    assert structure["fields"][0]["label"] == "Email"
@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import update
+from app.models.profile import Profile, ProfileCreate, ProfileUpdate
+from app.services.profile_form_data_service import profile_form_data_cache
+from app.services.profile_service import ProfileService
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    profile_form_data_cache.clear()
+    yield
+    profile_form_data_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_profile_writes_materialise_form_data(test_db):
+    """Test create and update store the flattened form data with a new version each time"""
+    profile = await ProfileService.create_profile(
+        test_db, ProfileCreate(name="Ada Lovelace", email="ada@example.com", first_name="Ada", last_name="Lovelace"), "user-1"
+    )
+    assert profile.form_data_version == 1
+    assert profile.form_data_cache["form_data"] == ProfileService.profile_to_form_data(profile)
+    assert profile.form_data_cache["keys"]["Email Address"] == ["email address", "email"]
+
+    profile = await ProfileService.update_profile(test_db, profile.id, ProfileUpdate(phone="+44 20 7946 0000"))
+    assert profile.form_data_version == 2
+    assert profile.form_data_cache["form_data"]["Phone"] == "+44 20 7946 0000"
+
+
+@pytest.mark.asyncio
+async def test_form_data_is_cached_per_user_until_the_profile_changes(test_db):
+    """Test reads are served from memory and update_profile drops the stale entry"""
+    profile = await ProfileService.create_profile(test_db, ProfileCreate(name="Ada Lovelace"), "user-2")
+
+    first = await ProfileService.get_form_data(test_db, "user-2")
+    assert first.form_data["Full Name"] == "Ada Lovelace"
+    assert first.keys["Full Name"] == ("full name", "name")
+    assert await ProfileService.get_form_data(test_db, "user-2") is first
+    assert await ProfileService.get_form_data(test_db, "nobody") is None
+
+    await ProfileService.update_profile(test_db, profile.id, ProfileUpdate(name="Augusta Ada King"))
+    refreshed = await ProfileService.get_form_data(test_db, "user-2")
+    assert refreshed.form_data["Full Name"] == "Augusta Ada King"
+    assert refreshed.version == first.version + 1
+    assert profile_form_data_cache.stats()["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rows_written_before_materialisation_are_backfilled(test_db):
+    """Test a profile without stored form data gets it built and saved on first read"""
+    profile = await ProfileService.create_profile(test_db, ProfileCreate(name="Grace Hopper"), "user-3")
+    await test_db.execute(update(Profile).where(Profile.id == profile.id).values(form_data_cache=None, form_data_version=0))
+    await test_db.commit()
+
+    entry = await ProfileService.get_form_data(test_db, "user-3")
+
+    assert entry.form_data["Name"] == "Grace Hopper"
+    assert entry.version == 1
+    await test_db.refresh(profile)
+    assert profile.form_data_cache["form_data"] == entry.form_data
+
+
+@pytest.mark.asyncio
+async def test_rows_stamped_before_a_taxonomy_change_are_rebuilt(test_db, monkeypatch):
+    """Test stored key classifications are recomputed once the taxonomy tables change"""
+    await ProfileService.create_profile(test_db, ProfileCreate(name="Grace Hopper"), "user-4")
+    monkeypatch.setattr("app.services.profile_service.FORM_DATA_SCHEMA", "1:edited-taxonomy")
+
+    entry = await ProfileService.get_form_data(test_db, "user-4")
+
+    assert entry.version == 2
+    assert entry.keys["Full Name"] == ("full name", "name")
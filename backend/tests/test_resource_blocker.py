@@ -0,0 +1,68 @@
+import pytest
+from app.services.resource_blocker import ResourceBlocker
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = FakeRequest(url, resource_type)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+class FakePage:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+def test_analysis_profile_blocks_heavy_types_and_trackers():
+    """Test the analysis profile drops images, fonts and tracker scripts"""
+    blocker = ResourceBlocker(profile="analysis", allowlist={})
+
+    assert blocker.should_block("https://acme.com/logo.png", "image")
+    assert blocker.should_block("https://acme.com/font.woff2", "font")
+    assert blocker.should_block("https://www.google-analytics.com/analytics.js", "script")
+    assert not blocker.should_block("https://acme.com/app.js", "script")
+    assert not blocker.should_block("https://acme.com/apply", "document")
+
+
+def test_interactive_profile_only_blocks_trackers():
+    """Test the interactive profile keeps the page looking normal"""
+    blocker = ResourceBlocker(profile="interactive", allowlist={})
+
+    assert not blocker.should_block("https://acme.com/logo.png", "image")
+    assert blocker.should_block("https://static.hotjar.com/c/hotjar.js", "script")
+
+
+@pytest.mark.asyncio
+async def test_allowlist_and_stats():
+    """Test per-domain allowlists and saved-request accounting"""
+    blocker = ResourceBlocker(profile="analysis", allowlist={"myworkdayjobs.com": ["font"]})
+    page = FakePage()
+    await blocker.attach(page, "https://acme.wd5.myworkdayjobs.com/job/123")
+
+    font = FakeRoute("https://acme.wd5.myworkdayjobs.com/font.woff2", "font")
+    image = FakeRoute("https://acme.wd5.myworkdayjobs.com/banner.jpg", "image")
+    await page.handler(font)
+    await page.handler(image)
+
+    assert font.outcome == "continued"
+    assert image.outcome == "aborted"
+    stats = blocker.stats()
+    assert stats["requests_blocked"] == 1
+    assert stats["requests_allowed"] == 1
+    assert stats["estimated_bytes_saved"] > 0
+    assert stats["blocked_by_type"] == {"image": 1}
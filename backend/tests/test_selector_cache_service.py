@@ -0,0 +1,67 @@
+import pytest
+import time
+from app.services.selector_cache_service import SelectorCacheService
+
+
+def make_cache(tmp_path, **kwargs) -> SelectorCacheService:
+    return SelectorCacheService(db_path=str(tmp_path / "selectors.db"), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_store_and_lookup_counts_hits_and_misses(tmp_path):
+    """Test cached selectors are returned per host and form hash"""
+    cache = make_cache(tmp_path)
+    await cache.store("boards.greenhouse.io", "abc123", {"First Name": "#first_name", "Email": "#email"})
+
+    found = await cache.lookup("boards.greenhouse.io", "abc123", ["First Name", "Email", "Phone"])
+    assert found == {"First Name": "#first_name", "Email": "#email"}
+    assert await cache.lookup("boards.greenhouse.io", "other", ["First Name"]) == {}
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    """Test entries older than the TTL count as misses"""
+    cache = make_cache(tmp_path, ttl_seconds=1)
+    cache.store_sync("jobs.lever.co", "h", {"Email": "#email"})
+    cache._connection().execute("UPDATE learned_selectors SET created_at = ?", (time.time() - 10,))
+
+    assert cache.lookup_sync("jobs.lever.co", "h", ["Email"]) == {}
+
+
+def test_lru_eviction_and_invalidate(tmp_path):
+    """Test the least recently used rows are evicted past max_entries"""
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.store_sync("a.com", "h", {"One": "#one"})
+    time.sleep(0.01)
+    cache.store_sync("a.com", "h", {"Two": "#two"})
+    time.sleep(0.01)
+    cache.lookup_sync("a.com", "h", ["One"])
+    time.sleep(0.01)
+    cache.store_sync("a.com", "h", {"Three": "#three"})
+
+    assert cache.lookup_sync("a.com", "h", ["One", "Two", "Three"]) == {"One": "#one", "Three": "#three"}
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate_sync("a.com", "h", "One")
+    assert cache.lookup_sync("a.com", "h", ["One"]) == {}
+    assert cache.stats()["stale"] == 1
+    cache.close()
+
+
+def test_lookups_defer_last_used_writes(tmp_path):
+    """Test hits are kept in memory and written in one batch"""
+    cache = make_cache(tmp_path)
+    cache.store_sync("a.com", "h", {"One": "#one"})
+    stored_at = cache._connection().execute("SELECT last_used FROM learned_selectors").fetchone()[0]
+    time.sleep(0.01)
+
+    cache.lookup_sync("a.com", "h", ["One"])
+    assert cache._connection().execute("SELECT last_used FROM learned_selectors").fetchone()[0] == stored_at
+
+    cache.close()
+    reopened = make_cache(tmp_path)
+    assert reopened._connection().execute("SELECT last_used FROM learned_selectors").fetchone()[0] > stored_at
+    reopened.close()
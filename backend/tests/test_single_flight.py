@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+from app.services.html_parser_service import HTMLParserService, analysis_flight
+from app.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    """Test identical in-flight keys run once and followers get their own copy"""
+    flight = SingleFlight("test_shared")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"fields": ["email"]}
+
+    results = await asyncio.gather(*(flight.do("https://jobs.example.com/1", work) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(result == {"fields": ["email"]} for result in results)
+    results[1]["fields"].append("phone")
+    assert results[0]["fields"] == ["email"]
+    assert flight.stats() == {"leaders": 1, "coalesced": 4, "coalesce_rate": 0.8, "in_flight": 0}
+
+    # Once the call has finished nothing is cached
+    await flight.do("https://jobs.example.com/1", work)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter_and_cancelled_leader_does_not_cancel_work():
+    """Test a failure is raised to all callers and a leader leaving doesn't stop followers"""
+    flight = SingleFlight("test_errors")
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("fetch failed")
+
+    outcomes = await asyncio.gather(*(flight.do("k", failing) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    leader = asyncio.ensure_future(flight.do("k2", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("k2", slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "done"
+
+
+@pytest.mark.asyncio
+async def test_analyze_form_from_url_coalesces_by_url(monkeypatch):
+    """Test concurrent analyses of one posting fetch it once, ignoring the fragment"""
+    fetches = []
+
+    async def fake_fetch(self, url):
+        fetches.append(url)
+        await asyncio.sleep(0.01)
+        return "<form><input name='email'></form>"
+
+    monkeypatch.setattr(HTMLParserService, "fetch_html", fake_fetch)
+    before = analysis_flight.coalesced
+    parser = HTMLParserService()
+    results = await asyncio.gather(
+        parser.analyze_form_from_url("https://jobs.example.com/9"),
+        parser.analyze_form_from_url("https://jobs.example.com/9#apply"),
+        HTMLParserService().analyze_form_from_url("https://jobs.example.com/9")
+    )
+
+    assert len(fetches) == 1
+    assert results[0]["form_structure"] == results[2]["form_structure"]
+    assert analysis_flight.coalesced - before == 2
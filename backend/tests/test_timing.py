@@ -0,0 +1,53 @@
+import pytest
+from app.services.automation_service import AutomationService
+from app.utils.timing import PhaseTimer, TimingHistograms
+
+
+def test_phase_timer_accumulates_repeated_spans():
+    """Test spans with the same name add up and report how often they ran"""
+    timer = PhaseTimer()
+    for _ in range(3):
+        with timer.span("field_lookup"):
+            pass
+    with timer.span("navigation"):
+        pass
+    timer.count("label_strategy_attempts", 2)
+
+    summary = timer.summary()
+
+    assert set(summary["phases"]) == {"field_lookup", "navigation"}
+    assert summary["counts"] == {"field_lookup": 3}
+    assert summary["counters"] == {"label_strategy_attempts": 2}
+    assert summary["total_ms"] >= 0
+
+
+def test_histograms_bucket_per_domain_and_cap_domains():
+    """Test per-domain histograms and eviction of the oldest domain"""
+    histograms = TimingHistograms(max_domains=2)
+    histograms.record("boards.greenhouse.io", {"total_ms": 4200, "phases": {"navigation": 80}})
+    histograms.record("boards.greenhouse.io", {"total_ms": 70000, "phases": {"navigation": 300}})
+    histograms.record("jobs.lever.co", {"total_ms": 900, "phases": {}})
+    histograms.record("example.com", {"total_ms": 10, "phases": {}})
+
+    stats = histograms.stats()
+    assert set(stats) == {"jobs.lever.co", "example.com"}
+
+    histograms.record("boards.greenhouse.io", {"total_ms": 4200, "phases": {"navigation": 80}})
+    navigation = histograms.stats("boards.greenhouse.io")["boards.greenhouse.io"]["navigation"]
+    assert navigation == {"count": 1, "avg_ms": 80, "max_ms": 80, "buckets": {"le_100": 1}}
+    assert histograms.stats("unknown.example") == {}
+
+
+class EmptyPage:
+    async def query_selector(self, selector):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_label_search_counts_strategy_attempts():
+    """Test every XPath strategy tried by the label fallback is counted"""
+    timer = PhaseTimer()
+    service = AutomationService(timer=timer)
+
+    assert await service._find_field_by_label(EmptyPage(), "Email") is None
+    assert timer.counters["label_strategy_attempts"] == 7